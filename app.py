@@ -11,6 +11,10 @@ from src.components.history import render_history_page
 from src.pipeline.processors.document_processor import DocumentProcessor
 from src.pipeline.generators.question_generator import QuestionGenerator
 from src.pipeline.generators.answer_generator import AnswerGenerator
+from src.pipeline.events import ProgressBus
+from src.pipeline.providers.interfaces import ProviderConfig
+from src.pipeline.config import PipelineConfig
+from src.pipeline.providers.llama import LlamaStackProvider
 from src.config import APP_TITLE, APP_ICON, LAYOUT
 import asyncio
 
@@ -19,28 +23,48 @@ def initialize_components():
     try:
         # Initialize client if not already done
         if 'llama_client' not in st.session_state:
-            client = LlamaStackClient(base_url="http://localhost:5001")
+            pipeline_config = PipelineConfig(llm_provider=ProviderConfig.from_env())
+            config = pipeline_config.llm_provider
+            client = LlamaStackClient(base_url=config.endpoints[0])
             st.session_state.llama_client = client
             
+            # Pooled, load-balanced provider shared by the generators
+            provider = LlamaStackProvider(config=config)
+            asyncio.run(provider.initialize())
+            st.session_state.llm_provider = provider
+            
             # Initialize processor and memory bank
             processor = DocumentProcessor(client)
             asyncio.run(processor.initialize_memory_bank("default-bank"))
             
             # Store components in session state
             st.session_state.document_processor = processor
-            st.session_state.question_generator = QuestionGenerator(client)
-            st.session_state.answer_generator = AnswerGenerator(client)
+            st.session_state.question_generator = QuestionGenerator(
+                provider,
+                pipeline_config.route("questions"),
+                stream=pipeline_config.stream_completions,
+                structured=pipeline_config.structured_output
+            )
+            st.session_state.answer_generator = AnswerGenerator(
+                provider,
+                pipeline_config.route("answers"),
+                stream=pipeline_config.stream_completions,
+                structured=pipeline_config.structured_output
+            )
             st.session_state.step_manager = StepManager()
+            st.session_state.progress_bus = ProgressBus()
             
             st.success("✅ Components initialized successfully!")
         
         # Verify all components are present
         required_components = [
             'llama_client',
+            'llm_provider',
             'document_processor',
             'question_generator',
             'answer_generator',
-            'step_manager'
+            'step_manager',
+            'progress_bus'
         ]
         
         missing_components = [comp for comp in required_components 
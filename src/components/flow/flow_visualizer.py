@@ -16,6 +16,8 @@ def render_step(step: Step, is_active: bool = False):
             st.error("×")
         elif step.status == StepStatus.PAUSED:
             st.warning("⏸")
+        elif step.status == StepStatus.CANCELLED:
+            st.warning("⏹")
         else:
             st.text("○")
     
@@ -41,15 +43,39 @@ def render_step(step: Step, is_active: bool = False):
     
     return None
 
+# How often the flow view polls the progress bus while a step is running
+POLL_INTERVAL_SECONDS = 0.5
+
 def render_flow_visualization():
     """Render the complete flow visualization."""
     st.header("Generation Progress")
     
+    steps = st.session_state.get('steps') or []
+    is_running = any(step.status == StepStatus.RUNNING for step in steps)
+    
+    # Poll the progress bus on a timer only while work is in flight
+    st.fragment(
+        _render_flow_steps,
+        run_every=POLL_INTERVAL_SECONDS if is_running else None
+    )()
+
+def _render_flow_steps():
+    """Drain pending progress events and render every step."""
+    step_manager = st.session_state.get('step_manager')
+    bus = st.session_state.get('progress_bus')
+    if step_manager and bus:
+        was_running = any(step.status == StepStatus.RUNNING for step in st.session_state.steps)
+        step_manager.apply_progress_events(bus, st.session_state.get('cancel_token'))
+        
+        # Stop polling once the last running step has finished
+        if was_running and not any(step.status == StepStatus.RUNNING for step in st.session_state.steps):
+            st.rerun()
+    
     steps = st.session_state.steps
     current_step = None
     
     for step in steps:
-        if step.status == StepStatus.RUNNING:
+        if step.status in (StepStatus.RUNNING, StepStatus.PAUSED):
             current_step = step
             break
     
@@ -58,9 +84,15 @@ def render_flow_visualization():
         is_active = step == current_step
         action = render_step(step, is_active)
         
+        # Pause/resume the running job itself, not just the displayed status
+        cancel_token = st.session_state.get('cancel_token')
         if action == "pause":
+            if cancel_token:
+                cancel_token.pause()
             step.status = StepStatus.PAUSED
         elif action == "resume":
+            if cancel_token:
+                cancel_token.resume()
             step.status = StepStatus.RUNNING
         
         if idx < len(steps) - 1:
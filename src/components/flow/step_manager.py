@@ -2,6 +2,8 @@
 import streamlit as st
 from typing import List, Dict, Optional
 from ...utils.state_management import get_state, set_state
+from ...pipeline.events import ProgressBus, ProgressEvent
+from ...pipeline.cancellation import CancellationToken
 from dataclasses import dataclass
 from enum import Enum
 
@@ -11,6 +13,7 @@ class StepStatus(Enum):
     COMPLETED = "completed"
     PAUSED = "paused"
     ERROR = "error"
+    CANCELLED = "cancelled"
 
 @dataclass
 class Step:
@@ -65,4 +68,30 @@ class StepManager:
                 if progress is not None:
                     step.progress = progress
                 break
-        st.session_state.steps = steps 
\ No newline at end of file
+        st.session_state.steps = steps
+    
+    def apply_progress_events(self,
+                              bus: ProgressBus,
+                              cancel_token: Optional[CancellationToken] = None) -> List[ProgressEvent]:
+        """Drain coalesced progress events from the bus into step statuses.
+        
+        Events without a status only mark a pending step as running: calls
+        already in flight keep reporting progress after a pause or a
+        cancellation, and must not flip the step back. With ``cancel_token``,
+        running and paused steps follow the token, which may also be paused
+        or resumed from the job monitor.
+        """
+        events = bus.drain()
+        steps = {step.id: step for step in st.session_state.steps}
+        for event in events:
+            status = StepStatus(event.status) if event.status else StepStatus.RUNNING
+            step = steps.get(event.step_id)
+            if not event.status and step and step.status in (StepStatus.PAUSED, StepStatus.CANCELLED):
+                status = step.status
+            self.update_step_status(event.step_id, status, event.progress)
+        if cancel_token is not None:
+            paused = cancel_token.is_paused
+            for step in st.session_state.steps:
+                if step.status in (StepStatus.RUNNING, StepStatus.PAUSED):
+                    step.status = StepStatus.PAUSED if paused else StepStatus.RUNNING
+        return events
@@ -1,16 +1,84 @@
 """History component for managing generated datasets."""
 import streamlit as st
 import pandas as pd
-from ..utils.state_management import get_state
+from datetime import datetime
+from pathlib import Path
+from ..config import CATALOG_PATH
+from ..pipeline.catalog import RunCatalog, RunRecord
+from ..pipeline.export import preview_dataset
+
+PAGE_SIZE = 25
+PREVIEW_ROWS = 50
+STATUSES = ["completed", "running", "cancelled", "failed"]
+
+@st.cache_resource
+def get_run_catalog() -> RunCatalog:
+    """Return the process-wide run catalog shared by all sessions.
+    
+    Created once per server process, so runs a previous process left
+    "running" are marked failed before this process records any.
+    """
+    catalog = RunCatalog(CATALOG_PATH)
+    catalog.mark_interrupted()
+    return catalog
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _load_preview(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is part of the cache key, so a rewritten export is read again
+    return preview_dataset(path, PREVIEW_ROWS)
+
+def _run_row(run: RunRecord) -> dict:
+    return {
+        "Run": run.name,
+        "Status": run.status,
+        "Started": datetime.fromtimestamp(run.created_at).strftime("%Y-%m-%d %H:%M"),
+        "Chunks": run.chunk_count,
+        "Questions": run.question_count,
+        "Answers": run.answer_count,
+        "Tokens": run.prompt_tokens + run.completion_tokens,
+        "Config": run.config_hash,
+        "Export": run.export_path
+    }
 
 def render_history_page() -> None:
-    """Render the dataset history page."""
+    """Render the dataset history page, one page of runs at a time."""
     st.header("📚 Dataset History")
-    
-    history = get_state('history')
-    if not history:
-        st.info("No datasets generated yet.")
+    catalog = get_run_catalog()
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        status = st.selectbox("Status", ["all"] + STATUSES, key="history_status")
+    with col2:
+        search = st.text_input("Search runs", key="history_search").strip()
+    status = None if status == "all" else status
+
+    total = catalog.count(status, search)
+    if not total:
+        st.info("No datasets generated yet." if not (status or search) else "No matching runs.")
         return
-    
-    df = pd.DataFrame(history)
-    st.dataframe(df) 
\ No newline at end of file
+
+    pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    if st.session_state.get("history_page", 1) > pages:
+        # Narrower filters can leave the remembered page past the end
+        st.session_state.history_page = pages
+    page = st.number_input("Page", min_value=1, max_value=pages, key="history_page")
+    runs = catalog.list_runs(status, search, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE)
+    st.caption(f"{total} runs · page {page} of {pages}")
+    st.dataframe(pd.DataFrame([_run_row(run) for run in runs]),
+                 use_container_width=True, hide_index=True)
+
+    # Datasets are only read when a run is picked, and only their first rows
+    labels = {f"{run.name} ({run.id})": run for run in runs if run.export_path}
+    choice = st.selectbox("Preview dataset", ["—"] + list(labels), key="history_preview")
+    run = labels.get(choice)
+    if run is None:
+        return
+    path = Path(run.export_path)
+    if not path.exists():
+        st.warning(f"Export not found: {path}")
+        return
+    try:
+        st.dataframe(_load_preview(str(path), path.stat().st_mtime), use_container_width=True)
+        st.caption(f"First {PREVIEW_ROWS} records of {path}")
+    except (RuntimeError, ValueError, OSError) as e:
+        st.error(f"Could not preview dataset: {e}")
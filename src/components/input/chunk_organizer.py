@@ -2,6 +2,7 @@
 import streamlit as st
 from typing import List, Dict, Any
 import math
+from ...pipeline.processors.document_buffer import search_spans
 
 def render_chunk_pagination(chunks: List[Dict[str, Any]], 
                           page: int, 
@@ -33,10 +34,7 @@ def render_chunk_search(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     search_term = st.text_input("🔍 Search in chunks", key="chunk_search")
     
     if search_term:
-        filtered_chunks = [
-            chunk for chunk in chunks
-            if search_term.lower() in chunk["content"].lower()
-        ]
+        filtered_chunks = search_spans(chunks, search_term)
         st.caption(f"Found {len(filtered_chunks)} matching chunks")
         return filtered_chunks
     return chunks
@@ -68,6 +66,8 @@ def render_organized_chunks(chunks: List[Dict[str, Any]],
         render_chunk_stats(chunks, metadata)
         if "title" in metadata:
             st.text("Title: " + metadata["title"])
+        if "sources" in metadata:
+            st.text(f"Sources: {len(metadata['sources'])} files")
     
     # Add search functionality
     filtered_chunks = render_chunk_search(chunks)
@@ -1,62 +1,108 @@
 """Console-like progress view component."""
 import streamlit as st
+from collections import deque
 from datetime import datetime
+from html import escape
 from typing import Optional
 import time
 
+# Define colors for different message levels
+LEVEL_COLORS = {
+    'info': '#CCCCCC',
+    'success': '#4CAF50',
+    'error': '#F44336',
+    'warning': '#FFC107',
+    'progress': '#2196F3'
+}
+
 class ConsoleView:
-    """Console-like view for progress updates."""
-    
-    def __init__(self, height: int = 300):
-        """Initialize console view with fixed height."""
+    """Console-like view for progress updates.
+
+    Messages are kept in a bounded ring buffer and renders are coalesced to at
+    most ``max_renders_per_second``; call ``flush`` to show pending messages.
+    Level filtering is done in the browser with CSS, so toggling a level does
+    not trigger a rerun.
+    """
+
+    def __init__(self,
+                 height: int = 300,
+                 capacity: int = 100,
+                 max_renders_per_second: float = 4.0):
+        """Initialize console view with fixed height and bounded history."""
         self.height = height
-        if 'console_messages' not in st.session_state:
-            st.session_state.console_messages = []
-        
+        self.min_render_interval = 1.0 / max_renders_per_second if max_renders_per_second > 0 else 0.0
+        self._last_render = 0.0
+        self._dirty = False
+
+        messages = st.session_state.get('console_messages')
+        if not isinstance(messages, deque) or messages.maxlen != capacity:
+            st.session_state.console_messages = deque(messages or [], maxlen=capacity)
+
         # Create fixed container for console
         self.container = st.empty()
         self._render_console()
-    
+
     def _render_console(self):
         """Render the console with current messages."""
+        filters = "".join(
+            f'<input type="checkbox" id="console-hide-{level}" class="console-hide-{level}" hidden>'
+            for level in LEVEL_COLORS
+        )
+        toggles = " ".join(
+            f'<label for="console-hide-{level}" class="console-toggle-{level}" '
+            f'style="color: {color}; cursor: pointer; margin-right: 8px;">{level}</label>'
+            for level, color in LEVEL_COLORS.items()
+        )
+        rules = "".join(
+            f".console-hide-{level}:checked ~ .console-body .console-{level} {{ display: none; }}"
+            f".console-hide-{level}:checked ~ .console-toolbar .console-toggle-{level} "
+            f"{{ text-decoration: line-through; opacity: 0.5; }}"
+            for level in LEVEL_COLORS
+        )
         console_html = f"""
-        <div style="
-            height: {self.height}px;
-            overflow-y: auto;
-            background-color: #1E1E1E;
-            color: #CCCCCC;
-            padding: 10px;
-            font-family: 'Courier New', monospace;
-            border-radius: 5px;
-            margin: 10px 0;
-        ">
-            {'<br>'.join(st.session_state.console_messages)}
+        <style>{rules}</style>
+        <div>
+            {filters}
+            <div class="console-toolbar" style="font-family: 'Courier New', monospace; font-size: 0.8rem;">
+                {toggles}
+            </div>
+            <div class="console-body" style="
+                height: {self.height}px;
+                overflow-y: auto;
+                background-color: #1E1E1E;
+                color: #CCCCCC;
+                padding: 10px;
+                font-family: 'Courier New', monospace;
+                border-radius: 5px;
+                margin: 10px 0;
+            ">
+                {''.join(st.session_state.console_messages)}
+            </div>
         </div>
         """
         self.container.markdown(console_html, unsafe_allow_html=True)
-    
+        self._last_render = time.monotonic()
+        self._dirty = False
+
     def log(self, message: str, level: str = 'info'):
         """Add a new message to the console."""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        # Define colors for different message levels
-        colors = {
-            'info': '#CCCCCC',
-            'success': '#4CAF50',
-            'error': '#F44336',
-            'warning': '#FFC107',
-            'progress': '#2196F3'
-        }
-        
+
         # Create formatted message
-        formatted_msg = f'<span style="color: {colors.get(level, "#CCCCCC")}">[{timestamp}] {message}</span>'
-        
-        # Add to message history
+        formatted_msg = (
+            f'<div class="console-{level}" style="color: {LEVEL_COLORS.get(level, "#CCCCCC")}">'
+            f'[{timestamp}] {escape(message)}</div>'
+        )
+
+        # Add to message history; the ring buffer drops the oldest entry
         st.session_state.console_messages.append(formatted_msg)
-        
-        # Keep only last 100 messages
-        if len(st.session_state.console_messages) > 100:
-            st.session_state.console_messages = st.session_state.console_messages[-100:]
-        
-        # Update display
-        self._render_console() 
\ No newline at end of file
+        self._dirty = True
+
+        # Update display, coalescing bursts of messages
+        if level == 'error' or time.monotonic() - self._last_render >= self.min_render_interval:
+            self._render_console()
+
+    def flush(self):
+        """Render any messages held back by throttling."""
+        if self._dirty:
+            self._render_console()
@@ -1,80 +1,235 @@
 """File upload handling component."""
+from typing import Any, Callable, List, Optional, Union
+from datetime import datetime
+from pathlib import Path
 import streamlit as st
-from ...utils.file_handlers import load_file
+from ...utils.file_handlers import detect_encoding, load_bytes
+from ...utils.upload_cache import ParsedUpload, UploadCache
 from ...utils.state_management import set_state, get_state
-from ...config import ALLOWED_EXTENSIONS
+from ...config import ALLOWED_EXTENSIONS, ARTIFACT_DIR, OUTPUT_DIR
 from ...pipeline.processors.document_processor import DocumentProcessor
+from ...pipeline.generators.question_generator import QuestionGenerator
+from ...pipeline.generators.answer_generator import AnswerGenerator
+from ...pipeline.orchestrator import PipelineOrchestrator
+from ...pipeline.types import DocumentChunk, QAStore
+from ...pipeline.artifacts import ArtifactStore
+from ...pipeline.export import JsonlShardWriter
+from ...pipeline.catalog import RunRecord
+from ...pipeline.cancellation import GenerationCancelled
+from ...pipeline.processors.tabular import (
+    TabularConfig, csv_upload_chunks, open_csv_upload
+)
+from ...pipeline.processors.batch import (
+    IngestedFile, SourceFile, expand_archives, ingest_files, merge_sources
+)
+from ...pipeline.planner import plan_run
+from ...pipeline.routing import DRAFT_MODEL
+from ...pipeline.jobs import Job
+from ..flow.step_manager import StepStatus
+from ..history import get_run_catalog
+from .job_monitor import (
+    get_job_runner, get_current_job, attach_job, render_job_monitor, render_job_list
+)
 from .preview import render_data_preview
 from .chunk_viewer import render_chunk_viewer
-from .console_view import ConsoleView
-import asyncio
+from .run_plan_view import render_run_plan
 
-async def process_uploaded_file(processor: DocumentProcessor, content: str) -> None:
-    """Process an uploaded file with progress tracking."""
-    progress_bar = st.progress(0)
-    console = ConsoleView(height=400)
-    
-    def update_progress(progress: float, message: str):
-        progress_bar.progress(progress)
-        console.log(message, level='progress')
-    
-    try:
-        # Stage 1: Chunking (0-30% progress)
-        console.log("Starting document processing...", level='info')
-        update_progress(0.1, "Analyzing document structure...")
-        
-        chunks = processor._chunk_article(content)
-        metadata = processor._extract_article_metadata(content)
-        
-        console.log(f"Document split into {len(chunks)} chunks", level='success')
-        set_state('current_chunks', chunks)
-        set_state('current_metadata', metadata)
-        
-        update_progress(0.3, "Document chunking complete")
-        
-        # Stage 2: Generate questions (30-65% progress)
-        question_gen = get_state('question_generator')
-        console.log("Starting question generation...", level='info')
-        
-        def question_progress(progress: float, message: str):
-            overall_progress = 0.3 + (progress * 0.35)
-            update_progress(overall_progress, f"Generating questions: {message}")
-            #console.log(f"Question Generation: {message}", level='progress')
-        
-        questions = await question_gen.generate(
-            context=content,
-            progress_callback=question_progress
+# Files decoded and chunked at once in a multi-file upload
+INGEST_WORKERS = 8
+
+@st.cache_resource
+def get_upload_cache() -> UploadCache:
+    """Return the process-wide cache of parsed uploads shared by all sessions."""
+    return UploadCache()
+
+def upload_kind(filename: str) -> str:
+    """Cache kind of an upload: its suffix, which decides how it is parsed."""
+    return Path(filename).suffix.lower()
+
+def parse_upload(data: bytes, filename: str) -> Any:
+    """Decode an upload: text files to str, CSVs to a CsvUpload streamed when chunked."""
+    if upload_kind(filename) == ".csv":
+        try:
+            return open_csv_upload(data, detect_encoding(data))
+        except Exception as e:
+            raise ValueError(f"Error loading file: {str(e)}")
+    return load_bytes(data, filename)
+
+def upload_chunks(upload_cache: UploadCache,
+                  upload: ParsedUpload,
+                  processor: DocumentProcessor,
+                  row_template: Optional[str] = None) -> List[Any]:
+    """Chunks of an upload under the current settings, cached with the upload.
+    
+    Text is split into spans; CSV rows are streamed from the upload bytes
+    a block at a time, rendered with ``row_template`` and grouped into
+    DocumentChunks. Safe to call from worker threads.
+    """
+    max_chunk_size = processor.config.max_chunk_size
+    if isinstance(upload.content, str):
+        return upload_cache.chunks(upload, max_chunk_size, processor._chunk_article)
+    
+    config = TabularConfig(row_template=row_template, max_chunk_size=max_chunk_size)
+    return upload_cache.chunks(
+        upload,
+        ("table", config.row_template, max_chunk_size),
+        lambda table: csv_upload_chunks(table, config)
+    )
+
+def ingest_uploads(uploaded_files: List[Any],
+                   processor: DocumentProcessor,
+                   on_progress: Optional[Callable[[IngestedFile, int, int], None]] = None
+                   ) -> List[IngestedFile]:
+    """Decode and chunk uploaded files and archive members in parallel."""
+    upload_cache = get_upload_cache()
+    row_template = get_state('row_template')
+    sources = expand_archives(
+        ((f.name, f.getvalue()) for f in uploaded_files), ALLOWED_EXTENSIONS
+    )
+    
+    def parse(source: SourceFile) -> ParsedUpload:
+        return upload_cache.load(
+            source.data,
+            lambda data: parse_upload(data, source.name),
+            metadata={"name": source.name, "size": len(source.data)},
+            kind=upload_kind(source.name)
         )
-        
-        console.log(f"Generated {len(questions)} questions", level='success')
-        set_state('current_questions', questions)
-        
-        # Stage 3: Generate answers (65-100% progress)
-        answer_gen = get_state('answer_generator')
-        console.log("Starting answer generation...", level='info')
-        
-        def answer_progress(progress: float, message: str):
-            overall_progress = 0.65 + (progress * 0.35)
-            update_progress(overall_progress, f"Generating answers: {message}")
-            #console.log(f"Answer Generation: {message}", level='progress')
-        
-        answers = await answer_gen.generate(
-            questions=questions,
-            progress_callback=answer_progress
+    
+    return ingest_files(
+        sources,
+        parse,
+        lambda upload: upload_chunks(upload_cache, upload, processor, row_template),
+        max_workers=INGEST_WORKERS,
+        progress_callback=on_progress
+    )
+
+def should_start_job(upload_key: str) -> bool:
+    """Whether to start a job for an upload: once per session, then on request.
+    
+    The session remembers which uploads it started jobs for, so an upload
+    still attached on a rerun is not processed again when the shared runner
+    has pruned its finished job.
+    """
+    upload_jobs = get_state('upload_jobs') or {}
+    if upload_key not in upload_jobs:
+        return True
+    job = get_job_runner().get(upload_jobs[upload_key])
+    if (job is None or not job.is_active) and st.button("🔄 Run Again", key=f"rerun_{upload_key}"):
+        del upload_jobs[upload_key]
+        set_state('upload_jobs', upload_jobs)
+        st.rerun()
+    return False
+
+def render_batch_upload(uploaded_files: List[Any],
+                        processor: DocumentProcessor,
+                        question_gen: QuestionGenerator,
+                        answer_gen: AnswerGenerator) -> None:
+    """Ingest several files (or archives) and run them as one job keyed by source."""
+    progress = st.progress(0.0, text="Reading files...")
+    
+    def on_progress(result: IngestedFile, done: int, total: int) -> None:
+        status = "✅" if result.ok else "❌"
+        progress.progress(done / total, text=f"{status} {result.name} ({done}/{total})")
+    
+    ingested = ingest_uploads(uploaded_files, processor, on_progress)
+    progress.empty()
+    
+    with st.expander(f"📄 {len(ingested)} files", expanded=False):
+        st.dataframe(
+            [
+                {
+                    "File": result.name,
+                    "Chunks": len(result.chunks),
+                    "Seconds": round(result.seconds, 2),
+                    "Error": result.error or ""
+                }
+                for result in ingested
+            ],
+            use_container_width=True
         )
-        
-        console.log(f"Generated {len(answers)} answers", level='success')
-        set_state('current_answers', answers)
-        
-        update_progress(1.0, "✅ Processing complete!")
-        console.log("Document processing completed successfully!", level='success')
-        
-    except Exception as e:
-        error_msg = f"Error processing document: {str(e)}"
-        console.log(error_msg, level='error')
-        st.error(error_msg)
-    finally:
-        progress_bar.empty()
+    failed = [result.name for result in ingested if not result.ok]
+    if failed:
+        st.warning(f"⚠️ Skipped {len(failed)} file(s) that could not be read: {', '.join(failed)}")
+    
+    chunks = merge_sources(ingested)
+    if not chunks:
+        st.error("❌ No readable content in the uploaded files")
+        return
+    set_state('input_type', 'dataset')
+    
+    # Start one background job per distinct set of uploads
+    upload_key = "|".join(sorted(f"{f.name}:{f.size}" for f in uploaded_files))
+    if should_start_job(upload_key):
+        if get_state('dry_run'):
+            render_run_plan(plan_run([chunk.content for chunk in chunks], question_gen, answer_gen))
+            if not st.button("▶️ Start Generation", type="primary"):
+                return
+        job = start_processing_job(
+            processor, question_gen, answer_gen, chunks, f"{len(ingested)} files"
+        )
+        set_state('upload_jobs', {**(get_state('upload_jobs') or {}), upload_key: job.id})
+    
+    render_job_monitor(get_current_job())
+    
+    chunks = get_state('current_chunks')
+    metadata = get_state('current_metadata')
+    if chunks and metadata:
+        render_chunk_viewer(chunks, metadata, question_gen, answer_gen)
+
+def start_processing_job(processor: DocumentProcessor,
+                         question_gen: QuestionGenerator,
+                         answer_gen: AnswerGenerator,
+                         content: Union[str, List[DocumentChunk]],
+                         name: str) -> Job:
+    """Start processing an uploaded file in the background and attach to it.
+    
+    Finished Q&A records are streamed to JSONL shards under OUTPUT_DIR as
+    they complete, so a long run keeps its output even if it is cancelled.
+    The run and its export are recorded in the run catalog. The run fills
+    a QAStore kept in the job's metadata, so attached views show questions
+    and answers as they arrive.
+    """
+    orchestrator = PipelineOrchestrator(
+        processor, question_gen, answer_gen, artifacts=ArtifactStore(ARTIFACT_DIR)
+    )
+    catalog = get_run_catalog()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    shard_dir = Path(OUTPUT_DIR) / f"{Path(name).stem}_{timestamp}"
+    store = QAStore()
+    
+    async def run(job: Job):
+        catalog.add(RunRecord(
+            id=job.id, name=name, config_hash=orchestrator.config_hash(),
+            export_path=str(shard_dir / "qa-manifest.json")
+        ))
+        try:
+            with JsonlShardWriter(shard_dir) as shards:
+                result = await orchestrator.process_document(
+                    content,
+                    progress_callback=job.report,
+                    bus=job.bus,
+                    cancel_token=job.cancel_token,
+                    partial_callback=job.preview,
+                    record_callback=shards.write,
+                    store=store
+                )
+        except GenerationCancelled as e:
+            catalog.finish(job.id, "cancelled", e.partial)
+            raise
+        except Exception as e:
+            catalog.finish(job.id, "failed", error=str(e))
+            raise
+        catalog.finish(job.id, "completed", result)
+        return result
+    
+    job = get_job_runner().submit(name, run, metadata={"store": store})
+    attach_job(job)
+    
+    step_manager = get_state('step_manager')
+    if step_manager:
+        step_manager.update_step_status("plan", StepStatus.RUNNING, 0.0)
+    
+    return job
 
 def render_file_uploader(processor: DocumentProcessor) -> None:
     """Render the file upload section."""
@@ -113,6 +268,33 @@ def render_file_uploader(processor: DocumentProcessor) -> None:
                     help="Number of overlapping tokens between chunks"
                 )
             
+            dry_run = st.checkbox(
+                "Dry run before generating",
+                value=get_state('dry_run') or False,
+                help="Estimate requests, tokens and time before any LLM calls are made"
+            )
+            
+            cascade = st.checkbox(
+                "Draft with a small model first (cascade)",
+                value=question_gen.route.cascade,
+                help=f"Generate with {DRAFT_MODEL} and only send unparseable or "
+                     "low-confidence items to the large model"
+            )
+            
+            structured = st.checkbox(
+                "Structured output (JSON schema)",
+                value=question_gen.structured,
+                help="Constrain replies to a JSON schema and skip the step-by-step "
+                     "analysis; needs a server that supports response_format"
+            )
+            
+            row_template = st.text_area(
+                "CSV Row Template",
+                value=get_state('row_template') or "",
+                help="How each CSV row is written into a chunk, e.g. "
+                     "'Q: {question}\\nA: {answer}'. Leave empty for 'column: value' lines"
+            )
+            
             chunks_per_page = st.slider(
                 "Chunks per Page",
                 min_value=3,
@@ -128,19 +310,40 @@ def render_file_uploader(processor: DocumentProcessor) -> None:
                 processor.config.max_chunk_size = chunk_size
                 processor.config.overlap_tokens = overlap
                 set_state('chunks_per_page', chunks_per_page)
+                set_state('dry_run', dry_run)
+                set_state('row_template', row_template.strip() or None)
+                for generator in (question_gen, answer_gen):
+                    generator.route.draft_model_id = DRAFT_MODEL if cascade else None
+                    generator.structured = structured
                 st.success("✅ Configuration updated!")
     
+    with st.expander("🗂️ Background Jobs"):
+        render_job_list()
+    
     # File uploader
-    uploaded_file = st.file_uploader(
-        "Choose a file",
-        type=ALLOWED_EXTENSIONS,
-        help="Upload your knowledge base article or dataset"
+    uploaded_files = st.file_uploader(
+        "Choose files",
+        type=ALLOWED_EXTENSIONS + ["zip"],
+        accept_multiple_files=True,
+        help="Upload knowledge base articles or datasets, one by one or as zip archives"
     )
     
+    if len(uploaded_files) > 1 or any(f.name.lower().endswith(".zip") for f in uploaded_files):
+        render_batch_upload(uploaded_files, processor, question_gen, answer_gen)
+        return
+    
+    uploaded_file = uploaded_files[0] if uploaded_files else None
     if uploaded_file:
         try:
-            # Load and preview file
-            content = load_file(uploaded_file)
+            # Load and preview file; identical bytes are only decoded once
+            upload_cache = get_upload_cache()
+            upload = upload_cache.load(
+                uploaded_file.getvalue(),
+                lambda data: parse_upload(data, uploaded_file.name),
+                metadata={"name": uploaded_file.name, "size": uploaded_file.size},
+                kind=upload_kind(uploaded_file.name)
+            )
+            content = upload.content
             if content is None:
                 st.error("❌ Failed to load file content")
                 return
@@ -153,11 +356,34 @@ def render_file_uploader(processor: DocumentProcessor) -> None:
                 with st.expander("📄 File Preview", expanded=True):
                     st.text(content[:1000] + ("..." if len(content) > 1000 else ""))
             else:
-                render_data_preview(content)
+                render_data_preview(content.preview)
+                st.caption(f"Showing the first {len(content.preview)} rows; "
+                           "the full table is read in blocks when chunked.")
+            
+            # Automatically start a background job once per uploaded file
+            upload_key = f"{uploaded_file.name}:{uploaded_file.size}"
+            if should_start_job(upload_key):
+                if get_state('dry_run'):
+                    chunks = upload_chunks(upload_cache, upload, processor, get_state('row_template'))
+                    plan = plan_run(
+                        [chunk["content"] for chunk in chunks],
+                        question_gen,
+                        answer_gen
+                    )
+                    render_run_plan(plan)
+                    if not st.button("▶️ Start Generation", type="primary"):
+                        return
+                
+                # Tables go in as row-group chunks; text is chunked by the pipeline
+                job_input = content if isinstance(content, str) else upload_chunks(
+                    upload_cache, upload, processor, get_state('row_template')
+                )
+                job = start_processing_job(
+                    processor, question_gen, answer_gen, job_input, uploaded_file.name
+                )
+                set_state('upload_jobs', {**(get_state('upload_jobs') or {}), upload_key: job.id})
             
-            # Automatically start processing if not already done
-            if not get_state('current_chunks'):
-                asyncio.run(process_uploaded_file(processor, str(content)))
+            render_job_monitor(get_current_job())
             
             # Show chunks and Q&A if available
             chunks = get_state('current_chunks')
@@ -0,0 +1,159 @@
+"""Background job monitoring components."""
+import streamlit as st
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ...utils.state_management import get_state, set_state
+from ...pipeline.jobs import Job, JobRunner, JobStatus
+from ...pipeline.cancellation import ABORT, DRAIN
+from .console_view import ConsoleView
+from .question_organizer import get_qa_frame
+
+# How often attached job views poll the registry
+JOB_POLL_SECONDS = 0.5
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """Return the process-wide job runner shared by all sessions."""
+    return JobRunner()
+
+def attach_job(job: Job) -> None:
+    """Make a job the one this session follows and loads results from.
+    
+    The job's live QAStore, if it has one, becomes the session's store
+    right away, so the Q&A views sync while answers stream in.
+    """
+    set_state('current_job_id', job.id)
+    # Kept in the session too: the shared runner prunes finished jobs
+    set_state('current_job', job)
+    set_state('loaded_job_id', None)
+    if job.metadata.get("store") is not None:
+        set_state('qa_store', job.metadata["store"])
+    st.session_state.progress_bus = job.bus
+    st.session_state.cancel_token = job.cancel_token
+
+def get_current_job() -> Optional[Job]:
+    """Return the job this session follows, even after the runner pruned it."""
+    job_id = get_state('current_job_id')
+    job = get_job_runner().get(job_id) if job_id else None
+    if job is None and job_id:
+        job = get_state('current_job')
+    return job if job is not None and job.id == job_id else None
+
+def _load_job_results(job: Job) -> None:
+    """Copy a finished job's results into session state once."""
+    if get_state('loaded_job_id') == job.id or not isinstance(job.result, dict):
+        return
+    set_state('current_chunks', job.result.get("chunks"))
+    set_state('current_metadata', job.result.get("metadata"))
+    set_state('current_questions', job.result.get("questions"))
+    set_state('current_answers', job.result.get("answers"))
+    set_state('qa_store', job.result.get("store"))
+    set_state('loaded_job_id', job.id)
+
+def render_job_monitor(job: Optional[Job]) -> None:
+    """Render live progress for a job, polling while it is active."""
+    if job is None:
+        return
+    st.fragment(
+        _render_job_progress,
+        run_every=JOB_POLL_SECONDS if job.is_active else None
+    )(job.id)
+
+def _render_job_progress(job_id: str) -> None:
+    job = get_current_job()
+    if job is None or job.id != job_id:
+        job = get_job_runner().get(job_id)
+    if job is None:
+        return
+
+    if job.is_active:
+        paused = job.cancel_token.is_paused
+        status = "⏸ Paused" if paused else f"⏳ {job.message or 'Queued...'}"
+        st.progress(job.progress, text=f"{job.name}: {status}")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if paused:
+                if st.button("▶️ Resume", key=f"resume_job_{job.id}", use_container_width=True):
+                    job.cancel_token.resume()
+            elif st.button("⏸ Pause", key=f"pause_job_{job.id}", use_container_width=True):
+                job.cancel_token.pause()
+        with col2:
+            if st.button("⏹ Stop After Current", key=f"drain_job_{job.id}", use_container_width=True,
+                         help="Let in-flight requests finish, then stop"):
+                job.cancel_token.cancel(DRAIN)
+        with col3:
+            if st.button("🛑 Stop Now", key=f"abort_job_{job.id}", use_container_width=True,
+                         help="Abandon in-flight requests and stop immediately"):
+                job.cancel_token.cancel(ABORT)
+        
+        _render_partial(job.partial)
+        _render_live_records()
+        
+        console = ConsoleView(height=200)
+        if job.message and job.message != get_state('last_job_message'):
+            console.log(job.message, level='progress')
+            set_state('last_job_message', job.message)
+        console.flush()
+    elif job.status == JobStatus.FAILED:
+        st.error(f"Error processing document: {job.error}")
+    elif job.status == JobStatus.CANCELLED and get_state('loaded_job_id') != job.id:
+        # Keep whatever finished before the cancellation
+        _load_job_results(job)
+        st.warning("⏹ Generation cancelled; partial results were kept.")
+    elif job.status == JobStatus.COMPLETED and get_state('loaded_job_id') != job.id:
+        _load_job_results(job)
+        st.rerun()
+
+def _render_partial(partial: Optional[Dict[str, Any]]) -> None:
+    """Show the item currently streaming in."""
+    if not partial:
+        return
+    if partial.get("stage") == "answers":
+        text = partial.get("answer", "…")
+        st.caption(f"✍️ **{partial.get('question', '')}** → {text}")
+    else:
+        questions = partial.get("questions", [])
+        st.caption(f"✍️ Chunk {partial.get('chunk_index', 0) + 1}: " + " · ".join(questions))
+
+def _render_live_records() -> None:
+    """Show the Q&A records the attached job has produced so far."""
+    qa_frame = get_qa_frame()
+    if qa_frame is None or not len(qa_frame):
+        return
+    summary = qa_frame.summary()
+    st.caption(f"{summary['total']} questions, {summary['answered']} answered so far")
+    
+    def build_table():
+        rows = qa_frame.frame
+        return rows.assign(answer=rows["answer"].where(rows["answered"], "⏳ Generating..."))[
+            ["question", "answer", "difficulty", "confidence"]
+        ]
+    
+    # Synced incrementally on each poll; rebuilt only when records changed
+    st.dataframe(qa_frame.cached("live_table", build_table), height=250, hide_index=True)
+
+def render_job_list() -> None:
+    """Render all known jobs with controls to attach to them."""
+    jobs = get_job_runner().list_jobs()
+    if not jobs:
+        st.caption("No background jobs yet.")
+        return
+
+    current_job_id = get_state('current_job_id')
+    for job in jobs:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            started = datetime.fromtimestamp(job.created_at).strftime('%H:%M:%S')
+            st.text(f"{job.name} ({started})")
+        with col2:
+            if job.is_active:
+                st.progress(job.progress)
+            else:
+                st.caption(job.status.value.title())
+        with col3:
+            if job.id == current_job_id:
+                st.caption("Attached")
+            elif st.button("Attach", key=f"attach_job_{job.id}"):
+                attach_job(job)
+                st.rerun()
@@ -1,7 +1,7 @@
 """Question generation and display component."""
 import streamlit as st
 from typing import List, Dict, Any
-from ...utils.state_management import get_state, set_state
+from .question_organizer import get_qa_frame
 from ...pipeline.generators.question_generator import QuestionGenerator
 from ...pipeline.generators.answer_generator import AnswerGenerator
 import pandas as pd
@@ -14,38 +14,31 @@ def render_question_generation_view(
 ) -> None:
     """Render the question generation and display view."""
     
-    # Get current state
-    current_questions = get_state('current_questions') or []
-    current_answers = get_state('current_answers') or []
+    qa_frame = get_qa_frame()
+    if qa_frame is None:
+        st.caption("No questions generated yet.")
+        return
+    summary = qa_frame.summary()
     
     # Simple stats
-    st.caption(f"Generated {len(current_questions)} questions, {len(current_answers)} answers")
+    st.caption(f"Generated {summary['total']} questions, {summary['answered']} answers")
     
     # Search filter
-    search = st.text_input("🔍 Search questions and answers", key="qa_search")
+    search = st.text_input("🔍 Search questions and answers", key="qa_search").strip()
     
-    # Prepare data for table
-    data = []
-    for i, q in enumerate(current_questions):
-        answer = current_answers[i] if i < len(current_answers) else None
-        row = {
-            "Q#": f"Q{i+1}",
-            "Question": q.get('question', ''),
-            "Answer": answer.get('answer', "⏳ Generating...") if answer else "⏳ Generating...",
-            "Type": q.get('type', '').title(),
-            "Difficulty": q.get('difficulty', '').title(),
-            "Confidence": f"{answer.get('confidence', 0):.2f}" if answer else "-"
-        }
-        
-        # Apply search filter
-        if search:
-            if not any(search.lower() in str(v).lower() for v in row.values()):
-                continue
-        
-        data.append(row)
+    def build_table() -> pd.DataFrame:
+        rows = qa_frame.query(search=search)
+        return pd.DataFrame({
+            "Q#": "Q" + (rows.index + 1).astype(str),
+            "Question": rows["question"],
+            "Answer": rows["answer"].where(rows["answered"], "⏳ Generating..."),
+            "Type": rows["type"].str.title(),
+            "Difficulty": rows["difficulty"].str.title(),
+            "Confidence": rows["confidence"]
+        })
     
-    # Create DataFrame
-    df = pd.DataFrame(data)
+    # Rebuilt only when the answers or the search change
+    df = qa_frame.cached(("generation_table", search), build_table)
     
     # Render table with fixed height
     st.dataframe(
@@ -58,7 +51,7 @@ def render_question_generation_view(
             "Answer": st.column_config.TextColumn(width=300),
             "Type": st.column_config.Column(width=100),
             "Difficulty": st.column_config.Column(width=100),
-            "Confidence": st.column_config.Column(width=100)
+            "Confidence": st.column_config.NumberColumn(width=100, format="%.2f")
         },
         hide_index=True
-    )
\ No newline at end of file
+    )
@@ -1,8 +1,13 @@
 """Question organization and display component."""
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from ...pipeline.types import Question
+from ...pipeline.qa_frame import QAFrame, SORT_COLUMNS
+from ...utils.state_management import get_state, set_state
+
+# Cards are rendered one widget tree each; larger result sets belong in the table
+MAX_CARDS = 50
 
 def render_question_filters() -> Dict[str, List[str]]:
     """Render filter controls for questions."""
@@ -40,27 +45,36 @@ def render_question_filters() -> Dict[str, List[str]]:
         "quality_threshold": quality_threshold
     }
 
-def render_question_stats(questions: List[Question]) -> None:
+def get_qa_frame() -> Optional[QAFrame]:
+    """Return this session's Q&A frame, synced with the current store."""
+    store = get_state('qa_store')
+    if store is None:
+        return None
+    frame = get_state('qa_frame')
+    if frame is None:
+        frame = QAFrame()
+        set_state('qa_frame', frame)
+    frame.sync(store)
+    return frame
+
+def render_question_stats(summary: Dict[str, Any]) -> None:
     """Render statistical overview of questions."""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Questions", len(questions))
+        st.metric("Total Questions", summary["total"])
     
     with col2:
-        avg_quality = sum(q.quality_score for q in questions) / len(questions) if questions else 0
-        st.metric("Average Quality", f"{avg_quality:.2f}")
+        st.metric("Average Quality", f"{summary['mean_quality']:.2f}")
     
     with col3:
-        difficulty_dist = {d: sum(1 for q in questions if q.difficulty == d) 
-                         for d in ["basic", "intermediate", "advanced"]}
-        most_common = max(difficulty_dist.items(), key=lambda x: x[1])[0]
+        difficulty_dist = summary["difficulty_counts"]
+        most_common = max(difficulty_dist, key=difficulty_dist.get) if difficulty_dist else "-"
         st.metric("Most Common Difficulty", most_common.title())
     
     with col4:
-        type_dist = {t: sum(1 for q in questions if q.type == t)
-                    for t in ["factual", "conceptual", "analytical"]}
-        most_common = max(type_dist.items(), key=lambda x: x[1])[0]
+        type_dist = summary["type_counts"]
+        most_common = max(type_dist, key=type_dist.get) if type_dist else "-"
         st.metric("Most Common Type", most_common.title())
 
 def render_question_card(question: Question, index: int) -> None:
@@ -93,30 +107,25 @@ def render_question_card(question: Question, index: int) -> None:
             if st.button("⭐ Favorite", key=f"fav_q_{index}"):
                 st.toast("Added to favorites!")
 
-def render_organized_questions(questions: List[Question], current_answers: List[Dict[str, Any]] = None) -> None:
+def render_organized_questions(qa_frame: QAFrame) -> None:
     """Render questions with organization options."""
     st.subheader("🤔 Generated Questions")
     
     # Render filters
     filters = render_question_filters()
-    
-    # Apply filters
-    filtered_questions = [
-        q for q in questions
-        if (q.difficulty in filters["difficulties"] and
-            q.type in filters["types"] and
-            q.quality_score >= filters["quality_threshold"])
-    ]
+    query = dict(difficulties=filters["difficulties"],
+                 types=filters["types"],
+                 min_quality=filters["quality_threshold"])
     
     # Show statistics
-    render_question_stats(filtered_questions)
+    render_question_stats(qa_frame.summary(**query))
     
     # Organization options
     col1, col2 = st.columns(2)
     with col1:
         sort_by = st.selectbox(
             "Sort Questions By",
-            ["Chunk Index", "Difficulty", "Type", "Quality Score"],
+            list(SORT_COLUMNS),
             key="question_sort"
         )
     
@@ -128,35 +137,39 @@ def render_organized_questions(questions: List[Question], current_answers: List[
             key="question_view_mode"
         )
     
-    # Sort questions
-    sorted_questions = sort_questions(filtered_questions, sort_by)
+    # Filtered and sorted once per data version and settings
+    rows = qa_frame.query(**query, sort_by=SORT_COLUMNS[sort_by])
     
     if view_mode == "Cards":
         # Render as expandable cards with progressive answers
-        for i, question in enumerate(sorted_questions):
-            with st.expander(f"Q{i+1}: {question.question}", expanded=i==0):
-                render_question_card_content(question, i, current_answers)
+        if len(rows) > MAX_CARDS:
+            st.caption(f"Showing the first {MAX_CARDS} of {len(rows)} questions; "
+                       "switch to Table to see all.")
+        for i, row in enumerate(rows.head(MAX_CARDS).itertuples()):
+            with st.expander(f"Q{i+1}: {row.question}", expanded=i==0):
+                render_question_card_content(row)
     else:
         # Render as table with answer status
-        render_questions_table(sorted_questions, current_answers)
+        table_key = (tuple(filters["difficulties"]), tuple(filters["types"]),
+                     filters["quality_threshold"], sort_by)
+        render_questions_table(qa_frame, rows, key=table_key)
 
-def render_question_card_content(question: Question, index: int, current_answers: List[Dict[str, Any]] = None) -> None:
-    """Render content for a single question card."""
+def render_question_card_content(row: Any) -> None:
+    """Render content for a single question card (a row of the Q&A frame)."""
     st.markdown("**Question:**")
-    st.write(question.question)
+    st.write(row.question)
     
     # Show answer if available
-    if current_answers and index < len(current_answers):
-        answer = current_answers[index]
+    if row.answered:
         st.markdown("**Answer:**")
-        st.write(answer['content'])
+        st.write(row.answer)
         
-        if 'explanation' in answer:
+        if row.explanation:
             st.markdown("**Explanation:**")
-            st.write(answer['explanation'])
+            st.write(row.explanation)
         
-        if 'confidence' in answer:
-            st.metric("Confidence", f"{answer['confidence']:.2f}")
+        if not pd.isna(row.confidence):
+            st.metric("Confidence", f"{row.confidence:.2f}")
     else:
         with st.spinner("Generating answer..."):
             st.info("Answer will appear here soon...")
@@ -164,37 +177,26 @@ def render_question_card_content(question: Question, index: int, current_answers
     # Metadata and quality score
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.caption(f"Difficulty: {question.difficulty.title()}")
+        st.caption(f"Difficulty: {row.difficulty.title()}")
     with col2:
-        st.caption(f"Type: {question.type.title()}")
+        st.caption(f"Type: {row.type.title()}")
     with col3:
-        st.caption(f"Quality: {question.quality_score:.2f}")
+        st.caption(f"Quality: {row.quality_score:.2f}")
 
-def render_questions_table(questions: List[Question], current_answers: List[Dict[str, Any]] = None) -> None:
+def render_questions_table(qa_frame: QAFrame, rows: pd.DataFrame, key: Any = None) -> None:
     """Render questions and answers in table format."""
-    data = []
-    for i, q in enumerate(questions):
-        answer_status = "Pending..."
-        answer_content = ""
-        confidence = None
-        
-        if current_answers and i < len(current_answers):
-            answer_content = current_answers[i]['content']
-            answer_status = "Complete"
-            confidence = current_answers[i].get('confidence', 0.0)
-        
-        data.append({
-            "Question": q.question,
-            "Answer": answer_content or answer_status,
-            "Difficulty": q.difficulty.title(),
-            "Type": q.type.title(),
-            "Quality": f"{q.quality_score:.2f}",
-            "Confidence": confidence if confidence is not None else "N/A"
+    def build() -> pd.DataFrame:
+        return pd.DataFrame({
+            "Question": rows["question"],
+            "Answer": rows["answer"].where(rows["answered"], "Pending..."),
+            "Difficulty": rows["difficulty"].str.title(),
+            "Type": rows["type"].str.title(),
+            "Quality": rows["quality_score"],
+            "Confidence": rows["confidence"]
         })
     
-    df = pd.DataFrame(data)
     st.dataframe(
-        df,
+        qa_frame.cached(("organizer_table", key), build),
         use_container_width=True,
         column_config={
             "Question": st.column_config.TextColumn(
@@ -205,9 +207,13 @@ def render_questions_table(questions: List[Question], current_answers: List[Dict
                 "Answer",
                 width="large"
             ),
+            "Quality": st.column_config.NumberColumn(
+                "Quality",
+                format="%.2f"
+            ),
             "Confidence": st.column_config.NumberColumn(
                 "Confidence",
                 format="%.2f"
             )
         }
-    ) 
\ No newline at end of file
+    )
@@ -1,27 +1,39 @@
 """Question viewer component."""
 import streamlit as st
 from typing import List, Dict, Any
-from .question_organizer import render_organized_questions
+from datetime import datetime
+from pathlib import Path
+from .question_organizer import get_qa_frame, render_organized_questions
 from ...pipeline.types import Question
+from ...pipeline.export import export_records
+from ...utils.state_management import get_state
+from ...config import OUTPUT_DIR
 import pandas as pd
 
+# Export format -> file suffix ("jsonl" writes a directory of shards)
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "jsonl": ""}
+
 def render_question_viewer(questions: List[Question], metadata: Dict[str, Any]) -> None:
     """Render the question viewer component."""
+    qa_frame = get_qa_frame()
+    if qa_frame is None:
+        st.info("No questions generated yet.")
+        return
+    summary = qa_frame.summary()
+    
     # Document overview
     with st.expander("📊 Document Overview", expanded=True):
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Questions", len(questions))
+            st.metric("Total Questions", summary["total"])
         with col2:
-            st.metric("Document Chunks", len(set(q.chunk_index for q in questions)))
+            chunk_count = qa_frame.cached("chunk_count", lambda: qa_frame.frame["chunk_index"].nunique())
+            st.metric("Document Chunks", chunk_count)
         with col3:
             if "estimated_reading_time" in metadata:
                 st.metric("Est. Reading Time", 
                          f"{metadata['estimated_reading_time']:.1f} min")
     
-    # Get current answers state
-    current_answers = get_state('current_answers') or []
-    
     # Show generation progress if available
     if "generation_progress" in metadata:
         progress = metadata["generation_progress"]
@@ -32,28 +44,38 @@ def render_question_viewer(questions: List[Question], metadata: Dict[str, Any])
     
     with tab1:
         # Render organized questions with progressive answers
-        render_organized_questions(questions, current_answers)
+        render_organized_questions(qa_frame)
     
     with tab2:
         # Show analytics
-        if questions:
+        if summary["total"]:
             col1, col2 = st.columns(2)
             with col1:
-                difficulties = [q.difficulty for q in questions]
-                st.bar_chart(pd.value_counts(difficulties))
+                st.bar_chart(pd.Series(summary["difficulty_counts"]))
                 st.caption("Question Difficulty Distribution")
             
             with col2:
-                types = [q.type for q in questions]
-                st.bar_chart(pd.value_counts(types))
+                st.bar_chart(pd.Series(summary["type_counts"]))
                 st.caption("Question Type Distribution")
     
     # Export options
     st.markdown("---")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns([1, 2, 2])
     with col1:
-        if st.button("📥 Export Q&A", type="primary", use_container_width=True):
-            st.toast("Q&A exported successfully!")
+        export_format = st.selectbox("Format", list(EXPORT_FORMATS), label_visibility="collapsed")
     with col2:
+        if st.button("📥 Export Q&A", type="primary", use_container_width=True):
+            store = get_state('qa_store')
+            if store is None or not len(store):
+                st.warning("Nothing to export yet")
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = Path(OUTPUT_DIR) / f"qa_{timestamp}{EXPORT_FORMATS[export_format]}"
+                try:
+                    written = export_records(store.iter_records(), path, export_format)
+                    st.toast(f"Q&A exported to {written}")
+                except Exception as e:  # also pyarrow errors, which are not ValueErrors
+                    st.error(f"Export failed: {e}")
+    with col3:
         if st.button("📋 Copy All", use_container_width=True):
             st.toast("All Q&A copied to clipboard!")
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Dry-run plan display component."""
+import streamlit as st
+import pandas as pd
+from ...pipeline.planner import RunPlan
+
+def _format_duration(seconds: float) -> str:
+    """Format seconds as a short human-readable duration."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
+
+def render_run_plan(plan: RunPlan) -> None:
+    """Render the projected cost of a generation run."""
+    with st.expander("🧮 Dry Run Estimate", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Chunks", plan.chunk_count)
+        with col2:
+            st.metric("LLM Requests", f"{plan.total_requests:,}")
+        with col3:
+            st.metric("Total Tokens", f"{plan.total_tokens:,}")
+        with col4:
+            st.metric("ETA", _format_duration(plan.eta_seconds))
+
+        st.dataframe(
+            pd.DataFrame(plan.to_dict()["stages"]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.caption(f"Projected at {plan.concurrency} concurrent request(s).")
+        if not all(stage.measured for stage in plan.stages):
+            st.caption("ℹ️ Stages marked 'default' use fallback latencies until a run has been measured.")
@@ -18,6 +18,8 @@ GENERATION_STEPS = ["Data Extraction", "Planning", "Generation", "Validation"]
 # File settings
 ALLOWED_EXTENSIONS = ["csv", "txt", "md", "rst"]
 OUTPUT_DIR = "generated_datasets"
+ARTIFACT_DIR = "generated_datasets/.artifacts"  # memoized pipeline stage outputs
+CATALOG_PATH = "generated_datasets/catalog.sqlite3"  # run and dataset history
 
 # Processing settings
 DEFAULT_CHUNK_SIZE = 2000
@@ -0,0 +1,86 @@
+"""On-disk memoization of pipeline stage outputs."""
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+
+def fingerprint(value: Any) -> str:
+    """Stable short hash of text, bytes or any JSON-serializable value."""
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, (bytes, bytearray, memoryview)):
+        value = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(value).hexdigest()[:16]
+
+@dataclass
+class StageNode:
+    """A pipeline stage: its settings and the stages it consumes."""
+    name: str
+    config: Dict[str, Any] = field(default_factory=dict)
+    upstream: Sequence[str] = ()
+
+class StageGraph:
+    """
+    Pipeline stages as a DAG with content-addressed keys.
+
+    A stage's key hashes its name, its config (models, template versions,
+    thresholds) and the keys of its upstream stages, with the source input's
+    hash at the roots. Changing a stage's config changes its key and every
+    downstream key, but leaves upstream keys, and their artifacts, intact.
+    """
+
+    def __init__(self, source_key: str, nodes: Sequence[StageNode]):
+        """Initialize with the source input's hash and the stage nodes."""
+        self.source_key = source_key
+        self.nodes = {node.name: node for node in nodes}
+        self._keys: Dict[str, str] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.nodes)
+
+    def key(self, name: str) -> str:
+        """Artifact key for a stage."""
+        if name not in self._keys:
+            node = self.nodes[name]
+            inputs = [self.key(up) for up in node.upstream] or [self.source_key]
+            self._keys[name] = fingerprint({"stage": name, "config": node.config, "inputs": inputs})
+        return self._keys[name]
+
+class ArtifactStore:
+    """
+    Stage outputs as JSON files under ``root/<stage>/<key>.json``.
+
+    Files are written to a temporary name and renamed into place, so
+    concurrent runs never read a partial artifact.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Initialize with the directory to keep artifacts in."""
+        self.root = Path(root)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.json"
+
+    def load(self, stage: str, key: str) -> Optional[Any]:
+        """Stored output of ``stage`` for ``key``, or None if absent or unreadable."""
+        try:
+            with open(self._path(stage, key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, stage: str, key: str, value: Any) -> None:
+        """Store the output of ``stage`` under ``key``."""
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, default=str)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -0,0 +1,106 @@
+"""Cooperative cancellation and pause/resume for pipeline work."""
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+
+# What happens to requests already in flight when a token is cancelled
+ABORT = "abort"   # stop waiting immediately and drop the in-flight result
+DRAIN = "drain"   # let in-flight requests finish, then stop before the next one
+
+# Blocking requests run here rather than on the event loop's default
+# executor: asyncio.run() joins the default executor on exit, so an aborted
+# job would stay running until the abandoned request returned.
+_BLOCKING_CALLS = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+class GenerationCancelled(Exception):
+    """Raised inside pipeline work when its cancellation token is cancelled.
+
+    ``partial`` carries whatever results were completed before stopping.
+    """
+
+    def __init__(self, message: str = "Generation cancelled", partial: Any = None):
+        super().__init__(message)
+        self.partial = partial
+
+class CancellationToken:
+    """
+    Thread-safe token checked by generators between (and during) LLM calls.
+
+    The UI thread calls ``pause``/``resume``/``cancel``; workers await
+    ``checkpoint`` before starting a request and route requests through
+    ``call`` so an abort does not wait for the response.
+    """
+
+    def __init__(self, policy: str = ABORT, poll_interval: float = 0.1):
+        """Initialize with the default in-flight policy."""
+        if policy not in (ABORT, DRAIN):
+            raise ValueError(f"Unknown cancellation policy: {policy}")
+        self.policy = policy
+        self.poll_interval = poll_interval
+        self._cancelled = threading.Event()
+        self._paused = threading.Event()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused.is_set()
+
+    def cancel(self, policy: Optional[str] = None) -> None:
+        """Request cancellation, optionally overriding the in-flight policy."""
+        if policy is not None:
+            self.policy = policy
+        self._cancelled.set()
+
+    def pause(self) -> None:
+        """Stop before the next request until resumed."""
+        self._paused.set()
+
+    def resume(self) -> None:
+        """Continue from where work was paused."""
+        self._paused.clear()
+
+    async def checkpoint(self) -> None:
+        """Wait while paused; raise GenerationCancelled once cancelled."""
+        while True:
+            if self._cancelled.is_set():
+                raise GenerationCancelled()
+            if not self._paused.is_set():
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a request, honouring cancellation while it is in flight.
+
+        Coroutine functions run as tasks and are cancelled outright on
+        abort; for streaming requests that closes the stream, so the server
+        stops generating. Blocking callables run on a shared thread pool
+        that the job's event loop does not wait for: on abort the job stops
+        at once and the abandoned call is left to finish on its thread with
+        its result discarded. A blocking client cannot be interrupted
+        mid-request, so the server may still complete that one request.
+        """
+        await self.checkpoint()
+
+        if inspect.iscoroutinefunction(func):
+            task = asyncio.ensure_future(func(*args, **kwargs))
+        else:
+            context = contextvars.copy_context()
+            task = asyncio.get_running_loop().run_in_executor(
+                _BLOCKING_CALLS, functools.partial(context.run, func, *args, **kwargs)
+            )
+
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.poll_interval)
+            if done:
+                return task.result()
+            if self._cancelled.is_set() and self.policy == ABORT:
+                task.cancel()
+                raise GenerationCancelled("Generation cancelled with a request in flight")
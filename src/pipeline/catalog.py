@@ -0,0 +1,195 @@
+"""Persistent catalog of pipeline runs and their exported datasets."""
+from typing import Any, Dict, List, Optional, Tuple, Union
+from contextlib import closing
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+import json
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    config_hash TEXT,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    question_count INTEGER NOT NULL DEFAULT 0,
+    answer_count INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    export_path TEXT,
+    error TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at DESC);
+CREATE INDEX IF NOT EXISTS runs_status_created ON runs (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (config_hash);
+"""
+
+@dataclass
+class RunRecord:
+    """One pipeline run as stored in the catalog."""
+    id: str
+    name: str
+    status: str = "running"
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    config_hash: Optional[str] = None
+    chunk_count: int = 0
+    question_count: int = 0
+    answer_count: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    export_path: Optional[str] = None  # dataset file, or JSONL shard manifest
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+_COLUMNS = [f.name for f in fields(RunRecord)]
+
+class RunCatalog:
+    """
+    SQLite catalog of runs, queried a page at a time.
+
+    Listing and counting use indexes on creation time and status, so a
+    page loads in constant time however many runs are stored. Every call
+    opens its own connection, so job threads and Streamlit sessions can
+    share one catalog; WAL mode lets readers proceed while a run is
+    being recorded.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize with the database file, creating it if needed."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def add(self, run: RunRecord) -> None:
+        """Insert a run, replacing any existing run with the same ID."""
+        row = asdict(run)
+        row["metadata"] = json.dumps(run.metadata, default=str)
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                [row[name] for name in _COLUMNS]
+            )
+
+    def update(self, run_id: str, **values: Any) -> None:
+        """Set fields of a stored run."""
+        unknown = set(values) - (set(_COLUMNS) - {"id"})
+        if unknown:
+            raise ValueError(f"Unknown run fields: {', '.join(sorted(unknown))}")
+        if "metadata" in values:
+            values["metadata"] = json.dumps(values["metadata"], default=str)
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"UPDATE runs SET {assignments} WHERE id = ?", [*values.values(), run_id])
+
+    def finish(self,
+               run_id: str,
+               status: str,
+               result: Optional[Dict[str, Any]] = None,
+               error: Optional[str] = None) -> None:
+        """
+        Record how a run ended, with counts and token usage from its result.
+
+        Args:
+            run_id: Run to update
+            status: "completed", "cancelled" or "failed"
+            result: Pipeline result dict (possibly partial)
+            error: Failure message
+        """
+        values: Dict[str, Any] = {"status": status, "finished_at": time.time(), "error": error}
+        if result:
+            metadata = result.get("metadata") or {}
+            usage = metadata.get("token_usage") or {}
+            values.update(
+                chunk_count=len(result.get("chunks") or []),
+                question_count=len(result.get("questions") or []),
+                answer_count=len(result.get("answers") or []),
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                metadata=metadata
+            )
+        self.update(run_id, **values)
+
+    def mark_interrupted(self) -> int:
+        """
+        Mark runs still recorded as running as failed.
+
+        Call once at start-up, before any run of this process is added:
+        jobs live in the server process, so a restart kills any run that
+        was in progress. Returns the number of runs marked.
+        """
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "UPDATE runs SET status = 'failed', finished_at = ?, error = ? WHERE status = 'running'",
+                (time.time(), "Interrupted by a server restart")
+            ).rowcount
+
+    def get(self, run_id: str) -> Optional[RunRecord]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def delete(self, run_id: str) -> None:
+        """Remove a run from the catalog; its files are left alone."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    @staticmethod
+    def _where(status: Optional[str], search: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if search:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, status: Optional[str] = None, search: Optional[str] = None) -> int:
+        """Number of runs matching the filters."""
+        where, params = self._where(status, search)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM runs{where}", params).fetchone()[0]
+
+    def list_runs(self,
+                  status: Optional[str] = None,
+                  search: Optional[str] = None,
+                  limit: int = 20,
+                  offset: int = 0) -> List[RunRecord]:
+        """
+        One page of runs, newest first.
+
+        Args:
+            status: Only runs with this status
+            search: Only runs whose name contains this text
+            limit: Page size
+            offset: Runs to skip
+        """
+        where, params = self._where(status, search)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM runs{where} "
+                "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    @staticmethod
+    def _record(row: tuple) -> RunRecord:
+        values = dict(zip(_COLUMNS, row))
+        values["metadata"] = json.loads(values["metadata"] or "{}")
+        return RunRecord(**values)
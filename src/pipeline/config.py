@@ -2,6 +2,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from .providers.interfaces import ProviderConfig
+from .routing import ModelRoute, DEFAULT_MODEL
 
 @dataclass
 class PipelineConfig:
@@ -23,6 +24,30 @@ class PipelineConfig:
     temperature: float = 0.7
     max_tokens: int = 1000
     quality_threshold: float = 0.7
+    max_concurrent_requests: int = 1
+    answer_queue_size: int = 8
+    dedup_threshold: Optional[float] = 0.85  # None keeps near-duplicate questions
+    
+    # Model routing
+    question_model: str = DEFAULT_MODEL
+    answer_model: str = DEFAULT_MODEL
+    cascade_model: Optional[str] = None  # small draft model; None disables the cascade
+    cascade_min_confidence: float = 0.6
+    
+    # Output format: stream tagged JSON, or constrain decoding to a JSON schema
+    stream_completions: bool = True
+    structured_output: bool = False
+    
+    def route(self, stage: str) -> ModelRoute:
+        """Model route for the "questions" or "answers" stage."""
+        models = {"questions": self.question_model, "answers": self.answer_model}
+        if stage not in models:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        return ModelRoute(
+            model_id=models[stage],
+            draft_model_id=self.cascade_model,
+            min_confidence=self.cascade_min_confidence
+        )
     
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'PipelineConfig':
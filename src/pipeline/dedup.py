@@ -0,0 +1,215 @@
+"""Near-duplicate question detection with MinHash and LSH banding."""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+import re
+
+import numpy as np
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+_BLOCK_SHINGLES = 1 << 16  # shingles hashed per vectorized block
+
+def _normalize(text: str) -> str:
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+
+def _shingle_keys(texts: Sequence[str], size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Byte shingles of the normalized texts, packed into integers.
+
+    Returns:
+        (shingles, owners): every shingle of every text, in text order, and
+        the index of the text each one came from
+    """
+    encoded = [_normalize(text).encode().ljust(size) for text in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+    # Shingle i covers bytes i..i+size-1; keep those inside a single text
+    counts = lengths - size + 1
+    ends = np.cumsum(lengths)
+    owners = np.repeat(np.arange(len(texts)), counts)
+    starts = np.repeat(ends - lengths, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+
+    shingles = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(size):
+        shingles = (shingles << np.uint64(8)) | data[starts + offset]
+    return shingles, owners
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH threshold (1/b)^(1/r) is closest to ``threshold``."""
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+@dataclass
+class DedupResult:
+    """Outcome of deduplicating a batch of questions."""
+    kept: List[Dict[str, Any]]
+    merged: Dict[int, List[int]] = field(default_factory=dict)  # kept index -> merged indices
+
+    @property
+    def removed(self) -> int:
+        return sum(len(indices) for indices in self.merged.values())
+
+class MinHashDeduplicator:
+    """
+    Finds near-duplicate texts by estimated Jaccard similarity of their
+    character shingles.
+
+    Signatures are computed with vectorized multiply-shift hashing over all
+    shingles at once; LSH banding limits comparisons to candidate pairs, and
+    candidates are confirmed against ``threshold`` on their signatures.
+    Also works incrementally through ``find``/``add``.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 num_perm: int = 64,
+                 shingle_size: int = 4,
+                 seed: int = 1):
+        """Initialize with the similarity threshold and signature size."""
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        # Incremental index
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """MinHash signatures, one row of ``num_perm`` uint32 values per text."""
+        result = np.full((self.num_perm, len(texts)), np.iinfo(np.uint32).max, dtype=np.uint32)
+        if not texts:
+            return result.T
+        shingles, owners = _shingle_keys(texts, self.shingle_size)
+
+        with np.errstate(over="ignore"):
+            for start in range(0, len(shingles), _BLOCK_SHINGLES):
+                block = shingles[start:start + _BLOCK_SHINGLES]
+                block_owners = owners[start:start + _BLOCK_SHINGLES]
+                # Multiply-shift hashing: one row per permutation
+                hashed = ((self._a[:, None] * block + self._b[:, None]) >> np.uint64(32)).astype(np.uint32)
+                # Shingles are grouped by owner, so reduce each owner's run at once
+                runs = np.flatnonzero(np.diff(block_owners, prepend=-1))
+                ids = block_owners[runs]
+                result[:, ids] = np.minimum(result[:, ids], np.minimum.reduceat(hashed, runs, axis=1))
+        return np.ascontiguousarray(result.T)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One uint64 key per (text, band)."""
+        bands = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        with np.errstate(over="ignore"):
+            return (bands * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    def similarity(self, left: np.ndarray, right: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(left == right))
+
+    def deduplicate(self,
+                    questions: List[Dict[str, Any]],
+                    key: str = "question",
+                    score_key: str = "quality_score") -> DedupResult:
+        """
+        Collapse near-duplicate questions.
+
+        Each cluster keeps its highest-scored question (the earliest on
+        ties); the kept question lists the texts it absorbed under
+        ``merged_duplicates``.
+
+        Returns:
+            DedupResult with the kept questions in original order
+        """
+        if not questions:
+            return DedupResult(kept=[])
+
+        signatures = self.signatures([q.get(key, "") for q in questions])
+        keys = self._band_keys(signatures)
+        parent = list(range(len(questions)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            # Pair each bucket member with the bucket's first member
+            order = np.argsort(keys[:, band], kind="stable")
+            first_in_run = np.diff(keys[order, band], prepend=keys[order[0], band] + np.uint64(1)) != 0
+            leaders = order[first_in_run][np.cumsum(first_in_run) - 1]
+            left, right = leaders[~first_in_run], order[~first_in_run]
+            similar = (signatures[left] == signatures[right]).mean(axis=1) >= self.threshold
+            for a, b in zip(left[similar].tolist(), right[similar].tolist()):
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(questions)):
+            clusters.setdefault(find(i), []).append(i)
+
+        kept_indices = []
+        merged: Dict[int, List[int]] = {}
+        for members in clusters.values():
+            best = max(members, key=lambda i: (questions[i].get(score_key) or 0, -i))
+            kept_indices.append(best)
+            others = [i for i in members if i != best]
+            if others:
+                merged[best] = others
+
+        kept = []
+        for i in sorted(kept_indices):
+            question = questions[i]
+            if i in merged:
+                question = {
+                    **question,
+                    "merged_duplicates": [questions[j].get(key, "") for j in merged[i]]
+                }
+            kept.append(question)
+        return DedupResult(kept=kept, merged=merged)
+
+    def find(self, text: str) -> Optional[int]:
+        """Return the ID of an indexed near-duplicate of ``text``, if any."""
+        signature = self.signatures([text])[0]
+        return self._match(signature, self._band_keys(signature[None, :])[0])
+
+    def add(self, text: str) -> Optional[int]:
+        """
+        Index ``text`` unless it duplicates an indexed text.
+
+        Returns:
+            The ID of the existing near-duplicate, or None if ``text`` was
+            added (with ID ``len(self) - 1``)
+        """
+        signature = self.signatures([text])[0]
+        band_keys = self._band_keys(signature[None, :])[0]
+        match = self._match(signature, band_keys)
+        if match is not None:
+            return match
+
+        text_id = len(self._signatures)
+        self._signatures.append(signature)
+        for band, band_key in enumerate(band_keys.tolist()):
+            self._buckets[band].setdefault(band_key, []).append(text_id)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _match(self, signature: np.ndarray, band_keys: np.ndarray) -> Optional[int]:
+        seen = set()
+        for band, band_key in enumerate(band_keys.tolist()):
+            for candidate in self._buckets[band].get(band_key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if self.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    return candidate
+        return None
@@ -0,0 +1,79 @@
+"""Progress event bus between pipeline workers and the UI."""
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+import multiprocessing
+import queue
+import time
+
+from .types import ProgressCallback
+
+@dataclass
+class ProgressEvent:
+    """A progress update for one pipeline step."""
+    step_id: str
+    progress: float
+    message: str = ""
+    status: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+class ProgressBus:
+    """
+    Queue-backed bus that workers publish progress to and the UI drains.
+
+    Publishing never blocks on rendering. The default queue is thread-safe;
+    use ``ProgressBus.for_processes()`` when workers run in other processes.
+    """
+
+    def __init__(self, event_queue: Optional[Any] = None):
+        """Initialize with an optional queue (anything with put_nowait/get_nowait)."""
+        self._queue = event_queue if event_queue is not None else queue.SimpleQueue()
+
+    @classmethod
+    def for_processes(cls, context: Optional[Any] = None) -> 'ProgressBus':
+        """Create a bus backed by a multiprocessing queue, safe to pass to child processes."""
+        ctx = context or multiprocessing.get_context()
+        return cls(ctx.Queue())
+
+    def publish(self,
+                step_id: str,
+                progress: float,
+                message: str = "",
+                status: Optional[str] = None) -> None:
+        """Publish a progress update for a step."""
+        progress = min(max(progress, 0.0), 1.0)
+        self._queue.put_nowait(ProgressEvent(step_id, progress, message, status))
+
+    def callback(self,
+                 step_id: str,
+                 start: float = 0.0,
+                 end: float = 1.0) -> ProgressCallback:
+        """Return a (progress, message) callback that maps onto [start, end] of a step."""
+        def _callback(progress: float, message: str) -> None:
+            self.publish(step_id, start + progress * (end - start), message)
+        return _callback
+
+    def drain(self, max_events: Optional[int] = None) -> List[ProgressEvent]:
+        """
+        Pop pending events and coalesce them to the latest update per step.
+
+        A status carried by an intermediate event (e.g. "completed") is kept
+        unless a later event for the same step sets a different one.
+
+        Returns:
+            List[ProgressEvent]: One event per step, in first-seen order
+        """
+        latest: Dict[str, ProgressEvent] = {}
+        drained = 0
+        while max_events is None or drained < max_events:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            drained += 1
+
+            previous = latest.get(event.step_id)
+            if previous is not None and event.status is None:
+                event.status = previous.status
+            latest[event.step_id] = event
+
+        return list(latest.values())
@@ -0,0 +1,260 @@
+"""Streaming and columnar export of Q&A records."""
+from typing import Any, Dict, Iterable, List, Optional, Union
+from pathlib import Path
+import gzip
+import itertools
+import json
+
+import pandas as pd
+
+# Columns with a fixed type in columnar exports; other keys go to "extra" as JSON
+RECORD_COLUMNS = {
+    "question": "string",
+    "answer": "string",
+    "explanation": "string",
+    "context": "string",
+    "difficulty": "string",
+    "type": "string",
+    "source": "string",
+    "model": "string",
+    "answer_model": "string",
+    "chunk_index": "int64",
+    "quality_score": "float64",
+    "confidence": "float64",
+    "grounding_score": "float64",
+}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+def _coerce(value: Any, type_: str) -> Any:
+    """``value`` as a RECORD_COLUMNS type; raises ValueError when it does not fit."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{type(value).__name__} is not {type_}")
+    if type_ == "string":
+        return value if isinstance(value, str) else str(value)
+    if type_ == "float64":
+        return float(value)
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{value!r} is not int64")
+    return int(number)
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet and Arrow export need pyarrow: pip install pyarrow")
+    return pyarrow
+
+class JsonlShardWriter:
+    """
+    Appends records to JSONL shards, starting a new shard past a size limit.
+
+    Records are written as they arrive and never held in memory. Shards are
+    named ``<prefix>-00000.jsonl`` (``.jsonl.gz`` when compressed), and
+    ``close`` writes a ``<prefix>-manifest.json`` listing them with their
+    record counts.
+    """
+
+    def __init__(self,
+                 directory: Union[str, Path],
+                 prefix: str = "qa",
+                 max_records: int = 100_000,
+                 compress: bool = False):
+        """Initialize with the output directory and records per shard."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_records = max_records
+        self.compress = compress
+        self.shards: List[Dict[str, Any]] = []
+        self._file = None
+
+    @property
+    def records_written(self) -> int:
+        return sum(shard["records"] for shard in self.shards)
+
+    def _rotate(self) -> None:
+        if self._file:
+            self._file.close()
+        name = f"{self.prefix}-{len(self.shards):05d}.jsonl" + (".gz" if self.compress else "")
+        path = self.directory / name
+        self._file = gzip.open(path, "wt", encoding="utf-8") if self.compress \
+            else open(path, "w", encoding="utf-8")
+        self.shards.append({"path": name, "records": 0})
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record."""
+        if self._file is None or self.shards[-1]["records"] >= self.max_records:
+            self._rotate()
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.shards[-1]["records"] += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> Path:
+        """Finish the last shard and write the manifest; returns the manifest path."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        manifest = self.directory / f"{self.prefix}-manifest.json"
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump({"shards": self.shards, "records": self.records_written}, f, indent=2)
+        return manifest
+
+    def __enter__(self) -> 'JsonlShardWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class ColumnarWriter:
+    """
+    Writes records to Parquet or Arrow IPC in fixed-size record batches.
+
+    Only one batch is buffered at a time. Known fields get typed columns
+    (see RECORD_COLUMNS); anything else is kept as a JSON string in
+    "extra", so every batch shares one schema. Model output is not
+    validated, so known fields are coerced to their column type (e.g. a
+    difficulty of 3 becomes "3"), and values that do not fit go to "extra".
+    """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 format: str = "parquet",
+                 compression: Optional[str] = "zstd",
+                 batch_size: int = 10_000):
+        """Initialize with the output file, "parquet" or "arrow", and codec."""
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        pa = _pyarrow()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.batch_size = batch_size
+        self.schema = pa.schema(
+            [pa.field(name, type_) for name, type_ in RECORD_COLUMNS.items()]
+            + [pa.field("extra", "string")]
+        )
+        if format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self.path, self.schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(str(self.path), self.schema, options=options)
+        self._buffer: List[Dict[str, Any]] = []
+        self.records_written = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Buffer one record, flushing a batch when full."""
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write the buffered records as one record batch."""
+        if not self._buffer:
+            return
+        pa = _pyarrow()
+        columns: Dict[str, List[Any]] = {name: [] for name in RECORD_COLUMNS}
+        columns["extra"] = []
+        for record in self._buffer:
+            extra = {k: v for k, v in record.items() if k not in RECORD_COLUMNS}
+            for name, type_ in RECORD_COLUMNS.items():
+                value = record.get(name)
+                try:
+                    value = _coerce(value, type_)
+                except (ValueError, OverflowError):
+                    extra[name], value = value, None
+                columns[name].append(value)
+            columns["extra"].append(json.dumps(extra, default=str) if extra else None)
+        self._writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=self.schema))
+        self.records_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> Path:
+        """Flush and finish the file; returns its path."""
+        self.flush()
+        self._writer.close()
+        return self.path
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def open_dataset(path: Union[str, Path]):
+    """
+    Load an exported Parquet or Arrow file as a pyarrow Table.
+
+    Arrow files are memory-mapped, so their columns are read zero-copy;
+    Parquet files are memory-mapped and decoded.
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pa.parquet.read_table(path, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+def export_records(records: Iterable[Dict[str, Any]],
+                   path: Union[str, Path],
+                   format: str = "parquet",
+                   **options: Any) -> Path:
+    """
+    Stream records to ``path`` in ``format`` ("jsonl", "parquet" or "arrow").
+
+    For "jsonl", ``path`` is the shard directory and the manifest path is
+    returned.
+    """
+    writer = JsonlShardWriter(path, **options) if format == "jsonl" \
+        else ColumnarWriter(path, format, **options)
+    try:
+        writer.write_many(records)
+    finally:
+        written = writer.close()
+    return written
+
+def preview_dataset(path: Union[str, Path], limit: int = 50) -> pd.DataFrame:
+    """
+    First ``limit`` records of an export, reading no more of it than needed.
+
+    ``path`` is a Parquet or Arrow file, or a JSONL shard manifest.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        shards = json.loads(path.read_text(encoding="utf-8"))["shards"]
+        records: List[Dict[str, Any]] = []
+        for shard in shards:
+            shard_path = path.parent / shard["path"]
+            opener = gzip.open if shard_path.suffix == ".gz" else open
+            with opener(shard_path, "rt", encoding="utf-8") as f:
+                records += [json.loads(line) for line in itertools.islice(f, limit - len(records))]
+            if len(records) >= limit:
+                break
+        return pd.DataFrame(records)
+
+    pa = _pyarrow()
+    if path.suffix == ".parquet":
+        batches = pa.parquet.ParquetFile(path, memory_map=True).iter_batches(batch_size=limit)
+        batch = next(batches, None)
+        return batch.to_pandas() if batch is not None else pd.DataFrame()
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        batches, rows = [], 0
+        for i in range(reader.num_record_batches):
+            if rows >= limit:
+                break
+            batches.append(reader.get_batch(i))
+            rows += batches[-1].num_rows
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        return table.slice(0, limit).to_pandas()
@@ -1,52 +1,150 @@
 """Answer generation for questions."""
 from typing import List, Dict, Any, Optional, Callable
-from llama_stack_client import LlamaStackClient
 from llama_stack_client.types import UserMessage, SystemMessage
+from ..providers.base import LLMProvider
+from ..routing import ModelRoute
+from ..metrics import StageStats, estimate_tokens
+from ..cancellation import CancellationToken, GenerationCancelled
+from ..streaming import JsonBlockScanner, complete_json
+from ..schemas import ANSWER_OUTPUT
 import json
 import os
+import time
 
 class AnswerGenerator:
     """Generates answers for questions."""
     
-    def __init__(self, client: LlamaStackClient):
-        """Initialize with LlamaStack client."""
-        self.client = client
+    def __init__(self,
+                 provider: LLMProvider,
+                 route: Optional[ModelRoute] = None,
+                 stream: bool = True,
+                 structured: bool = False):
+        """Initialize with an LLM provider and the models to route requests to.
+        
+        ``stream`` streams completions and stops at the closing </json> tag.
+        ``structured`` instead constrains output to a JSON schema and drops
+        the step-by-step analysis from the prompt.
+        """
+        self.provider = provider
+        self.route = route or ModelRoute()
+        self.stream = stream
+        self.structured = structured
+        self.stats = StageStats()
     
     async def generate(self,
                       questions: List[Dict[str, Any]],
-                      progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
-        """Generate answers for questions."""
+                      progress_callback: Optional[Callable] = None,
+                      cancel_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
+        """Generate answers for questions.
+        
+        Stops between questions while ``cancel_token`` is paused and raises
+        GenerationCancelled (with the answers so far) once it is cancelled.
+        """
+        cancel_token = cancel_token or CancellationToken()
         answers = []
         total = len(questions)
         
         try:
             for i, question in enumerate(questions):
+                await cancel_token.checkpoint()
+                
                 if progress_callback:
                     progress = i / total
                     progress_callback(progress, f"Generating answer {i+1}/{total}")
                 
-                messages = [
-                    UserMessage(content=self._build_prompt(question), role="user")
-                ]
-                
-                response = self.client.inference.chat_completion(
-                    model_id="meta-llama/Llama-3.1-70B-Instruct",
-                    messages=messages
-                )
-                
-                answer = self._parse_response(response.completion_message.content)
+                answer = await self.generate_answer(question, cancel_token)
                 answers.append(answer)
             
             if progress_callback:
                 progress_callback(1.0, "All answers generated!")
             
             return answers
-            
+        
+        except GenerationCancelled as e:
+            e.partial = answers
+            raise
         except Exception as e:
             raise ValueError(f"Failed to generate answers: {str(e)}")
     
+    async def generate_answer(self,
+                              question: Dict[str, Any],
+                              cancel_token: Optional[CancellationToken] = None,
+                              on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+                              ) -> Dict[str, Any]:
+        """Generate the answer for a single question.
+        
+        In cascade mode the draft model answers first; the question is only
+        escalated to the main model if the draft cannot be parsed or its
+        confidence is below the route's threshold. While streaming,
+        ``on_partial`` receives the answer fields completed so far.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        prompt = self._build_prompt(question)
+        model_id = self.route.first_model
+        
+        try:
+            answer = await self._complete(prompt, model_id, cancel_token, on_partial)
+            escalate = self.route.should_escalate(model_id, answer.get("confidence"))
+        except ValueError:
+            if model_id == self.route.model_id:
+                raise
+            escalate = True
+        
+        if escalate:
+            model_id = self.route.model_id
+            answer = await self._complete(prompt, model_id, cancel_token, on_partial)
+        
+        answer["model"] = model_id
+        return answer
+    
+    async def _complete(self,
+                        prompt: str,
+                        model_id: str,
+                        cancel_token: CancellationToken,
+                        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+                        ) -> Dict[str, Any]:
+        """Run one answer-generation call and parse it."""
+        messages = [
+            UserMessage(content=prompt, role="user")
+        ]
+        seen = 0
+        
+        def report(scanner: JsonBlockScanner) -> None:
+            nonlocal seen
+            fields = dict(scanner.fields())
+            if on_partial and len(fields) > seen:
+                seen = len(fields)
+                on_partial(fields)
+        
+        started = time.perf_counter()
+        if self.structured:
+            response = await cancel_token.call(
+                self.provider.chat_completion,
+                model_id=model_id,
+                messages=messages,
+                response_format=ANSWER_OUTPUT.response_format
+            )
+            content = response.completion_message.content
+            answer = ANSWER_OUTPUT.parse(content)
+        else:
+            content = await complete_json(
+                self.provider, messages, model_id, cancel_token,
+                stream=self.stream, on_update=report
+            )
+            answer = self._parse_response(content)
+        self.stats.record(
+            time.perf_counter() - started,
+            estimate_tokens(prompt),
+            estimate_tokens(content),
+            items=1
+        )
+        return answer
+    
     def _build_prompt(self, question: Dict[str, Any]) -> str:
         """Build prompt for answer generation."""
+        if self.structured:
+            return self._build_structured_prompt(question)
+        
         prompt = f"""
                   You are an advanced AI system specialized in generating focused, relevant answers based on provided context. Your task is to create a single, concise answer to a given question using only the information provided.
 
@@ -85,6 +183,20 @@ class AnswerGenerator:
                   """
         return prompt
 
+    def _build_structured_prompt(self, question: Dict[str, Any]) -> str:
+        """Build prompt for schema-constrained answer generation."""
+        return f"""
+                  Answer the question using only the context below. Be concise. If the context
+                  does not contain the answer, say that you cannot answer the question.
+
+                  Context: {question['context']}
+
+                  Question: {question['question']}
+
+                  Reply with the JSON object only: the answer, a one-sentence explanation, and
+                  your confidence from 0.0 to 1.0.
+                  """
+    
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse response into answer."""
         try:
@@ -57,7 +57,9 @@ class QAGenerator(DataGenerator):
         
         if stream:
             async def stream_generator():
-                response = await self.provider.generate_synthetic_data(prompt, synthetic_config)
+                response = self._check_synthetic(
+                    await self.provider.generate_synthetic_data(prompt, synthetic_config)
+                )
                 for idx, pair in enumerate(response.get("qa_pairs", [])):
                     progress = 0.3 + (0.7 * (idx + 1) / config["num_pairs"])
                     await self._report_progress(
@@ -68,10 +70,21 @@ class QAGenerator(DataGenerator):
                     yield pair
             return stream_generator()
         else:
-            response = await self.provider.generate_synthetic_data(prompt, synthetic_config)
+            response = self._check_synthetic(
+                await self.provider.generate_synthetic_data(prompt, synthetic_config)
+            )
             await self._report_progress(1.0, "Generation complete!", progress_callback)
             return response.get("qa_pairs", [])
     
+    def _check_synthetic(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Raise if every batch request failed; partial failures are kept in ``errors``."""
+        if not response.get("qa_pairs") and response.get("errors"):
+            first = response["errors"][0]["error"]
+            raise ValueError(
+                f"Synthetic generation failed for all {len(response['errors'])} requests: {first}"
+            )
+        return response
+    
     async def _generate_traditional(self,
                                   input_data: str,
                                   config: Dict[str, Any],
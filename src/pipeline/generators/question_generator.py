@@ -1,21 +1,51 @@
 """Question generation from document chunks."""
 from typing import List, Dict, Any, Optional, Callable
-from llama_stack_client import LlamaStackClient
 from llama_stack_client.types import UserMessage, SystemMessage
+from ..providers.base import LLMProvider
+from ..routing import ModelRoute
+from ..metrics import StageStats, estimate_tokens
+from ..cancellation import CancellationToken, GenerationCancelled
+from ..streaming import JsonBlockScanner, complete_json
+from ..schemas import QUESTIONS_OUTPUT
+from ..quality import QuestionScorer
 import json
 import os
+import time
 
 class QuestionGenerator:
     """Generates questions using LLM."""
     
-    def __init__(self, client: LlamaStackClient):
-        """Initialize with LlamaStack client."""
-        self.client = client
+    def __init__(self,
+                 provider: LLMProvider,
+                 route: Optional[ModelRoute] = None,
+                 stream: bool = True,
+                 structured: bool = False,
+                 scorer: Optional[QuestionScorer] = None):
+        """Initialize with an LLM provider and the models to route requests to.
+        
+        ``stream`` streams completions and stops at the closing </json> tag.
+        ``structured`` instead constrains output to a JSON schema and uses a
+        shorter prompt without tag instructions. ``scorer`` sets each
+        question's quality_score.
+        """
+        self.provider = provider
+        self.route = route or ModelRoute()
+        self.stream = stream
+        self.structured = structured
+        self.scorer = scorer or QuestionScorer()
+        self.stats = StageStats()
 
     async def generate(self,
                       context: str,
-                      progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
-        """Generate questions from context."""
+                      progress_callback: Optional[Callable] = None,
+                      cancel_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
+        """Generate questions from context.
+        
+        Stops between chunks while ``cancel_token`` is paused and raises
+        GenerationCancelled (with the questions so far) once it is cancelled.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        all_questions = []
         try:
             # Split context into chunks if it's not already chunked
             if not isinstance(context, list):
@@ -23,41 +53,113 @@ class QuestionGenerator:
             else:
                 chunks = context
 
-            all_questions = []
             total_chunks = len(chunks)
 
             for i, chunk in enumerate(chunks):
+                await cancel_token.checkpoint()
+                
                 if progress_callback:
                     progress = i / total_chunks
                     progress_callback(progress, f"Generating questions for chunk {i+1}/{total_chunks}")
 
-                messages = [
-                    UserMessage(content=self._build_prompt(chunk), role="user")
-                ]
-                
-                response = self.client.inference.chat_completion(
-                    model_id="meta-llama/Llama-3.1-70B-Instruct",
-                    messages=messages,
-                )
-
-                chunk_questions = self._parse_response(response.completion_message.content, chunk)
-                
-                # Add chunk index to each question
-                for q in chunk_questions:
-                    q['chunk_index'] = i
-                
+                chunk_questions = await self.generate_for_chunk(chunk, i, cancel_token)
                 all_questions.extend(chunk_questions)
 
             if progress_callback:
                 progress_callback(1.0, f"Generated {len(all_questions)} questions!")
             
             return all_questions
-                
+        
+        except GenerationCancelled as e:
+            e.partial = all_questions
+            raise
         except Exception as e:
             raise ValueError(f"Failed to generate questions: {str(e)}")
+    
+    async def generate_for_chunk(self,
+                                 chunk: str,
+                                 chunk_index: int,
+                                 cancel_token: Optional[CancellationToken] = None,
+                                 on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+                                 ) -> List[Dict[str, Any]]:
+        """Generate questions for a single chunk.
+        
+        In cascade mode the draft model goes first, and the chunk is only
+        regenerated with the main model if the draft cannot be parsed or
+        contains no questions. While streaming, ``on_partial`` receives
+        ``{"questions": [...]}`` each time another question is complete.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        prompt = self._build_prompt(chunk)
+        model_id = self.route.first_model
+        
+        try:
+            chunk_questions = await self._complete(prompt, chunk, model_id, cancel_token, on_partial)
+            if not chunk_questions and self.route.cascade:
+                raise ValueError("Draft contained no questions")
+        except ValueError:
+            if model_id == self.route.model_id:
+                raise
+            model_id = self.route.model_id
+            chunk_questions = await self._complete(prompt, chunk, model_id, cancel_token, on_partial)
+        
+        # Add chunk index, model and quality score to each question
+        self.scorer.apply(chunk_questions, chunk)
+        for q in chunk_questions:
+            q['chunk_index'] = chunk_index
+            q['model'] = model_id
+        
+        return chunk_questions
+    
+    async def _complete(self,
+                        prompt: str,
+                        chunk: str,
+                        model_id: str,
+                        cancel_token: CancellationToken,
+                        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+                        ) -> List[Dict[str, Any]]:
+        """Run one question-generation call and parse it."""
+        messages = [
+            UserMessage(content=prompt, role="user")
+        ]
+        seen = 0
+        
+        def report(scanner: JsonBlockScanner) -> None:
+            nonlocal seen
+            questions = [value for key, value in scanner.fields() if key == "question"]
+            if on_partial and len(questions) > seen:
+                seen = len(questions)
+                on_partial({"questions": questions})
+        
+        started = time.perf_counter()
+        if self.structured:
+            response = await cancel_token.call(
+                self.provider.chat_completion,
+                model_id=model_id,
+                messages=messages,
+                response_format=QUESTIONS_OUTPUT.response_format
+            )
+            content = response.completion_message.content
+            chunk_questions = self._parse_structured(content, chunk)
+        else:
+            content = await complete_json(
+                self.provider, messages, model_id, cancel_token,
+                stream=self.stream, on_update=report
+            )
+            chunk_questions = self._parse_response(content, chunk)
+        self.stats.record(
+            time.perf_counter() - started,
+            estimate_tokens(prompt),
+            estimate_tokens(content),
+            items=len(chunk_questions)
+        )
+        return chunk_questions
         
     def _build_prompt(self, context: str) -> str:
         """Build prompt for question generation."""
+        if self.structured:
+            return self._build_structured_prompt(context)
+        
         prompt = f"""You are a question generation AI tasked with creating 2-3 focused questions based on provided context. Here's the context you'll be working with:
                 <context>
                 {context}
@@ -92,6 +194,30 @@ class QuestionGenerator:
                 """
 
         return prompt
+    
+    def _build_structured_prompt(self, context: str) -> str:
+        """Build prompt for schema-constrained question generation."""
+        return f"""Write 2-3 focused questions that can be fully answered from this context:
+                <context>
+                {context}
+                </context>
+
+                Each question must be self-contained, at most 15 words, and must not mention
+                "the context". Mix difficulties (basic/intermediate/advanced) and types
+                (factual/conceptual/analytical). Reply with the JSON object only.
+                """
+    
+    def _parse_structured(self, response: str, context: str) -> List[Dict[str, Any]]:
+        """Validate schema-constrained output into questions."""
+        data = QUESTIONS_OUTPUT.parse(response)
+        return [
+            {
+                **q,
+                "context": context
+            }
+            for q in data["questions"]
+        ]
+    
     def _parse_response(self, response: str, context: str) -> List[Dict[str, Any]]:
         print(f"Response: {response}")
         """Parse response into questions."""
@@ -111,8 +237,7 @@ class QuestionGenerator:
             return [
                 {
                     **q,
-                    "context": context,
-                    "quality_score": 0.8  # Could be calculated based on metrics
+                    "context": context
                 }
                 for q in data["questions"]
             ]
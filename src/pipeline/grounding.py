@@ -0,0 +1,112 @@
+"""Lexical grounding of answers in their source chunk."""
+from typing import Any, Dict, List, Tuple
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+import re
+
+from .quality import STOPWORDS
+
+_TOKEN = re.compile(r"\w+(?:'\w+)?")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+@dataclass
+class Grounding:
+    """How well an answer is supported by its chunk."""
+    score: float
+    evidence: List[Tuple[int, int]] = field(default_factory=list)  # (start, end) in the chunk
+
+class ChunkIndex:
+    """
+    Word n-gram index over one chunk's sentences.
+
+    Maps every word n-gram (1..ngram_size) to the sentences containing it,
+    so an answer is matched with one hash lookup per n-gram instead of a
+    scan over the chunk.
+    """
+
+    def __init__(self, text: str, ngram_size: int = 3):
+        """Tokenize and index ``text``."""
+        self.ngram_size = ngram_size
+        self.sentences: List[Tuple[int, int]] = []
+        position = 0
+        for match in _SENTENCE_END.finditer(text):
+            if match.start() > position:
+                self.sentences.append((position, match.start()))
+            position = match.end()
+        if position < len(text):
+            self.sentences.append((position, len(text)))
+
+        self.ngrams: Dict[Tuple[str, ...], List[int]] = {}
+        for sentence_id, (start, end) in enumerate(self.sentences):
+            words = [w.lower() for w in _TOKEN.findall(text, start, end)]
+            for n in range(1, ngram_size + 1):
+                for i in range(len(words) - n + 1):
+                    sentences = self.ngrams.setdefault(tuple(words[i:i + n]), [])
+                    if not sentences or sentences[-1] != sentence_id:
+                        sentences.append(sentence_id)
+
+class GroundingVerifier:
+    """
+    Scores answers by lexical support in their source chunk.
+
+    The score averages coverage of the answer's content words with
+    coverage of its longer word n-grams, so paraphrases keep partial
+    credit while copied phrases score highest. Evidence is the sentences
+    with the most matches (at least half as many as the best one), as
+    character offsets into the chunk. Chunk indexes are kept in a small
+    LRU cache since a chunk has several answers.
+    """
+
+    def __init__(self, ngram_size: int = 3, max_evidence: int = 2, cache_size: int = 128):
+        """Initialize with the longest n-gram to match and the evidence limit."""
+        self.ngram_size = ngram_size
+        self.max_evidence = max_evidence
+        self.cache_size = cache_size
+        self._indexes: "OrderedDict[str, ChunkIndex]" = OrderedDict()
+
+    def index(self, context: str) -> ChunkIndex:
+        """Index for ``context``, built once and cached."""
+        index = self._indexes.get(context)
+        if index is None:
+            index = ChunkIndex(context, self.ngram_size)
+            self._indexes[context] = index
+            if len(self._indexes) > self.cache_size:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(context)
+        return index
+
+    def verify(self, answer: str, context: str) -> Grounding:
+        """Grounding score in [0, 1] and evidence spans for one answer."""
+        index = self.index(context)
+        words = [w.lower() for w in _TOKEN.findall(answer)]
+        content = [(w,) for w in words if w not in STOPWORDS]
+        n = min(self.ngram_size, len(words))
+        phrases = [tuple(words[i:i + n]) for i in range(len(words) - n + 1)] if n > 1 else []
+        if not content and not phrases:
+            return Grounding(score=0.0)
+
+        hits: Counter = Counter()
+        coverages = []
+        for ngrams in (content, phrases):
+            if not ngrams:
+                continue
+            found = 0
+            for ngram in ngrams:
+                sentences = index.ngrams.get(ngram)
+                if sentences:
+                    found += 1
+                    hits.update(sentences)
+            coverages.append(found / len(ngrams))
+
+        # Keep the best sentences, skipping ones that only share a stray word
+        top = hits.most_common(self.max_evidence)
+        evidence = sorted(index.sentences[s] for s, count in top if count * 2 >= top[0][1])
+        return Grounding(score=round(sum(coverages) / len(coverages), 3), evidence=evidence)
+
+    def apply(self, answer: Dict[str, Any], context: str) -> Dict[str, Any]:
+        """Set ``grounding_score`` and ``evidence`` on an answer dict in place."""
+        grounding = self.verify(answer.get("answer", ""), context)
+        answer["grounding_score"] = grounding.score
+        answer["evidence"] = [list(span) for span in grounding.evidence]
+        return answer
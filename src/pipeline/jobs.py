@@ -0,0 +1,141 @@
+"""Background job runner for long-running pipeline work."""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+import asyncio
+import itertools
+import threading
+import time
+import uuid
+
+from .events import ProgressBus
+from .cancellation import CancellationToken, GenerationCancelled
+
+# Submission order; created_at can tie for jobs submitted in the same tick
+_sequence = itertools.count()
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+@dataclass
+class Job:
+    """A unit of background work and its live status."""
+    id: str
+    name: str
+    status: JobStatus = JobStatus.PENDING
+    progress: float = 0.0
+    message: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    sequence: int = field(default_factory=lambda: next(_sequence))
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    bus: ProgressBus = field(default_factory=ProgressBus)
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    partial: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    def report(self, progress: float, message: str) -> None:
+        """Progress callback for the job's coroutine."""
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.message = message
+    
+    def preview(self, partial: Dict[str, Any]) -> None:
+        """Partial-result callback; keeps the latest item still being generated."""
+        self.partial = partial
+
+# A job body receives its Job (for report(), bus and cancel_token) and returns the result
+JobFunction = Callable[[Job], Awaitable[Any]]
+
+class JobRunner:
+    """
+    Runs async jobs on worker threads, independent of any script run.
+
+    Each job gets its own event loop on a pool thread, so several jobs make
+    progress at once even when the LLM client blocks. The registry keeps
+    the most recent jobs so the UI can attach to them after a rerun.
+    """
+
+    def __init__(self, max_workers: int = 4, max_history: int = 50):
+        """Initialize with worker count and number of finished jobs to keep."""
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.max_history = max_history
+
+    def submit(self,
+               name: str,
+               func: JobFunction,
+               metadata: Optional[Dict[str, Any]] = None) -> Job:
+        """Register a job and start it in the background."""
+        job = Job(id=uuid.uuid4().hex[:12], name=name, metadata=metadata or {})
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func: JobFunction) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = asyncio.run(func(job))
+            job.progress = 1.0
+            job.status = JobStatus.COMPLETED
+        except GenerationCancelled as e:
+            job.result = e.partial
+            job.status = JobStatus.CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond max_history (lock held)."""
+        excess = len(self._jobs) - self.max_history
+        if excess <= 0:
+            return
+        finished = sorted(
+            (job for job in self._jobs.values() if not job.is_active),
+            key=lambda j: j.sequence
+        )
+        for job in finished[:excess]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """Look up a job by ID."""
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str, policy: Optional[str] = None) -> bool:
+        """Cancel a job; returns False if it is unknown or already finished."""
+        job = self.get(job_id)
+        if job is None or not job.is_active:
+            return False
+        job.cancel_token.cancel(policy)
+        return True
+
+    def list_jobs(self, active_only: bool = False) -> List[Job]:
+        """Return jobs, newest first."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if active_only:
+            jobs = [job for job in jobs if job.is_active]
+        return sorted(jobs, key=lambda j: j.sequence, reverse=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,95 @@
+"""Runtime metrics collected from LLM calls."""
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Optional
+import re
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of tokens a Llama tokenizer produces for text.
+
+    Words and punctuation marks count as one token each, long words are
+    charged an extra token per eight characters.
+    """
+    if not text:
+        return 0
+    return sum(1 + len(piece) // 8 for piece in _TOKEN_PATTERN.findall(text))
+
+@dataclass
+class CallSample:
+    """Measurements for a single LLM call."""
+    latency: float
+    prompt_tokens: int
+    completion_tokens: int
+    items: int = 0
+
+@dataclass
+class TokenUsage:
+    """Tokens spent by the LLM calls of one run."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+# Usage of the run whose task is making the call; generators are shared between runs
+_run_usage: ContextVar[Optional[TokenUsage]] = ContextVar("run_usage", default=None)
+
+def track_usage() -> TokenUsage:
+    """
+    Count tokens of every call recorded from the current task onwards.
+
+    Tasks started afterwards inherit the counter, so calls made by a
+    pipeline's worker tasks add up to that run only, even when other jobs
+    use the same generators at the same time.
+    """
+    usage = TokenUsage()
+    _run_usage.set(usage)
+    return usage
+
+class StageStats:
+    """Rolling statistics over the most recent calls of a pipeline stage."""
+
+    def __init__(self, window: int = 50):
+        """Initialize with the number of recent calls to keep."""
+        self.samples: Deque[CallSample] = deque(maxlen=window)
+
+    def record(self,
+               latency: float,
+               prompt_tokens: int,
+               completion_tokens: int,
+               items: int = 0) -> None:
+        """Record the outcome of one call."""
+        self.samples.append(CallSample(latency, prompt_tokens, completion_tokens, items))
+        usage = _run_usage.get()
+        if usage is not None:
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+
+    @property
+    def count(self) -> int:
+        """Number of calls currently in the window."""
+        return len(self.samples)
+
+    def _mean(self, attr: str) -> Optional[float]:
+        if not self.samples:
+            return None
+        return sum(getattr(s, attr) for s in self.samples) / len(self.samples)
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """Mean wall time per call in seconds, or None without samples."""
+        return self._mean("latency")
+
+    @property
+    def mean_completion_tokens(self) -> Optional[float]:
+        """Mean completion tokens per call, or None without samples."""
+        return self._mean("completion_tokens")
+
+    @property
+    def mean_items(self) -> Optional[float]:
+        """Mean number of items (e.g. questions) produced per call."""
+        return self._mean("items")
@@ -1,12 +1,25 @@
 """Pipeline orchestrator for document processing and question generation."""
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Union
+import asyncio
 from .types import (
     ProcessingConfig, GenerationConfig, DocumentChunk, 
-    PipelineResult, ProgressCallback, Question
+    PipelineResult, ProgressCallback, Question, QAStore
 )
 from .processors.document_processor import DocumentProcessor
+from .processors.document_buffer import DocumentBuffer, ChunkSpan
+from .processors.tabular import table_metadata
+from .processors.batch import sources_metadata
 from .generators.question_generator import QuestionGenerator
 from .generators.answer_generator import AnswerGenerator
+from .dedup import MinHashDeduplicator
+from .quality import split_by_quality
+from .grounding import GroundingVerifier
+from .artifacts import ArtifactStore, StageGraph, StageNode, fingerprint
+from .regeneration import RegenerationCriteria, Regenerator, select_for_regeneration
+from .planner import RunPlan, plan_run
+from .events import ProgressBus
+from .metrics import track_usage
+from .cancellation import CancellationToken, GenerationCancelled, DRAIN
 
 class PipelineOrchestrator:
     """Orchestrates the document processing and question generation pipeline."""
@@ -14,17 +27,417 @@ class PipelineOrchestrator:
     def __init__(self, 
                  document_processor: DocumentProcessor,
                  question_generator: QuestionGenerator,
-                 answer_generator: AnswerGenerator):
-        """Initialize orchestrator with required components."""
+                 answer_generator: AnswerGenerator,
+                 grounding_verifier: Optional[GroundingVerifier] = None,
+                 artifacts: Optional[ArtifactStore] = None):
+        """Initialize orchestrator with required components.
+        
+        With ``artifacts``, chunk boundaries, questions and answers are
+        memoized on disk and reused by later runs whose stage inputs match.
+        """
         self.document_processor = document_processor
         self.question_generator = question_generator
         self.answer_generator = answer_generator
+        self.grounding_verifier = grounding_verifier or GroundingVerifier()
+        self.artifacts = artifacts
+    
+    def config_hash(self, generation_config: Optional[GenerationConfig] = None) -> str:
+        """Hash of every stage setting, independent of the input document."""
+        graph = self._stage_graph(b"", generation_config or GenerationConfig())
+        return fingerprint({name: node.config for name, node in graph.nodes.items()})
+    
+    def _stage_graph(self, content: Any, config: GenerationConfig) -> StageGraph:
+        """Chunking, question and answer stages keyed by everything that shapes their output."""
+        data = content.data if isinstance(content, DocumentBuffer) else content
+        questions_route = self.question_generator.route
+        answers_route = self.answer_generator.route
+        return StageGraph(fingerprint(data), [
+            StageNode("chunks", {
+                "max_chunk_size": self.document_processor.config.max_chunk_size
+            }),
+            StageNode("questions", {
+                "model": questions_route.model_id,
+                "draft_model": questions_route.draft_model_id,
+                "structured": self.question_generator.structured,
+                "template": fingerprint(self.question_generator._build_prompt("{context}")),
+                # Stored questions carry the quality scores the gate trusts
+                "scorer": fingerprint(self.question_generator.scorer.settings),
+                "questions_per_chunk": config.questions_per_chunk,
+                "temperature": config.temperature
+            }, upstream=("chunks",)),
+            StageNode("answers", {
+                "model": answers_route.model_id,
+                "draft_model": answers_route.draft_model_id,
+                "min_confidence": answers_route.min_confidence,
+                "structured": self.answer_generator.structured,
+                "template": fingerprint(self.answer_generator._build_prompt(
+                    {"question": "{question}", "context": "{context}"}
+                )),
+                # The gates decide which questions get answered, and their order
+                "quality_threshold": config.quality_threshold,
+                "dedup_threshold": config.dedup_threshold
+            }, upstream=("questions",))
+        ])
+    
+    def _load_stage(self, graph: Optional[StageGraph], stage: str) -> Optional[Any]:
+        return self.artifacts.load(stage, graph.key(stage)) if graph else None
+    
+    def _save_stage(self, graph: Optional[StageGraph], stage: str, value: Any) -> None:
+        if graph:
+            self.artifacts.save(stage, graph.key(stage), value)
+    
+    def _chunk_content(self,
+                       content: str,
+                       processing_config: Optional[ProcessingConfig] = None) -> List[str]:
+        """Chunk content with the processor, applying any processing overrides."""
+        if processing_config:
+            self.document_processor.config.max_chunk_size = processing_config.max_chunk_size
+            self.document_processor.config.overlap_tokens = processing_config.overlap_tokens
+        
+        return [chunk["content"] for chunk in self.document_processor._chunk_article(content)]
+    
+    def dry_run(self,
+                content: str,
+                processing_config: Optional[ProcessingConfig] = None,
+                generation_config: Optional[GenerationConfig] = None) -> RunPlan:
+        """Chunk the document and project the cost of generating Q&A without calling the LLM."""
+        chunks = self._chunk_content(content, processing_config)
+        return plan_run(
+            chunks,
+            self.question_generator,
+            self.answer_generator,
+            generation_config
+        )
+    
+    async def process_document(self,
+                               content: Union[str, DocumentBuffer, List[DocumentChunk]],
+                               processing_config: Optional[ProcessingConfig] = None,
+                               generation_config: Optional[GenerationConfig] = None,
+                               progress_callback: Optional[ProgressCallback] = None,
+                               bus: Optional[ProgressBus] = None,
+                               cancel_token: Optional[CancellationToken] = None,
+                               partial_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                               record_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                               store: Optional[QAStore] = None
+                               ) -> Dict[str, Any]:
+        """
+        Chunk a document and generate questions and answers for every chunk.
+        
+        ``content`` may also be a list of DocumentChunks that are already
+        chunked, such as the row groups of a CSV or chunks merged from many
+        files, which skips chunking. Questions from chunks with a "source"
+        are tagged with it.
+        
+        Question and answer generation run as a streaming pipeline: answers
+        for chunk k are generated while questions for chunk k+1 are in flight.
+        The stages are connected by a bounded queue, so a slow answer stage
+        holds back question generation instead of buffering without limit.
+        
+        Step progress is published to ``bus`` ("plan" for chunking, "generate"
+        for Q&A) and overall progress is reported through ``progress_callback``.
+        Nothing here touches the UI, so this can run on a background thread.
+        If ``cancel_token`` is cancelled, GenerationCancelled is raised with
+        the partial result dict in ``partial``. ``partial_callback`` receives
+        questions and answers while they are still streaming in. Stages whose
+        artifacts are memoized are replayed instead of regenerated.
+        ``record_callback`` receives each finished Q&A record as a dict with
+        its context, e.g. to stream it to a JsonlShardWriter. With dedup on,
+        a better-scored duplicate from a later chunk can still replace an
+        answered record, so records are passed on only once every chunk's
+        questions are in (or the run stops); the callback sees final records.
+        Records are written to ``store`` when one is given, so views holding
+        the empty store can sync it while the run fills it in.
+        
+        Returns:
+            Dict with "chunks", "metadata", "questions", "answers" and the
+            QAStore holding them as "store"; questions and answers are
+            QARecords, which keep each chunk's text once in the store.
+            The run's token counts are in metadata["token_usage"]
+        """
+        bus = bus or ProgressBus()
+        config = generation_config or GenerationConfig()
+        cancel_token = cancel_token or CancellationToken()
+        
+        def report(step_id: str, step_progress: float, overall: float, message: str) -> None:
+            bus.publish(step_id, step_progress, message)
+            if progress_callback:
+                progress_callback(overall, message)
+        
+        report("plan", 0.1, 0.01, "Analyzing document structure...")
+        usage = track_usage()
+        
+        def record_usage() -> None:
+            metadata["token_usage"] = usage.as_dict()
+        
+        if processing_config:
+            self.document_processor.config.max_chunk_size = processing_config.max_chunk_size
+            self.document_processor.config.overlap_tokens = processing_config.overlap_tokens
+        
+        graph = self._stage_graph(content, config) if self.artifacts else None
+        if isinstance(content, list):
+            # Already chunked: row groups of a table, or files merged by source
+            chunks = content
+            merged = bool(chunks) and "source" in chunks[0].metadata
+            metadata = sources_metadata(chunks) if merged else table_metadata(chunks)
+        else:
+            cached_spans = self._load_stage(graph, "chunks")
+            if cached_spans is not None:
+                buffer = content if isinstance(content, DocumentBuffer) else DocumentBuffer(content)
+                chunks = [ChunkSpan(buffer, start, end) for start, end in cached_spans]
+            else:
+                chunks = self.document_processor._chunk_article(content)
+                self._save_stage(graph, "chunks", [[chunk.start, chunk.end] for chunk in chunks])
+            metadata = self.document_processor._extract_article_metadata(content)
+        cached_questions = self._load_stage(graph, "questions")
+        # Answers are stored by record index, so they only fit the questions they were made for
+        cached_answers = self._load_stage(graph, "answers") if cached_questions is not None else None
+        generated_questions: List[List[Dict[str, Any]]] = []
+        # Answers by record index, saved with their question text
+        stage_answers: Dict[int, Dict[str, Any]] = {}
+        report("plan", 1.0, 0.1, f"Document split into {len(chunks)} chunks")
+        bus.publish("plan", 1.0, "Document chunking complete", status="completed")
+        
+        store = store if store is not None else QAStore()
+        if len(store) or store.chunks:
+            raise ValueError("process_document needs an empty QAStore")
+        for chunk in chunks:
+            store.add_chunk(chunk)
+        answered = 0
+        total_chunks = len(chunks)
+        chunks_done = 0
+        workers = max(1, config.max_concurrent_requests)
+        pending: asyncio.Queue = asyncio.Queue(maxsize=max(1, config.answer_queue_size))
+        # Near-duplicates are folded into the first record before answering
+        dedup = MinHashDeduplicator(config.dedup_threshold) if config.dedup_threshold else None
+        kept_indices: List[int] = []
+        # Answered records not yet passed to record_callback; None once final
+        held: Optional[List[int]] = [] if dedup is not None else None
+        
+        def emit(index: int) -> None:
+            if held is not None:
+                held.append(index)
+            elif record_callback:
+                record_callback(store.prompt_input(index))
+        
+        def release_held() -> None:
+            nonlocal held
+            indices, held = dict.fromkeys(held or []), None
+            for index in indices:
+                # A replaced record is emitted again when its new answer lands
+                if store[index].answered:
+                    emit(index)
+        
+        def report_generation(message: str) -> None:
+            # Expect as many answers per remaining chunk as seen so far
+            expected = len(store) * total_chunks / chunks_done if chunks_done else 0
+            answered_share = answered / expected if expected else 0.0
+            step_progress = 0.5 * chunks_done / total_chunks + 0.5 * min(answered_share, 1.0)
+            report("generate", step_progress, 0.1 + 0.9 * step_progress, message)
+        
+        # Tasks currently waiting on an LLM call; spared when draining on cancel
+        in_flight = set()
+        
+        async def tracked(request):
+            task = asyncio.current_task()
+            in_flight.add(task)
+            try:
+                return await request
+            finally:
+                in_flight.discard(task)
+        
+        def preview(stage: str, **context: Any) -> Optional[Callable[[Dict[str, Any]], None]]:
+            if partial_callback is None:
+                return None
+            
+            def on_partial(fields: Dict[str, Any]) -> None:
+                partial_callback({"stage": stage, **context, **fields})
+            return on_partial
+        
+        async def produce_questions() -> None:
+            nonlocal chunks_done, answered
+            for i, chunk in enumerate(chunks):
+                await cancel_token.checkpoint()
+                start = len(store)
+                if cached_questions is not None:
+                    chunk_questions = [dict(q) for q in cached_questions[i]]
+                else:
+                    chunk_questions = await tracked(
+                        self.question_generator.generate_for_chunk(
+                            store.context(i), i, cancel_token,
+                            on_partial=preview("questions", chunk_index=i)
+                        )
+                    )
+                    generated_questions.append([
+                        {k: v for k, v in q.items() if k != "context"} for q in chunk_questions
+                    ])
+                source = chunk.get("source")
+                if source is not None:
+                    for question in chunk_questions:
+                        question["source"] = source
+                
+                # Only questions that pass the quality gate are answered
+                chunk_questions, below = split_by_quality(chunk_questions, config.quality_threshold)
+                metadata["rejected_questions"] = metadata.get("rejected_questions", 0) + len(below)
+                requeue = []
+                for question in chunk_questions:
+                    # The index is sized, so an empty one is falsy; test for None
+                    match = dedup.add(question.get("question", "")) if dedup is not None else None
+                    if match is None:
+                        kept_indices.append(store.add_question(question))
+                        continue
+                    index = kept_indices[match]
+                    kept = store[index]
+                    duplicates = kept.get("merged_duplicates", [])
+                    if question.get("quality_score", 0.0) > kept.quality_score:
+                        # Keep the best-scored phrasing; an earlier chunk's record is answered again
+                        if kept.answered:
+                            answered -= 1
+                        store.replace_question(
+                            index, {**question, "merged_duplicates": duplicates + [kept.question]}
+                        )
+                        if index < start and index not in requeue:
+                            requeue.append(index)
+                    else:
+                        kept.extra = {**(kept.extra or {}),
+                                      "merged_duplicates": duplicates + [question.get("question", "")]}
+                chunks_done += 1
+                report_generation(f"Generated questions for chunk {chunks_done}/{total_chunks}")
+                
+                for index in [*requeue, *range(start, len(store))]:
+                    await cancel_token.checkpoint()
+                    await pending.put(index)
+            
+            # No later duplicate can replace a record now
+            release_held()
+            # One stop marker per answer worker
+            for _ in range(workers):
+                await pending.put(None)
+        
+        def cached_answer(index: int, question: str) -> Optional[Dict[str, Any]]:
+            # Replayed from disk only while it was made for this very question
+            if cached_answers is None or index >= len(cached_answers):
+                return None
+            answer = dict(cached_answers[index])
+            return answer if answer.pop("question", None) == question else None
+        
+        async def answer_questions() -> None:
+            nonlocal answered
+            while True:
+                await cancel_token.checkpoint()
+                index = await pending.get()
+                if index is None:
+                    return
+                question = store.prompt_input(index)
+                answer = cached_answer(index, question["question"])
+                if answer is None:
+                    answer = await tracked(
+                        self.answer_generator.generate_answer(
+                            question, cancel_token,
+                            on_partial=preview("answers", question=question["question"])
+                        )
+                    )
+                    if store[index].question != question["question"]:
+                        # Replaced by a better duplicate while in flight; it is queued again
+                        continue
+                stage_answers[index] = {**answer, "question": question["question"]}
+                # Check the answer against its chunk; evidence offsets are chunk-relative
+                self.grounding_verifier.apply(answer, question["context"])
+                store.set_answer(index, answer)
+                emit(index)
+                answered += 1
+                report_generation(f"Generated answer {answered}/{len(store)}")
+        
+        tasks = [asyncio.ensure_future(produce_questions())]
+        tasks += [asyncio.ensure_future(answer_questions()) for _ in range(workers)]
+        
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException as e:
+            # Under the drain policy, let in-flight calls land before stopping
+            draining = isinstance(e, GenerationCancelled) and cancel_token.policy == DRAIN
+            for task in tasks:
+                if not (draining and task in in_flight):
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+            # The run stops here, so the answered records are final
+            release_held()
+            record_usage()
+            if isinstance(e, GenerationCancelled):
+                bus.publish("generate", 0.0, "⏹ Generation cancelled", status="cancelled")
+                e.partial = self._pipeline_result(chunks, metadata, store)
+            else:
+                bus.publish("generate", 0.0, str(e), status="error")
+            raise
+        
+        # Only complete stages are memoized
+        if cached_questions is None:
+            self._save_stage(graph, "questions", generated_questions)
+        answers = [stage_answers[i] for i in range(len(store))]
+        if answers != cached_answers:
+            self._save_stage(graph, "answers", answers)
+        
+        record_usage()
+        bus.publish("generate", 1.0, "✅ Processing complete!", status="completed")
+        
+        return self._pipeline_result(chunks, metadata, store)
+    
+    @staticmethod
+    def _pipeline_result(chunks: List[Dict[str, Any]],
+                         metadata: Dict[str, Any],
+                         store: QAStore) -> Dict[str, Any]:
+        """Assemble results, ordering answered questions first so indices line up."""
+        answered = store.answered()
+        unanswered = [record for record in store if not record.answered]
+        return {
+            "chunks": chunks,
+            "metadata": metadata,
+            "store": store,
+            "questions": answered + unanswered,
+            "answers": answered
+        }
+    
+    async def regenerate_answers(self,
+                                 store: QAStore,
+                                 criteria: Optional[RegenerationCriteria] = None,
+                                 model_id: Optional[str] = None,
+                                 context_window: int = 0,
+                                 generation_config: Optional[GenerationConfig] = None,
+                                 progress_callback: Optional[ProgressCallback] = None,
+                                 cancel_token: Optional[CancellationToken] = None
+                                 ) -> Dict[str, Any]:
+        """
+        Re-answer the weak records of an existing run in place.
+        
+        Only records selected by ``criteria`` are sent to the model, so
+        improving the worst few percent costs a few percent of a run.
+        
+        Returns:
+            Dict with the "selected" and "changed" indices and the changed
+            records as export-ready dicts in "records"
+        """
+        config = generation_config or GenerationConfig()
+        selected = select_for_regeneration(store, criteria or RegenerationCriteria())
+        regenerator = Regenerator(
+            self.answer_generator,
+            grounding_verifier=self.grounding_verifier,
+            model_id=model_id,
+            context_window=context_window,
+            max_concurrent_requests=config.max_concurrent_requests
+        )
+        changed = await regenerator.regenerate(store, selected, cancel_token, progress_callback)
+        return {
+            "selected": selected,
+            "changed": changed,
+            "records": store.to_records(indices=changed)
+        }
     
     async def generate_questions(self,
                                content: str,
                                processing_config: Optional[ProcessingConfig] = None,
                                generation_config: Optional[GenerationConfig] = None,
-                               progress_callback: Optional[ProgressCallback] = None
+                               progress_callback: Optional[ProgressCallback] = None,
+                               cancel_token: Optional[CancellationToken] = None
                                ) -> List[Dict[str, Any]]:
         """Generate questions without answers."""
         try:
@@ -32,31 +445,29 @@ class PipelineOrchestrator:
                 progress_callback(0.1, "Processing document...")
             
             # Process document into chunks
-            chunks = self.document_processor.chunk_document(
-                content,
-                max_chunk_size=processing_config.max_chunk_size if processing_config else 2000,
-                overlap_tokens=processing_config.overlap_tokens if processing_config else 64
-            )
+            chunks = self._chunk_content(content, processing_config)
             
             if progress_callback:
                 progress_callback(0.4, "Generating questions...")
             
             # Generate questions
             questions = await self.question_generator.generate(
-                input_data=content,
-                config={
-                    "questions_per_chunk": generation_config.questions_per_chunk if generation_config else 3,
-                    "temperature": generation_config.temperature if generation_config else 0.7,
-                    "max_tokens": generation_config.max_tokens if generation_config else 1000,
-                    "quality_threshold": generation_config.quality_threshold if generation_config else 0.7,
-                }
+                context=chunks,
+                cancel_token=cancel_token
             )
             
+            config = generation_config or GenerationConfig()
+            questions, _ = split_by_quality(questions, config.quality_threshold)
+            if config.dedup_threshold:
+                questions = MinHashDeduplicator(config.dedup_threshold).deduplicate(questions).kept
+            
             if progress_callback:
                 progress_callback(1.0, "Questions generated!")
                 
             return questions
             
+        except GenerationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Question generation failed: {str(e)}")
     
@@ -64,41 +475,35 @@ class PipelineOrchestrator:
                              questions: List[Dict[str, Any]],
                              context: str,
                              generation_config: Optional[GenerationConfig] = None,
-                             progress_callback: Optional[ProgressCallback] = None
+                             progress_callback: Optional[ProgressCallback] = None,
+                             cancel_token: Optional[CancellationToken] = None
                              ) -> List[Question]:
         """Generate answers for existing questions."""
         try:
-            answers = []
-            total = len(questions)
+            # Fall back to the full document for questions without their own context
+            questions = [
+                question if question.get("context") else {**question, "context": context}
+                for question in questions
+            ]
             
-            for idx, question in enumerate(questions):
-                if progress_callback:
-                    progress = idx / total
-                    progress_callback(progress, f"Generating answer {idx + 1}/{total}")
-                
-                answer = await self.answer_generator.generate(
-                    input_data={
-                        "question": question["question"],
-                        "context": context
-                    },
-                    config={
-                        "temperature": generation_config.temperature if generation_config else 0.7,
-                        "max_tokens": generation_config.max_tokens if generation_config else 1000,
-                        "quality_threshold": generation_config.quality_threshold if generation_config else 0.7,
-                    }
-                )
-                
-                # Combine question and answer data
-                qa_pair = {
-                    **question,
-                    **answer
-                }
-                answers.append(qa_pair)
+            answers = await self.answer_generator.generate(
+                questions=questions,
+                progress_callback=progress_callback,
+                cancel_token=cancel_token
+            )
+            
+            # Combine question and answer data
+            answers = [
+                {**question, **answer}
+                for question, answer in zip(questions, answers)
+            ]
             
             if progress_callback:
                 progress_callback(1.0, "Answers generated!")
                 
             return answers
             
+        except GenerationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Answer generation failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""Dry-run planning: project calls, tokens and wall time before generating."""
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+import math
+
+from .types import GenerationConfig
+from .metrics import StageStats, estimate_tokens
+from .generators.question_generator import QuestionGenerator
+from .generators.answer_generator import AnswerGenerator
+
+# Fallbacks used until a stage has measured calls from a recent run
+DEFAULT_LATENCY_SECONDS = {"questions": 6.0, "answers": 8.0}
+DEFAULT_COMPLETION_TOKENS = {"questions": 220, "answers": 450}
+
+# Stand-in question used to size answer prompts before questions exist
+_PLACEHOLDER_QUESTION = " ".join(["word"] * 15)
+
+@dataclass
+class StageEstimate:
+    """Projected cost of one pipeline stage."""
+    name: str
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    latency_per_request: float
+    measured: bool
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+@dataclass
+class RunPlan:
+    """Projected cost of a full generation run."""
+    chunk_count: int
+    concurrency: int
+    stages: List[StageEstimate] = field(default_factory=list)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stage.requests for stage in self.stages)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(stage.total_tokens for stage in self.stages)
+
+    @property
+    def eta_seconds(self) -> float:
+        """Wall time assuming each stage runs in waves of `concurrency` calls."""
+        return sum(
+            math.ceil(stage.requests / self.concurrency) * stage.latency_per_request
+            for stage in self.stages
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the plan for display or logging."""
+        return {
+            "chunks": self.chunk_count,
+            "concurrency": self.concurrency,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "eta_seconds": round(self.eta_seconds, 1),
+            "stages": [
+                {
+                    "name": stage.name,
+                    "requests": stage.requests,
+                    "prompt_tokens": stage.prompt_tokens,
+                    "completion_tokens": stage.completion_tokens,
+                    "latency_per_request": round(stage.latency_per_request, 2),
+                    "latency_source": "measured" if stage.measured else "default",
+                }
+                for stage in self.stages
+            ],
+        }
+
+def _stage_profile(name: str, stats: Optional[StageStats]) -> tuple:
+    """Return (latency, completion tokens, measured) for a stage."""
+    if stats is not None and stats.count:
+        return stats.mean_latency, stats.mean_completion_tokens, True
+    return DEFAULT_LATENCY_SECONDS[name], DEFAULT_COMPLETION_TOKENS[name], False
+
+def plan_run(chunks: List[str],
+             question_generator: QuestionGenerator,
+             answer_generator: AnswerGenerator,
+             generation_config: Optional[GenerationConfig] = None) -> RunPlan:
+    """
+    Project request count, tokens and ETA for generating Q&A over chunks.
+
+    Prompts are built with the generators' own prompt builders so template
+    changes are reflected in the estimate. Latency and completion size come
+    from the generators' recent calls when available.
+
+    Args:
+        chunks: Chunk texts that would be sent for question generation
+        question_generator: Generator whose prompts and stats are used
+        answer_generator: Generator whose prompts and stats are used
+        generation_config: Generation settings (concurrency, questions per chunk)
+
+    Returns:
+        RunPlan: Projected cost of the run
+    """
+    config = generation_config or GenerationConfig()
+    concurrency = max(1, config.max_concurrent_requests)
+
+    # Question stage: one call per chunk
+    question_stats = getattr(question_generator, "stats", None)
+    latency, completion, measured = _stage_profile("questions", question_stats)
+    question_prompt_tokens = sum(
+        estimate_tokens(question_generator._build_prompt(chunk)) for chunk in chunks
+    )
+    questions_stage = StageEstimate(
+        name="questions",
+        requests=len(chunks),
+        prompt_tokens=question_prompt_tokens,
+        completion_tokens=int(completion * len(chunks)),
+        latency_per_request=latency,
+        measured=measured,
+    )
+
+    # Answer stage: one call per question, each carrying its chunk as context
+    if question_stats is not None and question_stats.count:
+        questions_per_chunk = question_stats.mean_items
+    else:
+        questions_per_chunk = config.questions_per_chunk
+
+    latency, completion, measured = _stage_profile(
+        "answers", getattr(answer_generator, "stats", None)
+    )
+    answer_prompt_tokens = 0.0
+    for chunk in chunks:
+        prompt = answer_generator._build_prompt(
+            {"context": chunk, "question": _PLACEHOLDER_QUESTION}
+        )
+        answer_prompt_tokens += estimate_tokens(prompt) * questions_per_chunk
+    answer_requests = round(questions_per_chunk * len(chunks))
+    answers_stage = StageEstimate(
+        name="answers",
+        requests=answer_requests,
+        prompt_tokens=int(answer_prompt_tokens),
+        completion_tokens=int(completion * answer_requests),
+        latency_per_request=latency,
+        measured=measured,
+    )
+
+    return RunPlan(
+        chunk_count=len(chunks),
+        concurrency=concurrency,
+        stages=[questions_stage, answers_stage],
+    )
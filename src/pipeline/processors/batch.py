@@ -0,0 +1,173 @@
+"""Parallel ingestion of many uploaded files into one run."""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import PurePosixPath
+import io
+import time
+import zipfile
+
+from ..types import DocumentChunk
+
+# Limits on what one uploaded zip may expand to, so an archive bomb cannot exhaust memory
+MAX_ARCHIVE_MEMBERS = 10_000
+MAX_MEMBER_BYTES = 64 * 1024 * 1024
+MAX_ARCHIVE_BYTES = 512 * 1024 * 1024
+
+@dataclass
+class SourceFile:
+    """One uploaded file, or one member of an uploaded archive."""
+    name: str
+    data: bytes
+    error: Optional[str] = None  # set when the file could not be extracted
+
+@dataclass
+class IngestedFile:
+    """Outcome of decoding and chunking one source file."""
+    name: str
+    parsed: Any = None
+    chunks: List[Any] = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def expand_archives(files: Iterable[Tuple[str, bytes]],
+                    allowed_extensions: Sequence[str],
+                    max_members: int = MAX_ARCHIVE_MEMBERS,
+                    max_member_bytes: int = MAX_MEMBER_BYTES,
+                    max_archive_bytes: int = MAX_ARCHIVE_BYTES) -> List[SourceFile]:
+    """
+    Flatten uploads into source files, unpacking zip archives.
+
+    Archive members are named ``archive.zip/path/in/archive``. Directories,
+    macOS resource forks and files with other extensions are skipped. A
+    corrupt archive, an oversized member, or an archive past the member or
+    total size limits is returned as a SourceFile with ``error`` set rather
+    than raising, so it is reported like any other failed file.
+    """
+    allowed = {f".{ext.lower().lstrip('.')}" for ext in allowed_extensions}
+    sources = []
+    for name, data in files:
+        if PurePosixPath(name).suffix.lower() != ".zip":
+            sources.append(SourceFile(name, data))
+            continue
+        try:
+            sources.extend(_extract(name, data, allowed, max_members,
+                                    max_member_bytes, max_archive_bytes))
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, ValueError) as e:
+            sources.append(SourceFile(name, b"", error=f"Could not read archive: {e}"))
+    return sources
+
+def _extract(name: str,
+             data: bytes,
+             allowed: Set[str],
+             max_members: int,
+             max_member_bytes: int,
+             max_archive_bytes: int) -> List[SourceFile]:
+    sources = []
+    total = 0
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = []
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            if (info.is_dir() or "__MACOSX" in path.parts or path.name.startswith(".")
+                    or path.suffix.lower() not in allowed):
+                continue
+            members.append(info)
+        if len(members) > max_members:
+            raise ValueError(f"{len(members)} files exceed the limit of {max_members}")
+        for info in members:
+            member = f"{name}/{info.filename}"
+            if info.file_size > max_member_bytes:
+                sources.append(SourceFile(member, b"", error=(
+                    f"Uncompressed size {info.file_size} exceeds the limit of {max_member_bytes} bytes"
+                )))
+                continue
+            if total + info.file_size > max_archive_bytes:
+                raise ValueError(f"Uncompressed contents exceed the limit of {max_archive_bytes} bytes")
+            # Headers can understate sizes, so never read past the limit either
+            with archive.open(info) as f:
+                content = f.read(max_member_bytes + 1)
+            if len(content) > max_member_bytes:
+                sources.append(SourceFile(member, b"", error=(
+                    f"Uncompressed size exceeds the limit of {max_member_bytes} bytes"
+                )))
+                continue
+            total += len(content)
+            sources.append(SourceFile(member, content))
+    return sources
+
+def ingest_files(files: Sequence[SourceFile],
+                 parse: Callable[[SourceFile], Any],
+                 chunk: Callable[[Any], List[Any]],
+                 max_workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[IngestedFile, int, int], None]] = None
+                 ) -> List[IngestedFile]:
+    """
+    Decode and chunk files on a worker pool.
+
+    A file that fails to parse or chunk is reported with its error rather
+    than failing the batch. ``progress_callback(file, done, total)`` runs
+    on the calling thread as each file finishes, so it may update UI.
+
+    Returns:
+        One IngestedFile per input, in input order
+    """
+    def work(source: SourceFile) -> IngestedFile:
+        started = time.perf_counter()
+        result = IngestedFile(source.name)
+        if source.error is not None:
+            result.error = source.error
+            return result
+        try:
+            result.parsed = parse(source)
+            result.chunks = list(chunk(result.parsed))
+        except Exception as e:
+            result.error = str(e)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    results: List[Optional[IngestedFile]] = [None] * len(files)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(work, source): i for i, source in enumerate(files)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(results[futures[future]], done, len(files))
+    return results
+
+def merge_sources(ingested: Iterable[IngestedFile]) -> List[DocumentChunk]:
+    """
+    Merge every file's chunks into one run.
+
+    Chunks are renumbered across files and keep their own metadata (e.g.
+    table row ranges) plus the ``source`` file name.
+    """
+    merged = []
+    for result in ingested:
+        if not result.ok:
+            continue
+        for chunk in result.chunks:
+            metadata = dict(getattr(chunk, "metadata", None) or {})
+            metadata["source"] = result.name
+            text = str(chunk)
+            merged.append(DocumentChunk(content=text, index=len(merged),
+                                        size=len(text), metadata=metadata))
+    return merged
+
+def sources_metadata(chunks: List[DocumentChunk]) -> Dict[str, Any]:
+    """Run-level metadata for chunks merged from several files."""
+    sources: Dict[str, int] = {}
+    for chunk in chunks:
+        source = chunk.metadata.get("source")
+        sources[source] = sources.get(source, 0) + 1
+    return {
+        "processed_at": datetime.utcnow().isoformat(),
+        "char_count": sum(chunk.size for chunk in chunks),
+        "sources": sources,  # file name -> chunk count
+        "input_type": "files"
+    }
@@ -0,0 +1,191 @@
+"""Shared document buffers and zero-copy chunk spans."""
+from typing import Any, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import bisect
+import mmap
+import os
+import re
+
+PARAGRAPH_SEPARATOR = r"\n\s*\n"
+SENTENCE_SEPARATOR = r"(?<=[.!?])\s+"
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str, text: bool, flags: int = 0) -> re.Pattern:
+    return re.compile(pattern if text else pattern.encode(), flags)
+
+class DocumentBuffer:
+    """
+    One document's text, shared by every chunk span cut from it.
+
+    Backed by a str, or by a read-only memory map of an encoded file. For
+    memory maps, offsets are byte offsets and text is only decoded when a
+    span is read.
+    """
+
+    def __init__(self, data: Union[str, bytes, mmap.mmap], encoding: str = "utf-8"):
+        """Initialize with document text, bytes or a memory map."""
+        self.data = data
+        self.encoding = encoding
+        self.is_text = isinstance(data, str)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], encoding: str = "utf-8") -> 'DocumentBuffer':
+        """Memory-map a file instead of reading it into memory."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", encoding)
+            # The map stays valid after the file object is closed
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), encoding)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def text(self, start: int = 0, end: Optional[int] = None) -> str:
+        """Materialize text between two offsets."""
+        data = self.data[start:end]
+        return data if self.is_text else data.decode(self.encoding, errors="replace")
+
+    def pattern(self, pattern: str, flags: int = 0) -> re.Pattern:
+        """Compile a regex for this buffer's data type (str or bytes)."""
+        return _compile(pattern, self.is_text, flags)
+
+    def segments(self, separator: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield whitespace-trimmed, non-empty (start, end) spans between separators."""
+        position = start
+        for match in self.pattern(separator).finditer(self.data, start, end):
+            span = self.trim(position, match.start())
+            if span[0] < span[1]:
+                yield span
+            position = match.end()
+        span = self.trim(position, end)
+        if span[0] < span[1]:
+            yield span
+
+    def trim(self, start: int, end: int) -> Tuple[int, int]:
+        """Shrink a span to exclude leading and trailing whitespace."""
+        first = self.pattern(r"\S").search(self.data, start, end)
+        if first is None:
+            return end, end
+        tail = self.pattern(r"\s*\Z").search(self.data, first.start(), end)
+        return first.start(), tail.start()
+
+    def find_all(self, term: str) -> List[int]:
+        """Start offsets of case-insensitive matches of ``term``, in order."""
+        if not term:
+            return []
+        needle = re.escape(term if self.is_text else term.encode(self.encoding))
+        pattern = re.compile(needle, re.IGNORECASE)
+        return [match.start() for match in pattern.finditer(self.data)]
+
+    def close(self) -> None:
+        """Release a memory map; spans over it become unreadable."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+@dataclass(slots=True, eq=False)
+class ChunkSpan:
+    """
+    A chunk as (start, end) offsets into a shared DocumentBuffer.
+
+    Text is materialized on access and never cached. ``span["content"]``
+    and ``span["size"]`` mirror the chunk dicts this replaces.
+    """
+    buffer: DocumentBuffer
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+    @property
+    def text(self) -> str:
+        return self.buffer.text(self.start, self.end)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "content":
+            return self.text
+        if key in ("size", "start", "end"):
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+def chunk_spans(buffer: DocumentBuffer, max_chunk_size: int) -> List[ChunkSpan]:
+    """
+    Split a document into paragraph-aligned chunk spans.
+
+    Paragraphs are packed into chunks of at most ``max_chunk_size``
+    (counting paragraph text, not separators); paragraphs longer than that
+    are split on sentence boundaries. Only offsets are allocated.
+    """
+    chunks: List[ChunkSpan] = []
+    current: Optional[List[int]] = None
+    current_size = 0
+
+    for para_start, para_end in buffer.segments(PARAGRAPH_SEPARATOR, 0, len(buffer)):
+        para_size = para_end - para_start
+
+        # If paragraph itself exceeds max size, split it into sentences
+        if para_size > max_chunk_size:
+            if current:
+                chunks.append(ChunkSpan(buffer, *current))
+                current, current_size = None, 0
+
+            temp: Optional[List[int]] = None
+            temp_size = 0
+            for sent_start, sent_end in buffer.segments(SENTENCE_SEPARATOR, para_start, para_end):
+                sentence_size = sent_end - sent_start
+                if temp_size + sentence_size > max_chunk_size:
+                    if temp:
+                        chunks.append(ChunkSpan(buffer, *temp))
+                    temp, temp_size = [sent_start, sent_end], sentence_size
+                else:
+                    temp = [temp[0] if temp else sent_start, sent_end]
+                    temp_size += sentence_size
+            if temp:
+                chunks.append(ChunkSpan(buffer, *temp))
+
+        elif current and current_size + para_size > max_chunk_size:
+            chunks.append(ChunkSpan(buffer, *current))
+            current, current_size = [para_start, para_end], para_size
+        else:
+            current = [current[0] if current else para_start, para_end]
+            current_size += para_size
+
+    if current:
+        chunks.append(ChunkSpan(buffer, *current))
+
+    return chunks
+
+def search_spans(chunks: List[Any], term: str) -> List[Any]:
+    """
+    Return chunks containing ``term`` (case-insensitive).
+
+    Spans over one shared buffer are searched in a single pass over the
+    buffer; other chunks fall back to per-chunk matching.
+    """
+    if not chunks or not term:
+        return list(chunks)
+
+    buffer = getattr(chunks[0], "buffer", None)
+    if buffer is None or not all(getattr(c, "buffer", None) is buffer for c in chunks):
+        return [chunk for chunk in chunks if term.lower() in chunk["content"].lower()]
+
+    hits = buffer.find_all(term)
+    length = len(term) if buffer.is_text else len(term.encode(buffer.encoding))
+    matched = []
+    for chunk in chunks:
+        i = bisect.bisect_left(hits, chunk.start)
+        if i < len(hits) and hits[i] + length <= chunk.end:
+            matched.append(chunk)
+    return matched
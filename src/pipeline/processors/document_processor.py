@@ -1,15 +1,17 @@
 """Document processing pipeline for article/knowledge base data."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 from pathlib import Path
 import asyncio
 import hashlib
-import re
 from datetime import datetime
 
 from llama_stack_client import LlamaStackClient
 from llama_stack_client.types.memory_insert_params import Document
 
+from ..cancellation import CancellationToken, GenerationCancelled
+from .document_buffer import ChunkSpan, DocumentBuffer, chunk_spans
+
 @dataclass
 class ChunkConfig:
     """Configuration for document chunking."""
@@ -74,84 +76,26 @@ class DocumentProcessor:
         timestamp = datetime.utcnow().strftime("%Y%m%d")
         return f"article-{timestamp}-{content_hash}-chunk{chunk_index}"
     
-    def _chunk_article(self, content: str) -> List[Dict[str, Any]]:
-        """Split article into semantic chunks."""
-        chunks = []
-        
-        # Split into paragraphs first
-        paragraphs = re.split(r'\n\s*\n', content)
-        
-        current_chunk = []
-        current_size = 0
-        
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-                
-            para_size = len(para)
-            
-            # If paragraph itself exceeds max size, split it
-            if para_size > self.config.max_chunk_size:
-                # Add current chunk if it exists
-                if current_chunk:
-                    chunks.append({
-                        "content": "\n\n".join(current_chunk),
-                        "size": current_size
-                    })
-                    current_chunk = []
-                    current_size = 0
-                
-                # Split large paragraph
-                sentences = re.split(r'(?<=[.!?])\s+', para)
-                temp_chunk = []
-                temp_size = 0
-                
-                for sentence in sentences:
-                    if temp_size + len(sentence) > self.config.max_chunk_size:
-                        if temp_chunk:
-                            chunks.append({
-                                "content": " ".join(temp_chunk),
-                                "size": temp_size
-                            })
-                        temp_chunk = [sentence]
-                        temp_size = len(sentence)
-                    else:
-                        temp_chunk.append(sentence)
-                        temp_size += len(sentence)
-                
-                if temp_chunk:
-                    chunks.append({
-                        "content": " ".join(temp_chunk),
-                        "size": temp_size
-                    })
-                    
-            # Normal paragraph handling
-            elif current_size + para_size > self.config.max_chunk_size:
-                chunks.append({
-                    "content": "\n\n".join(current_chunk),
-                    "size": current_size
-                })
-                current_chunk = [para]
-                current_size = para_size
-            else:
-                current_chunk.append(para)
-                current_size += para_size
+    def _chunk_article(self, content: Union[str, DocumentBuffer]) -> List[ChunkSpan]:
+        """Split article into semantic chunks.
         
-        # Add final chunk
-        if current_chunk:
-            chunks.append({
-                "content": "\n\n".join(current_chunk),
-                "size": current_size
-            })
-        
-        return chunks
+        Chunks are spans into one shared buffer; their text is only
+        materialized when read (``chunk["content"]``).
+        """
+        buffer = content if isinstance(content, DocumentBuffer) else DocumentBuffer(content)
+        return chunk_spans(buffer, self.config.max_chunk_size)
     
     async def process_document(self, 
                              content: str, 
                              metadata: Optional[Dict[str, Any]] = None,
-                             progress_callback: Optional[callable] = None) -> None:
-        """Process an article and store in memory bank."""
+                             progress_callback: Optional[callable] = None,
+                             cancel_token: Optional[CancellationToken] = None) -> None:
+        """Process an article and store in memory bank.
+        
+        Pauses between chunks while ``cancel_token`` is paused. On cancellation
+        GenerationCancelled carries the indices of chunks already stored.
+        """
+        cancel_token = cancel_token or CancellationToken()
         if not self._memory_bank_id:
             raise RuntimeError("Memory bank not initialized")
             
@@ -174,10 +118,12 @@ class DocumentProcessor:
             progress_callback(0.3, f"Processing {total_chunks} chunks...")
         
         # Process each chunk
+        stored = []
         for i, chunk in enumerate(chunks):
+            text = chunk["content"]
             doc = Document(
-                document_id=self._generate_document_id(chunk["content"], i),
-                content=chunk["content"],
+                document_id=self._generate_document_id(text, i),
+                content=text,
                 metadata={
                     **article_metadata,
                     "chunk_index": i,
@@ -187,15 +133,20 @@ class DocumentProcessor:
             )
             
             try:
-                self.client.memory.insert(
+                await cancel_token.call(
+                    self.client.memory.insert,
                     bank_id=self._memory_bank_id,
                     documents=[doc],
                 )
+                stored.append(i)
                 
                 if progress_callback:
                     progress = 0.3 + (0.7 * (i + 1) / total_chunks)
                     progress_callback(progress, f"Processed chunk {i + 1}/{total_chunks}")
-                    
+            
+            except GenerationCancelled as e:
+                e.partial = stored
+                raise
             except Exception as e:
                 raise RuntimeError(f"Failed to store chunk {i}: {str(e)}")
         
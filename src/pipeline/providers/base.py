@@ -0,0 +1,184 @@
+"""Base class for LLM providers."""
+from abc import ABC, abstractmethod
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Union
+import asyncio
+import json
+
+# Appended to synthetic-data prompts when falling back to plain completions
+SYNTHETIC_FORMAT_INSTRUCTION = (
+    "For this request, return exactly {count} pairs as a JSON array of objects "
+    "with \"question\" and \"answer\" fields, and nothing else."
+)
+
+class BatchGenerationError(RuntimeError):
+    """Raised when some items of a batch fail.
+    
+    ``results`` holds one entry per prompt, in order: the completion text, or
+    the exception that item failed with. ``errors`` maps failed indices to
+    their exceptions.
+    """
+    
+    def __init__(self, results: List[Any]):
+        self.results = results
+        self.errors = {i: r for i, r in enumerate(results) if isinstance(r, Exception)}
+        super().__init__(f"{len(self.errors)} of {len(results)} batch items failed")
+
+def collect_batch(results: List[Any], return_exceptions: bool) -> List[Any]:
+    """Return batch results, raising BatchGenerationError on failures unless asked not to."""
+    if not return_exceptions and any(isinstance(r, Exception) for r in results):
+        raise BatchGenerationError(results)
+    return results
+
+def parse_qa_pairs(text: str) -> List[Dict[str, Any]]:
+    """Extract question/answer objects from a JSON array embedded in model output."""
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        raise ValueError("Response does not contain a JSON array")
+    
+    data = json.loads(text[start:end + 1])
+    return [
+        item for item in data
+        if isinstance(item, dict) and "question" in item and "answer" in item
+    ]
+
+class LLMProvider(ABC):
+    """Abstract base class for LLM inference providers."""
+    
+    model_id: Optional[str] = None
+    
+    @abstractmethod
+    async def initialize(self) -> None:
+        """Connect to the backend and resolve the default model."""
+        pass
+    
+    @abstractmethod
+    async def chat_completion(self,
+                              messages: Iterable[Any],
+                              model_id: Optional[str] = None,
+                              **kwargs: Any) -> Any:
+        """
+        Run a chat completion.
+        
+        Args:
+            messages: Chat messages to send
+            model_id: Model to use, defaults to the provider's model
+            **kwargs: Backend-specific options (sampling_params, response_format, ...)
+            
+        Returns:
+            Backend response with ``completion_message.content``
+        """
+        pass
+    
+    @abstractmethod
+    async def generate(self,
+                       prompt: str,
+                       temperature: float = 0.7,
+                       max_tokens: int = 1000,
+                       stream: bool = False,
+                       **kwargs: Any) -> Union[str, AsyncGenerator[str, None]]:
+        """
+        Generate text for a single prompt.
+        
+        Returns:
+            The completion text, or an async generator of text deltas when streaming
+        """
+        pass
+    
+    async def stream_text(self,
+                          messages: Iterable[Any],
+                          model_id: Optional[str] = None,
+                          **kwargs: Any) -> AsyncGenerator[str, None]:
+        """
+        Yield chat completion text as it is generated.
+        
+        Providers without token streaming yield the whole completion once.
+        Closing the generator early should stop generation on the server.
+        """
+        response = await self.chat_completion(messages, model_id=model_id, **kwargs)
+        yield response.completion_message.content
+    
+    @abstractmethod
+    async def validate_connection(self) -> bool:
+        """Check that the backend is reachable."""
+        pass
+    
+    async def generate_batch(self,
+                             prompts: List[str],
+                             temperature: float = 0.7,
+                             max_tokens: int = 1000,
+                             return_exceptions: bool = False,
+                             **kwargs: Any) -> List[Any]:
+        """
+        Generate completions for several prompts concurrently.
+        
+        Args:
+            prompts: Prompts to complete
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per completion
+            return_exceptions: Put failed items' exceptions in the result list
+                instead of raising BatchGenerationError
+            
+        Returns:
+            One completion text (or exception) per prompt, in prompt order
+        """
+        results = await asyncio.gather(*[
+            self.generate(prompt=prompt, temperature=temperature, max_tokens=max_tokens, **kwargs)
+            for prompt in prompts
+        ], return_exceptions=True)
+        return collect_batch(list(results), return_exceptions)
+    
+    async def generate_synthetic_data(self,
+                                      prompt: str,
+                                      config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate Q&A pairs for a synthetic-data prompt.
+        
+        Splits ``num_samples`` into requests of ``pairs_per_request`` pairs and
+        runs them as one batch.
+        
+        Args:
+            prompt: Generation prompt describing the source text
+            config: num_samples, temperature, max_tokens and optionally
+                pairs_per_request
+            
+        Returns:
+            Dict with ``qa_pairs`` and ``errors`` (one entry per failed request)
+        """
+        num_samples = config.get("num_samples", 1)
+        per_request = max(1, config.get("pairs_per_request", 5))
+        counts = [per_request] * (num_samples // per_request)
+        if num_samples % per_request:
+            counts.append(num_samples % per_request)
+        
+        prompts = [
+            f"{prompt}\n\n{SYNTHETIC_FORMAT_INSTRUCTION.format(count=count)}"
+            for count in counts
+        ]
+        results = await self.generate_batch(
+            prompts=prompts,
+            temperature=config.get("temperature", 0.7),
+            max_tokens=config.get("max_tokens", 1000),
+            return_exceptions=True
+        )
+        
+        qa_pairs, errors, seen = [], [], set()
+        for index, result in enumerate(results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                pairs = parse_qa_pairs(result)
+            except Exception as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            
+            for pair in pairs:
+                key = pair["question"].strip().lower()
+                if key not in seen:
+                    seen.add(key)
+                    qa_pairs.append(pair)
+        
+        return {"qa_pairs": qa_pairs[:num_samples], "errors": errors}
+    
+    async def close(self) -> None:
+        """Release connections held by the provider."""
+        pass
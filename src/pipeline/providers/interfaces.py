@@ -0,0 +1,36 @@
+"""Provider configuration interfaces."""
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+import os
+
+DEFAULT_ENDPOINT = "http://localhost:5001"
+
+@dataclass
+class ProviderConfig:
+    """Configuration for an inference provider."""
+    
+    provider_type: str = "llama_stack"
+    endpoints: List[str] = field(default_factory=lambda: [DEFAULT_ENDPOINT])
+    model_id: Optional[str] = None
+    
+    # Connection pooling (per endpoint)
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    timeout: float = 120.0
+    
+    # Health checking and failover
+    health_check_interval: float = 30.0
+    failure_threshold: int = 1
+    
+    # Batch submission; falls back to concurrent single calls if unsupported
+    use_batch_api: bool = True
+    batch_size: int = 32
+    
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_env(cls, **overrides: Any) -> 'ProviderConfig':
+        """Create config from LLAMA_STACK_URL (comma-separated for several endpoints)."""
+        urls = os.environ.get("LLAMA_STACK_URL", DEFAULT_ENDPOINT)
+        endpoints = [url.strip().rstrip("/") for url in urls.split(",") if url.strip()]
+        return cls(endpoints=endpoints, **overrides)
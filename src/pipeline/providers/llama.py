@@ -0,0 +1,504 @@
+"""Llama Stack provider with pooled async clients and multi-endpoint load balancing."""
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+from dataclasses import dataclass
+import asyncio
+import inspect
+import threading
+import time
+
+import httpx
+from llama_stack_client import (
+    AsyncLlamaStackClient,
+    DefaultAsyncHttpxClient,
+    APIConnectionError,
+    APIStatusError,
+    InternalServerError,
+)
+from llama_stack_client.types import UserMessage
+
+from .base import LLMProvider, collect_batch, parse_qa_pairs
+from .interfaces import ProviderConfig
+
+# Errors meaning "this endpoint is unavailable", as opposed to a bad request
+RETRYABLE_ERRORS = (
+    APIConnectionError,
+    InternalServerError,
+    httpx.TransportError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+# Status codes meaning "this server does not implement the API"
+UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+
+def _is_unsupported(error: Exception) -> bool:
+    """True if an error means the backend (or client) lacks an API."""
+    if isinstance(error, AttributeError):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in UNSUPPORTED_STATUS_CODES
+
+def _is_endpoint_failure(error: BaseException) -> bool:
+    return isinstance(error, RETRYABLE_ERRORS) and not (
+        isinstance(error, APIStatusError) and error.status_code in UNSUPPORTED_STATUS_CODES
+    )
+
+_STREAM_DONE = object()
+
+@dataclass
+class Endpoint:
+    """One Llama Stack server and its live load and health state."""
+    base_url: str
+    client: Any = None
+    outstanding: int = 0
+    completed: int = 0
+    healthy: bool = True
+    consecutive_failures: int = 0
+    retry_at: float = 0.0
+    probing: bool = False
+    semaphore: Optional[asyncio.Semaphore] = None
+
+class LlamaStackProvider(LLMProvider):
+    """
+    Async Llama Stack provider that spreads requests over several endpoints.
+
+    Each endpoint has a pooled ``AsyncLlamaStackClient``. Requests go to the
+    healthy endpoint with the fewest outstanding requests. Connection errors
+    and 5xx responses mark an endpoint unhealthy and fail over to the next
+    one; unhealthy endpoints are re-probed every ``health_check_interval``.
+
+    All network I/O runs on one event loop owned by the provider, so a single
+    connection pool and load picture is shared by every caller, whichever
+    thread or event loop it awaits from.
+    """
+
+    def __init__(self,
+                 host: str = "localhost",
+                 port: int = 5001,
+                 config: Optional[ProviderConfig] = None):
+        """Initialize with a single host/port or a ProviderConfig listing endpoints."""
+        self.config = config or ProviderConfig(endpoints=[f"http://{host}:{port}"])
+        self.model_id = self.config.model_id
+        self.endpoints = [Endpoint(url) for url in self.config.endpoints]
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_supported = self.config.use_batch_api
+        self._synthetic_supported = self.config.use_batch_api
+
+    @property
+    def client(self) -> Any:
+        """Client of the primary endpoint."""
+        return self.endpoints[0].client
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        self.endpoints[0].client = client
+
+    # Event loop and clients
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="llama-stack-provider",
+                    daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    async def _on_loop(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the provider loop; cancelling the caller cancels it."""
+        loop = self._ensure_loop()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _client_for(self, endpoint: Endpoint) -> Any:
+        """Return the endpoint's client, creating a pooled one on first use."""
+        if endpoint.client is None:
+            endpoint.client = AsyncLlamaStackClient(
+                base_url=endpoint.base_url,
+                timeout=self.config.timeout,
+                max_retries=0,  # failover is handled here
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.config.max_connections,
+                        max_keepalive_connections=self.config.max_keepalive_connections
+                    )
+                )
+            )
+        return endpoint.client
+
+    async def _invoke(self,
+                      endpoint: Endpoint,
+                      operation: Callable[[Any], Any],
+                      consume: Optional[Callable[[Any], Awaitable[None]]] = None) -> Any:
+        """Run operation(client) on the provider loop, bounded by the endpoint's pool size."""
+        if endpoint.semaphore is None:
+            endpoint.semaphore = asyncio.Semaphore(self.config.max_connections)
+
+        async with endpoint.semaphore:
+            result = operation(self._client_for(endpoint))
+            if inspect.isawaitable(result):
+                result = await result
+            if consume is not None:
+                await consume(result)
+            return result
+
+    # Load balancing and health
+
+    def _acquire(self, exclude: Set[str]) -> Optional[Endpoint]:
+        """Pick the least-loaded usable endpoint and count the request against it."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                endpoint for endpoint in self.endpoints
+                if endpoint.base_url not in exclude
+                and (endpoint.healthy or now >= endpoint.retry_at)
+            ]
+            if not candidates:
+                return None
+            endpoint = min(
+                candidates,
+                key=lambda e: (not e.healthy, e.outstanding, e.completed)
+            )
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, ok: bool) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.completed += 1
+                endpoint.healthy = True
+                endpoint.consecutive_failures = 0
+            else:
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.config.failure_threshold:
+                    endpoint.healthy = False
+                    endpoint.retry_at = time.monotonic() + self.config.health_check_interval
+
+    async def _probe(self, endpoint: Endpoint) -> bool:
+        """Health-check one endpoint by listing its models."""
+        try:
+            await self._on_loop(asyncio.wait_for(
+                self._invoke(endpoint, lambda client: client.models.list()),
+                timeout=self.config.timeout
+            ))
+            ok = True
+        except Exception:
+            ok = False
+
+        with self._lock:
+            endpoint.probing = False
+            endpoint.healthy = ok
+            if ok:
+                endpoint.consecutive_failures = 0
+            else:
+                endpoint.retry_at = time.monotonic() + self.config.health_check_interval
+        return ok
+
+    def _schedule_probes(self) -> None:
+        """Re-probe unhealthy endpoints whose retry time has passed, in the background."""
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                endpoint for endpoint in self.endpoints
+                if not endpoint.healthy and not endpoint.probing and now >= endpoint.retry_at
+            ]
+            for endpoint in due:
+                endpoint.probing = True
+
+        loop = self._ensure_loop()
+        for endpoint in due:
+            asyncio.run_coroutine_threadsafe(self._probe(endpoint), loop)
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Probe every endpoint now and return health by base URL."""
+        results = await asyncio.gather(*[self._probe(endpoint) for endpoint in self.endpoints])
+        return {endpoint.base_url: ok for endpoint, ok in zip(self.endpoints, results)}
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Snapshot of per-endpoint load and health."""
+        with self._lock:
+            return [
+                {
+                    "endpoint": endpoint.base_url,
+                    "healthy": endpoint.healthy,
+                    "outstanding": endpoint.outstanding,
+                    "completed": endpoint.completed,
+                }
+                for endpoint in self.endpoints
+            ]
+
+    async def _dispatch(self,
+                        operation: Callable[[Any], Any],
+                        consume: Optional[Callable[[Any], Awaitable[None]]] = None) -> Any:
+        """Run a request on the least-loaded endpoint, failing over on connection errors."""
+        self._schedule_probes()
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+
+        while True:
+            endpoint = self._acquire(tried)
+            if endpoint is None:
+                raise ConnectionError(
+                    f"No Llama Stack endpoint available (tried {len(tried)}): {last_error}"
+                )
+            tried.add(endpoint.base_url)
+
+            try:
+                result = await self._on_loop(self._invoke(endpoint, operation, consume))
+            except BaseException as e:
+                if _is_endpoint_failure(e):
+                    self._release(endpoint, ok=False)
+                    last_error = e
+                    continue
+                # Bad requests and cancellations say nothing about endpoint health
+                with self._lock:
+                    endpoint.outstanding -= 1
+                raise
+
+            self._release(endpoint, ok=True)
+            return result
+
+    # LLMProvider interface
+
+    async def initialize(self) -> None:
+        """Probe endpoints and resolve the default model from the first healthy one."""
+        self._ensure_loop()
+        await self.check_health()
+
+        if self.model_id is None:
+            models = list(await self._dispatch(lambda client: client.models.list()))
+            if not models:
+                raise RuntimeError("No models available on Llama Stack endpoints")
+            llms = [m for m in models if getattr(m, "model_type", None) == "llm"]
+            self.model_id = (llms or models)[0].identifier
+
+    async def chat_completion(self,
+                              messages: Iterable[Any],
+                              model_id: Optional[str] = None,
+                              **kwargs: Any) -> Any:
+        """Run a (non-streaming) chat completion on the least-loaded endpoint."""
+        model = model_id or self.model_id
+        return await self._dispatch(
+            lambda client: client.inference.chat_completion(
+                messages=messages,
+                model_id=model,
+                **kwargs
+            )
+        )
+
+    async def stream_chat_completion(self,
+                                     messages: Iterable[Any],
+                                     model_id: Optional[str] = None,
+                                     **kwargs: Any) -> AsyncGenerator[Any, None]:
+        """
+        Stream chat completion chunks.
+
+        Closing the generator early cancels the underlying HTTP stream, so the
+        server stops generating tokens nobody will read.
+        """
+        model = model_id or self.model_id
+        caller_loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        def emit(item: Any) -> None:
+            caller_loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+        async def consume(response: Any) -> None:
+            if hasattr(response, "completion_message"):
+                emit(response)  # backend answered without streaming
+            elif hasattr(response, "__aiter__"):
+                async for chunk in response:
+                    emit(chunk)
+            else:
+                for chunk in response:
+                    emit(chunk)
+
+        request = asyncio.ensure_future(self._dispatch(
+            lambda client: client.inference.chat_completion(
+                messages=messages,
+                model_id=model,
+                stream=True,
+                **kwargs
+            ),
+            consume
+        ))
+        request.add_done_callback(lambda _: chunks.put_nowait(_STREAM_DONE))
+
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _STREAM_DONE:
+                    break
+                yield chunk
+            request.result()
+        finally:
+            if not request.done():
+                request.cancel()
+
+    async def stream_text(self,
+                          messages: Iterable[Any],
+                          model_id: Optional[str] = None,
+                          **kwargs: Any) -> AsyncGenerator[str, None]:
+        """Yield text deltas of a streaming chat completion."""
+        stream = self.stream_chat_completion(messages, model_id=model_id, **kwargs)
+        try:
+            async for chunk in stream:
+                text = self._chunk_text(chunk)
+                if text:
+                    yield text
+        finally:
+            await stream.aclose()
+
+    @staticmethod
+    def _sampling_params(temperature: float, max_tokens: int) -> Dict[str, Any]:
+        if temperature <= 0:
+            return {"strategy": "greedy", "max_tokens": max_tokens}
+        return {"strategy": "top_p", "temperature": temperature, "top_p": 0.95, "max_tokens": max_tokens}
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Extract text from a stream chunk or a full response."""
+        if hasattr(chunk, "completion_message"):
+            return chunk.completion_message.content
+        delta = chunk.event.delta
+        return delta if isinstance(delta, str) else ""
+
+    async def generate(self,
+                       prompt: str,
+                       temperature: float = 0.7,
+                       max_tokens: int = 1000,
+                       stream: bool = False,
+                       **kwargs: Any) -> Union[str, AsyncGenerator[str, None]]:
+        """Generate text for a single prompt."""
+        messages = [UserMessage(content=prompt, role="user")]
+        sampling_params = self._sampling_params(temperature, max_tokens)
+
+        if stream:
+            return self.stream_text(messages, sampling_params=sampling_params, **kwargs)
+
+        response = await self.chat_completion(messages, sampling_params=sampling_params, **kwargs)
+        return response.completion_message.content
+
+    async def _batch_chat_completion(self,
+                                     prompts: List[str],
+                                     sampling_params: Dict[str, Any],
+                                     **kwargs: Any) -> List[str]:
+        """Complete several prompts in one batch_inference request."""
+        response = await self._dispatch(
+            lambda client: client.batch_inference.chat_completion(
+                messages_batch=[[UserMessage(content=prompt, role="user")] for prompt in prompts],
+                model=self.model_id,
+                sampling_params=sampling_params,
+                **kwargs
+            )
+        )
+        contents = [message.content for message in response.completion_message_batch]
+        if len(contents) != len(prompts):
+            raise ValueError(f"Batch returned {len(contents)} completions for {len(prompts)} prompts")
+        return contents
+
+    async def generate_batch(self,
+                             prompts: List[str],
+                             temperature: float = 0.7,
+                             max_tokens: int = 1000,
+                             return_exceptions: bool = False,
+                             **kwargs: Any) -> List[Any]:
+        """
+        Generate completions for many prompts, in order.
+
+        Prompts are sent in groups of ``batch_size`` through the batch
+        inference API, with groups spread across endpoints. If the server
+        does not support batching, or a group fails as a whole, that group is
+        retried as concurrent single calls so each item gets its own result
+        or error.
+        """
+        sampling_params = self._sampling_params(temperature, max_tokens)
+        size = max(1, self.config.batch_size)
+        results: List[Any] = [None] * len(prompts)
+
+        async def run_group(start: int) -> None:
+            group = prompts[start:start + size]
+            contents = None
+            if self._batch_supported and len(group) > 1:
+                try:
+                    contents = await self._batch_chat_completion(group, sampling_params, **kwargs)
+                except Exception as e:
+                    if _is_unsupported(e):
+                        self._batch_supported = False
+            if contents is None:
+                contents = await asyncio.gather(*[
+                    self.generate(prompt, temperature, max_tokens, **kwargs)
+                    for prompt in group
+                ], return_exceptions=True)
+            results[start:start + len(group)] = contents
+
+        await asyncio.gather(*[run_group(start) for start in range(0, len(prompts), size)])
+        return collect_batch(results, return_exceptions)
+
+    async def generate_synthetic_data(self,
+                                      prompt: str,
+                                      config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate Q&A pairs with the synthetic data generation API.
+
+        Falls back to batched completions (see LLMProvider) when the server
+        does not implement it or returns nothing usable.
+        """
+        if self._synthetic_supported:
+            try:
+                response = await self._dispatch(
+                    lambda client: client.synthetic_data_generation.generate(
+                        dialogs=[UserMessage(content=prompt, role="user")],
+                        filtering_function="top_k" if config.get("quality_threshold") else "none",
+                        model=self.model_id
+                    )
+                )
+                qa_pairs = self._synthetic_pairs(response.synthetic_data)
+                if qa_pairs:
+                    return {
+                        "qa_pairs": qa_pairs[:config.get("num_samples", len(qa_pairs))],
+                        "errors": [],
+                        "statistics": response.statistics or {},
+                    }
+            except Exception as e:
+                if _is_unsupported(e):
+                    self._synthetic_supported = False
+
+        return await super().generate_synthetic_data(prompt, config)
+
+    @staticmethod
+    def _synthetic_pairs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize synthetic_data rows into question/answer dicts."""
+        pairs = []
+        for item in items:
+            if "question" in item and "answer" in item:
+                pairs.append(item)
+                continue
+            text = item.get("content") or item.get("response")
+            if isinstance(text, str):
+                try:
+                    pairs.extend(parse_qa_pairs(text))
+                except ValueError:
+                    continue
+        return pairs
+
+    async def validate_connection(self) -> bool:
+        """Return True if at least one endpoint is healthy."""
+        return any((await self.check_health()).values())
+
+    async def close(self) -> None:
+        """Close pooled clients and stop the provider loop."""
+        loop = self._loop
+        if loop is None:
+            return
+
+        for endpoint in self.endpoints:
+            close = getattr(endpoint.client, "close", None)
+            if isinstance(endpoint.client, AsyncLlamaStackClient) and close:
+                await self._on_loop(close())
+
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop = None
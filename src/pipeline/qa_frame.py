@@ -0,0 +1,199 @@
+"""Columnar, incrementally synced view of a QAStore for tables and analytics."""
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+from .types import QARecord, QAStore
+
+_TEXT_COLUMNS = ("question", "answer", "explanation", "difficulty", "type", "source")
+_NUMERIC_COLUMNS = {
+    "chunk_index": np.int64,
+    "quality_score": np.float64,
+    "confidence": np.float64,  # NaN until answered
+    "grounding_score": np.float64,
+}
+DIFFICULTY_ORDER = ["basic", "intermediate", "advanced"]
+# UI sort option -> column
+SORT_COLUMNS = {
+    "Chunk Index": "chunk_index",
+    "Difficulty": "difficulty",
+    "Type": "type",
+    "Quality Score": "quality_score",
+    "Confidence": "confidence",
+}
+
+def _row(record: QARecord) -> Dict[str, Any]:
+    return {
+        "question": record.question,
+        "answer": record.answer,
+        "explanation": record.explanation,
+        "difficulty": record.difficulty,
+        "type": record.type,
+        "source": record.get("source"),
+        "chunk_index": record.chunk_index,
+        "quality_score": record.quality_score or 0.0,
+        "confidence": np.nan if record.confidence is None else record.confidence,
+        "grounding_score": record.get("grounding_score", np.nan),
+        "answered": record.answered,
+    }
+
+class QAFrame:
+    """
+    Q&A records as columns, updated in place as the store changes.
+
+    ``sync`` replays only the store changes since the last sync: new
+    questions are appended and newly answered rows are overwritten, into
+    preallocated arrays that grow by doubling. Filter, sort and aggregate
+    results are memoized per store version, so reruns that do not change
+    the data reuse them.
+    """
+
+    def __init__(self, capacity: int = 1024, max_cached: int = 32):
+        """Initialize with the initial row capacity and the number of memoized queries."""
+        self.max_cached = max_cached
+        self.version = 0
+        self._store: Optional[QAStore] = None
+        self._size = 0
+        self._columns = self._allocate(capacity)
+        self._frame: Optional[pd.DataFrame] = None
+        self._cache: Dict[Hashable, Any] = {}
+
+    @staticmethod
+    def _allocate(capacity: int) -> Dict[str, np.ndarray]:
+        columns = {name: np.empty(capacity, dtype=object) for name in _TEXT_COLUMNS}
+        columns.update({name: np.zeros(capacity, dtype=dtype) for name, dtype in _NUMERIC_COLUMNS.items()})
+        columns["answered"] = np.zeros(capacity, dtype=bool)
+        return columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._columns["question"])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grown = self._allocate(capacity)
+        for name, values in self._columns.items():
+            grown[name][:self._size] = values[:self._size]
+        self._columns = grown
+
+    def sync(self, store: QAStore) -> bool:
+        """
+        Bring the frame up to date with ``store``.
+
+        A different store than last time is loaded from scratch.
+
+        Returns:
+            Whether anything changed
+        """
+        if store is not self._store:
+            self._store, self._size, self.version = store, 0, 0
+            self._frame = None
+            self._cache.clear()
+        version = store.version
+        if version == self.version:
+            return False
+
+        touched = sorted(set(store.changes[self.version:version]))
+        self._reserve(touched[-1] + 1)
+        for index in touched:
+            for name, value in _row(store.records[index]).items():
+                self._columns[name][index] = value
+        self._size = max(self._size, touched[-1] + 1)
+        self.version = version
+        self._frame = None
+        self._cache.clear()
+        return True
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """All rows, indexed by record index; shares the column arrays, so treat it as read-only."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {name: values[:self._size] for name, values in self._columns.items()},
+                copy=False
+            )
+        return self._frame
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Result of ``compute()``, reused until the data version changes."""
+        if key not in self._cache:
+            if len(self._cache) >= self.max_cached:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def query(self,
+              difficulties: Optional[Sequence[str]] = None,
+              types: Optional[Sequence[str]] = None,
+              min_quality: Optional[float] = None,
+              search: Optional[str] = None,
+              sort_by: Optional[str] = None,
+              ascending: bool = True) -> pd.DataFrame:
+        """
+        Filtered and sorted rows, keeping record indices as the index.
+
+        Args:
+            difficulties: Keep only these difficulties (None keeps all)
+            types: Keep only these question types (None keeps all)
+            min_quality: Minimum quality score
+            search: Case-insensitive text to find in the question or answer
+            sort_by: Column to sort by; difficulty sorts basic to advanced
+            ascending: Sort direction
+        """
+        key = ("query", tuple(difficulties) if difficulties is not None else None,
+               tuple(types) if types is not None else None, min_quality, search or None,
+               sort_by, ascending)
+        return self.cached(key, lambda: self._query(
+            difficulties, types, min_quality, search, sort_by, ascending
+        ))
+
+    def _query(self, difficulties, types, min_quality, search, sort_by, ascending) -> pd.DataFrame:
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if difficulties is not None:
+            mask &= frame["difficulty"].isin(difficulties).to_numpy()
+        if types is not None:
+            mask &= frame["type"].isin(types).to_numpy()
+        if min_quality is not None:
+            mask &= frame["quality_score"].to_numpy() >= min_quality
+        if search:
+            text = frame["question"].fillna("") + "\n" + frame["answer"].fillna("")
+            mask &= text.str.contains(search, case=False, regex=False).to_numpy()
+        result = frame[mask]
+        if sort_by == "difficulty":
+            codes = pd.Categorical(result["difficulty"], categories=DIFFICULTY_ORDER).codes
+            # Unknown difficulties sort after the known levels
+            order = np.argsort(np.where(codes < 0, len(DIFFICULTY_ORDER), codes), kind="stable")
+            result = result.iloc[order if ascending else order[::-1]]
+        elif sort_by:
+            result = result.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+        return result
+
+    def summary(self, **filters: Any) -> Dict[str, Any]:
+        """
+        Aggregates over the rows ``query(**filters)`` keeps.
+
+        Returns:
+            Dict with "total", "answered", "mean_quality", "mean_confidence",
+            and "difficulty_counts" / "type_counts" as value -> count
+        """
+        filters.pop("sort_by", None)
+        filters.pop("ascending", None)
+        key = ("summary", tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                                       for k, v in filters.items())))
+
+        def compute() -> Dict[str, Any]:
+            rows = self.query(**filters)
+            answered = rows["answered"].to_numpy()
+            return {
+                "total": len(rows),
+                "answered": int(answered.sum()),
+                "mean_quality": float(rows["quality_score"].mean()) if len(rows) else 0.0,
+                "mean_confidence": float(rows["confidence"].mean()) if answered.any() else None,
+                "difficulty_counts": rows["difficulty"].value_counts().to_dict(),
+                "type_counts": rows["type"].value_counts().to_dict(),
+            }
+        return self.cached(key, compute)
@@ -0,0 +1,107 @@
+"""Heuristic question quality scoring, run before any answer is paid for."""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import asdict, dataclass
+import re
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset("""
+a an and are as at be by can do does did for from has have how in is it its of on or
+that the their there these this those to was were what when where which who whom whose
+why will with would could should than then they them you your i we our he she his her
+""".split())
+
+BANNED_PHRASES = (
+    "provided context", "given context", "the context", "the passage", "the text",
+    "the document", "the excerpt", "the article", "the author", "this chunk",
+    "mentioned above"
+)
+# Questions that lean on something outside themselves
+DANGLING_REFERENCES = r"^(it|this|that|these|those|they|he|she|its|their)\b|\b(above|aforementioned|former|latter)\b"
+
+@dataclass
+class QualityConfig:
+    """Limits and weights for question scoring."""
+    min_words: int = 4
+    max_words: int = 25
+    max_chars: int = 200
+    min_overlap: float = 0.5  # share of content words found in the chunk for full credit
+    length_weight: float = 0.25
+    self_contained_weight: float = 0.25
+    overlap_weight: float = 0.5
+    banned_phrases: Sequence[str] = BANNED_PHRASES
+
+class QuestionScorer:
+    """
+    Scores questions against their source chunk without calling a model.
+
+    Each question gets a weighted score from length limits, a
+    self-containment check and lexical overlap with the chunk. A banned
+    phrase (e.g. "provided context") zeroes the score. Features are
+    gathered per question and combined as arrays for the whole batch.
+    """
+
+    def __init__(self, config: Optional[QualityConfig] = None):
+        """Initialize with scoring limits and weights."""
+        self.config = config or QualityConfig()
+        # Whole words only: "the author" must not match "the authorization"
+        self._banned = re.compile(
+            r"\b(?:" + "|".join(re.escape(p) for p in self.config.banned_phrases) + r")\b",
+            re.IGNORECASE
+        )
+        self._dangling = re.compile(DANGLING_REFERENCES, re.IGNORECASE)
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Everything that shapes the scores, e.g. to key memoized questions."""
+        return {
+            "config": asdict(self.config),
+            "banned": self._banned.pattern,
+            "dangling": self._dangling.pattern,
+        }
+
+    @staticmethod
+    def _content_words(text: str) -> List[str]:
+        return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+    def score(self, questions: Sequence[str], context: str) -> np.ndarray:
+        """Quality scores in [0, 1], one per question."""
+        config = self.config
+        if not questions:
+            return np.zeros(0)
+
+        vocabulary = set(self._content_words(context))
+        words = [self._content_words(q) for q in questions]
+        word_counts = np.array([len(q.split()) for q in questions])
+        char_counts = np.array([len(q) for q in questions])
+        found = np.array([sum(w in vocabulary for w in q_words) for q_words in words])
+        totals = np.array([len(q_words) for q_words in words])
+        banned = np.array([bool(self._banned.search(q)) for q in questions])
+        dangling = np.array([bool(self._dangling.search(q.strip())) for q in questions])
+
+        in_length = ((word_counts >= config.min_words) &
+                     (word_counts <= config.max_words) &
+                     (char_counts <= config.max_chars))
+        overlap = np.divide(found, totals, out=np.zeros(len(questions)), where=totals > 0)
+        overlap_credit = np.minimum(overlap / config.min_overlap, 1.0)
+
+        scores = (config.length_weight * in_length +
+                  config.self_contained_weight * ~dangling +
+                  config.overlap_weight * overlap_credit)
+        scores /= config.length_weight + config.self_contained_weight + config.overlap_weight
+        return np.where(banned, 0.0, scores).round(3)
+
+    def apply(self, questions: List[Dict[str, Any]], context: str) -> List[Dict[str, Any]]:
+        """Set ``quality_score`` on each question dict in place."""
+        scores = self.score([q.get("question", "") for q in questions], context)
+        for question, score in zip(questions, scores.tolist()):
+            question["quality_score"] = score
+        return questions
+
+def split_by_quality(questions: List[Dict[str, Any]],
+                     threshold: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split scored questions into (passed, rejected) at ``threshold``."""
+    passed = [q for q in questions if q.get("quality_score", 0.0) >= threshold]
+    rejected = [q for q in questions if q.get("quality_score", 0.0) < threshold]
+    return passed, rejected
@@ -0,0 +1,155 @@
+"""Selective regeneration of weak answers in an existing run."""
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass
+import asyncio
+import copy
+import math
+
+import numpy as np
+
+from .types import QAStore
+from .routing import ModelRoute
+from .grounding import GroundingVerifier
+from .cancellation import CancellationToken
+from .generators.answer_generator import AnswerGenerator
+
+@dataclass
+class RegenerationCriteria:
+    """Which records to re-answer; a record is selected if any check fails."""
+    min_confidence: Optional[float] = 0.6
+    min_grounding: Optional[float] = None
+    min_quality: Optional[float] = None
+    include_unanswered: bool = True  # questions whose answer failed to parse
+    worst_fraction: Optional[float] = None  # keep only the weakest share of all records
+
+def _column(store: QAStore, key: str) -> np.ndarray:
+    return np.array([record.get(key, np.nan) for record in store], dtype=float)
+
+def select_for_regeneration(store: QAStore, criteria: RegenerationCriteria) -> List[int]:
+    """
+    Indices of records that fail ``criteria``, weakest first.
+
+    Missing scores never fail a threshold (NaN compares false), so
+    unanswered records are only picked up by ``include_unanswered``.
+    """
+    if not len(store):
+        return []
+    confidence = _column(store, "confidence")
+    grounding = _column(store, "grounding_score")
+    quality = _column(store, "quality_score")
+    answered = np.array([record.answered for record in store])
+
+    selected = np.zeros(len(store), dtype=bool)
+    if criteria.min_confidence is not None:
+        selected |= confidence < criteria.min_confidence
+    if criteria.min_grounding is not None:
+        selected |= grounding < criteria.min_grounding
+    if criteria.min_quality is not None:
+        selected |= quality < criteria.min_quality
+    if criteria.include_unanswered:
+        selected |= ~answered
+
+    # Unanswered first, then by the lower of confidence and grounding
+    with np.errstate(all="ignore"):
+        strength = np.fmin(confidence, grounding)
+    strength = np.where(answered, np.nan_to_num(strength, nan=1.0), -1.0)
+    order = np.argsort(strength, kind="stable")
+    indices = order[selected[order]]
+
+    if criteria.worst_fraction is not None:
+        indices = indices[:math.ceil(criteria.worst_fraction * len(store))]
+    return indices.tolist()
+
+def _strength(answer: Dict[str, Any]) -> float:
+    scores = [answer.get(key) for key in ("confidence", "grounding_score")]
+    scores = [score for score in scores if score is not None]
+    return min(scores) if scores else 0.0
+
+class Regenerator:
+    """
+    Re-answers selected records and merges improvements into the store.
+
+    A new answer replaces the old one only if it is at least as strong
+    (the lower of confidence and grounding score), so regeneration never
+    makes a record worse. Only the records that changed are reported,
+    so exports can be limited to them.
+    """
+
+    def __init__(self,
+                 answer_generator: AnswerGenerator,
+                 grounding_verifier: Optional[GroundingVerifier] = None,
+                 model_id: Optional[str] = None,
+                 context_window: int = 0,
+                 max_concurrent_requests: int = 4):
+        """
+        Initialize with the generator to re-answer with.
+
+        Args:
+            answer_generator: Generator used for the original answers
+            grounding_verifier: Verifier for the new answers
+            model_id: Model to re-answer with instead of the generator's route
+            context_window: Neighbouring chunks on each side to add to the context
+            max_concurrent_requests: Answers generated at once
+        """
+        if model_id:
+            answer_generator = copy.copy(answer_generator)
+            answer_generator.route = ModelRoute(model_id)
+        self.answer_generator = answer_generator
+        self.grounding_verifier = grounding_verifier or GroundingVerifier()
+        self.context_window = context_window
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+
+    def _question(self, store: QAStore, index: int) -> Dict[str, Any]:
+        question = store.prompt_input(index)
+        if self.context_window:
+            chunk_index = store[index].chunk_index
+            first = max(0, chunk_index - self.context_window)
+            last = min(len(store.chunks), chunk_index + self.context_window + 1)
+            question["context"] = "\n\n".join(store.context(i) for i in range(first, last))
+        return question
+
+    async def regenerate(self,
+                         store: QAStore,
+                         indices: List[int],
+                         cancel_token: Optional[CancellationToken] = None,
+                         progress_callback: Optional[Callable[[float, str], None]] = None
+                         ) -> List[int]:
+        """
+        Re-answer ``indices`` and merge better answers into ``store``.
+
+        Answers that still fail to parse leave their record unchanged.
+
+        Returns:
+            Sorted indices of the records that changed
+        """
+        cancel_token = cancel_token or CancellationToken()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        changed: List[int] = []
+        done = 0
+
+        async def regenerate_one(index: int) -> None:
+            nonlocal done
+            async with semaphore:
+                await cancel_token.checkpoint()
+                record = store[index]
+                try:
+                    answer = await self.answer_generator.generate_answer(
+                        self._question(store, index), cancel_token
+                    )
+                except ValueError:
+                    answer = None
+                if answer is not None:
+                    # Evidence offsets stay relative to the record's own chunk
+                    self.grounding_verifier.apply(answer, store.context(record.chunk_index))
+                    previous = record.to_dict() if record.answered else None
+                    if previous is None or _strength(answer) >= _strength(previous):
+                        store.set_answer(index, {
+                            **answer, "regenerated": record.get("regenerated", 0) + 1
+                        })
+                        changed.append(index)
+                done += 1
+                if progress_callback:
+                    progress_callback(done / len(indices), f"Regenerated {done}/{len(indices)} answers")
+
+        await asyncio.gather(*(regenerate_one(index) for index in indices))
+        return sorted(changed)
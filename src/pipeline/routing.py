@@ -0,0 +1,34 @@
+"""Per-stage model routing and small-to-large model cascades."""
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_MODEL = "meta-llama/Llama-3.1-70B-Instruct"
+DRAFT_MODEL = "meta-llama/Llama-3.1-8B-Instruct"
+
+@dataclass
+class ModelRoute:
+    """
+    Models used by one generation stage.
+
+    With ``draft_model_id`` set the stage runs as a cascade: every item is
+    drafted by the draft model and only escalated to ``model_id`` when the
+    draft cannot be parsed or reports confidence below ``min_confidence``.
+    """
+    model_id: str = DEFAULT_MODEL
+    draft_model_id: Optional[str] = None
+    min_confidence: float = 0.6
+
+    @property
+    def cascade(self) -> bool:
+        return bool(self.draft_model_id) and self.draft_model_id != self.model_id
+
+    @property
+    def first_model(self) -> str:
+        """Model tried first for each item."""
+        return self.draft_model_id if self.cascade else self.model_id
+
+    def should_escalate(self, model_id: str, confidence: Optional[float]) -> bool:
+        """Whether a successfully parsed draft from ``model_id`` should be redone."""
+        if not self.cascade or model_id != self.draft_model_id:
+            return False
+        return confidence is not None and confidence < self.min_confidence
@@ -0,0 +1,71 @@
+"""JSON schemas for structured (schema-constrained) generation output."""
+from typing import Any, Dict
+import json
+
+from jsonschema import Draft7Validator
+
+QUESTIONS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 5,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string", "minLength": 1},
+                    "difficulty": {"type": "string", "enum": ["basic", "intermediate", "advanced"]},
+                    "type": {"type": "string", "enum": ["factual", "conceptual", "analytical"]},
+                },
+                "required": ["question", "difficulty", "type"],
+            },
+        },
+    },
+    "required": ["questions"],
+}
+
+ANSWER_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "answer": {"type": "string", "minLength": 1},
+        "explanation": {"type": "string"},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+    },
+    "required": ["answer", "explanation", "confidence"],
+}
+
+class StructuredOutput:
+    """A JSON schema, sent to the server as response_format and checked locally."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        """Initialize with a JSON schema; the validator is built once here."""
+        Draft7Validator.check_schema(schema)
+        self.schema = schema
+        self._validator = Draft7Validator(schema)
+
+    @property
+    def response_format(self) -> Dict[str, Any]:
+        """Llama Stack ``response_format`` constraining decoding to the schema."""
+        return {"type": "json_schema", "json_schema": self.schema}
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        """
+        Parse and validate model output.
+
+        Raises:
+            ValueError: If the output is not JSON or does not match the schema
+        """
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise ValueError("Response does not contain a JSON object")
+
+        data = json.loads(text[start:end + 1])
+        error = next(iter(self._validator.iter_errors(data)), None)
+        if error is not None:
+            location = "/".join(str(p) for p in error.absolute_path) or "root"
+            raise ValueError(f"Response does not match schema at {location}: {error.message}")
+        return data
+
+QUESTIONS_OUTPUT = StructuredOutput(QUESTIONS_SCHEMA)
+ANSWER_OUTPUT = StructuredOutput(ANSWER_SCHEMA)
@@ -0,0 +1,129 @@
+"""Incremental parsing of streamed completions that end in a <json> block."""
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+import json
+import re
+
+from .cancellation import CancellationToken
+
+START_TAG = "<json>"
+END_TAG = "</json>"
+
+# A "key": value pair whose value is complete (followed by a delimiter)
+FIELD_PATTERN = re.compile(
+    r'"(\w+)"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|true|false|null)\s*(?=[,}\]\n])'
+)
+
+class JsonBlockScanner:
+    """
+    Tracks the <json> block in model output as it streams in.
+
+    Only the tail of the text is searched on each delta, so scanning a long
+    reasoning preamble stays linear in its length.
+    """
+
+    def __init__(self, start_tag: str = START_TAG, end_tag: str = END_TAG):
+        """Initialize with the tags delimiting the block."""
+        self.start_tag = start_tag
+        self.end_tag = end_tag
+        self.text = ""
+        self.complete = False
+        self._block_start = -1
+        self._block_end = -1
+
+    def feed(self, delta: str) -> bool:
+        """Add streamed text; returns True once the closing tag has arrived."""
+        if self.complete:
+            return True
+
+        previous = len(self.text)
+        self.text += delta
+
+        if self._block_start < 0:
+            start = self.text.find(self.start_tag, max(0, previous - len(self.start_tag)))
+            if start < 0:
+                return False
+            self._block_start = start + len(self.start_tag)
+
+        end = self.text.find(self.end_tag, max(self._block_start, previous - len(self.end_tag)))
+        if end >= 0:
+            self._block_end = end
+            self.text = self.text[:end + len(self.end_tag)]
+            self.complete = True
+        return self.complete
+
+    @property
+    def block(self) -> str:
+        """Text of the JSON block received so far."""
+        if self._block_start < 0:
+            return ""
+        end = self._block_end if self.complete else len(self.text)
+        return self.text[self._block_start:end]
+
+    def fields(self) -> List[Tuple[str, Any]]:
+        """Completed ``"key": value`` pairs in the block so far, in order."""
+        pairs = []
+        for match in FIELD_PATTERN.finditer(self.block):
+            try:
+                pairs.append((match.group(1), json.loads(match.group(2))))
+            except ValueError:
+                continue
+        return pairs
+
+async def stream_json_block(stream: AsyncIterator[str],
+                            on_update: Optional[Callable[[JsonBlockScanner], None]] = None) -> str:
+    """
+    Consume a text stream up to the closing </json> tag.
+
+    The stream is closed as soon as the tag arrives, so the server stops
+    generating tokens that would be thrown away.
+
+    Args:
+        stream: Async iterator of text deltas
+        on_update: Called with the scanner whenever a delta may have
+            completed a field inside the block
+
+    Returns:
+        The text received, ending at the closing tag if one was seen
+    """
+    scanner = JsonBlockScanner()
+    try:
+        async for delta in stream:
+            done = scanner.feed(delta)
+            if on_update and scanner.block and (done or any(c in delta for c in ',}\n')):
+                on_update(scanner)
+            if done:
+                break
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose:
+            await aclose()
+    return scanner.text
+
+async def complete_json(provider: Any,
+                        messages: List[Any],
+                        model_id: str,
+                        cancel_token: CancellationToken,
+                        stream: bool = True,
+                        on_update: Optional[Callable[[JsonBlockScanner], None]] = None) -> str:
+    """
+    Run a chat completion whose answer ends in a <json> block.
+
+    Streams and stops at the closing tag when the provider supports
+    ``stream_text``; otherwise waits for the full completion.
+
+    Returns:
+        The completion text
+    """
+    stream_text = getattr(provider, "stream_text", None) if stream else None
+    if stream_text is None:
+        response = await cancel_token.call(
+            provider.chat_completion,
+            model_id=model_id,
+            messages=messages
+        )
+        return response.completion_message.content
+
+    async def consume() -> str:
+        return await stream_json_block(stream_text(messages, model_id=model_id), on_update)
+
+    return await cancel_token.call(consume)
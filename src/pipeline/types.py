@@ -1,6 +1,6 @@
 """Shared type definitions for pipeline components."""
-from typing import TypeVar, Protocol, Dict, Any, List, Optional, Callable, AsyncGenerator, Union
-from dataclasses import dataclass
+from typing import TypeVar, Protocol, Dict, Any, List, Optional, Callable, AsyncGenerator, Iterable, Iterator, Union
+from dataclasses import dataclass, fields
 from datetime import datetime
 
 # Type definitions
@@ -32,6 +32,9 @@ class GenerationConfig:
     temperature: float = 0.7
     max_tokens: int = 1000
     quality_threshold: float = 0.7
+    max_concurrent_requests: int = 1
+    answer_queue_size: int = 8
+    dedup_threshold: Optional[float] = 0.85  # None keeps near-duplicate questions
     difficulty_levels: List[str] = None
     question_types: List[str] = None
     
@@ -43,11 +46,29 @@ class GenerationConfig:
 
 @dataclass
 class DocumentChunk:
-    """Represents a chunk of processed document."""
+    """Represents a chunk of processed document.
+    
+    ``chunk["content"]`` and ``chunk["size"]`` read like the chunk dicts
+    and spans the views expect.
+    """
     content: str
     index: int
     size: int
     metadata: Dict[str, Any]
+    
+    def __str__(self) -> str:
+        return self.content
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in ("content", "index", "size", "metadata"):
+            return getattr(self, key)
+        return self.metadata.get(key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
 
 @dataclass
 class Question:
@@ -72,4 +93,177 @@ class PipelineResult:
         self.chunks: List[DocumentChunk] = []
         self.questions: List[Question] = []
         self.metadata: ProcessingMetadata = None
-        self.errors: List[str] = [] 
\ No newline at end of file
+        self.errors: List[str] = []
+
+@dataclass(slots=True)
+class QARecord:
+    """
+    Compact question/answer record.
+    
+    The source context is not stored here; records point at their chunk by
+    ``chunk_index`` and the owning QAStore holds each chunk's text once.
+    Supports ``record["question"]`` / ``record.get("answer")`` so views
+    written against question and answer dicts keep working.
+    """
+    question: str
+    difficulty: str = ""
+    type: str = ""
+    chunk_index: int = -1
+    quality_score: float = 0.0
+    model: Optional[str] = None
+    answer: Optional[str] = None
+    explanation: Optional[str] = None
+    confidence: Optional[float] = None
+    answer_model: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    @property
+    def answered(self) -> bool:
+        return self.answer is not None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read of a field or extra attribute."""
+        if key in _RECORD_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return (self.extra or {}).get(key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def to_dict(self, context: Optional[str] = None) -> Dict[str, Any]:
+        """Materialize as a plain dict, optionally with the source context."""
+        data = {
+            name: getattr(self, name) for name in _RECORD_FIELDS
+            if name != "extra" and getattr(self, name) is not None
+        }
+        data.update(self.extra or {})
+        if context is not None:
+            data["context"] = context
+        return data
+
+_RECORD_FIELDS = frozenset(f.name for f in fields(QARecord))
+
+# Generator output keys that map onto differently named record fields
+_ANSWER_FIELDS = {"answer": "answer", "explanation": "explanation",
+                  "confidence": "confidence", "model": "answer_model"}
+
+class QAStore:
+    """
+    Q&A records for one run, with chunk texts interned once.
+    
+    Records reference chunks by index; identical chunk texts share a single
+    string. Contexts are only copied into records by ``to_records``, for
+    export. Every added question and attached answer is logged in
+    ``changes``, so views can catch up from an earlier ``version``.
+    A change is logged only after its record is written, so a view on
+    another thread can sync while a run is still filling the store.
+    """
+    
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.records: List[QARecord] = []
+        self.changes: List[int] = []  # record index per add_question/set_answer, in order
+        self._interned: Dict[str, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    @property
+    def version(self) -> int:
+        """Number of changes so far; unchanged means the records are unchanged."""
+        return len(self.changes)
+    
+    def __iter__(self) -> Iterator[QARecord]:
+        return iter(self.records)
+    
+    def __getitem__(self, index: int) -> QARecord:
+        return self.records[index]
+    
+    def add_chunk(self, chunk: Any) -> int:
+        """Add a chunk's text (or a lazy ChunkSpan) and return its chunk index."""
+        if isinstance(chunk, str):
+            chunk = self._interned.setdefault(chunk, chunk)
+        self.chunks.append(chunk)
+        return len(self.chunks) - 1
+    
+    def context(self, chunk_index: int) -> str:
+        """Text of a chunk."""
+        return str(self.chunks[chunk_index])
+    
+    def add_question(self, question: Dict[str, Any]) -> int:
+        """Add a generated question dict (its "context" is dropped) and return its index."""
+        known = {k: v for k, v in question.items() if k in _RECORD_FIELDS and k != "extra"}
+        extra = {k: v for k, v in question.items() if k not in _RECORD_FIELDS and k != "context"}
+        self.records.append(QARecord(**known, extra=extra or None))
+        self.changes.append(len(self.records) - 1)
+        return len(self.records) - 1
+    
+    def replace_question(self, index: int, question: Dict[str, Any]) -> QARecord:
+        """Put a different question dict in a record's place, dropping any answer it had."""
+        known = {k: v for k, v in question.items() if k in _RECORD_FIELDS and k != "extra"}
+        extra = {k: v for k, v in question.items() if k not in _RECORD_FIELDS and k != "context"}
+        self.records[index] = QARecord(**known, extra=extra or None)
+        self.changes.append(index)
+        return self.records[index]
+    
+    def set_answer(self, index: int, answer: Dict[str, Any]) -> QARecord:
+        """Attach a generated answer dict to a question."""
+        record = self.records[index]
+        for key, value in answer.items():
+            if key in _ANSWER_FIELDS:
+                setattr(record, _ANSWER_FIELDS[key], value)
+            else:
+                record.extra = {**(record.extra or {}), key: value}
+        self.changes.append(index)
+        return record
+    
+    def prompt_input(self, index: int) -> Dict[str, Any]:
+        """Question dict with its context, as the answer generator expects."""
+        record = self.records[index]
+        return record.to_dict(context=self.context(record.chunk_index))
+    
+    def answered(self) -> List[QARecord]:
+        return [record for record in self.records if record.answered]
+    
+    def to_records(self,
+                   include_context: bool = True,
+                   indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Materialize records as dicts, with their context for export.
+        
+        ``indices`` limits the export to those records, e.g. the ones a
+        regeneration pass changed.
+        """
+        return list(self.iter_records(include_context, indices))
+    
+    def iter_records(self,
+                     include_context: bool = True,
+                     indices: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Like ``to_records`` but yields one dict at a time, for streaming export."""
+        records = self.records if indices is None else (self.records[i] for i in indices)
+        for record in records:
+            yield record.to_dict(
+                self.context(record.chunk_index)
+                if include_context and 0 <= record.chunk_index < len(self.chunks) else None
+            )
+    
+    @classmethod
+    def from_results(cls,
+                     chunks: List[str],
+                     questions: List[Dict[str, Any]],
+                     answers: List[Dict[str, Any]]) -> 'QAStore':
+        """Build a store from chunk texts and aligned question and answer dicts."""
+        store = cls()
+        for chunk in chunks:
+            store.add_chunk(chunk)
+        for i, question in enumerate(questions):
+            index = store.add_question(question)
+            if i < len(answers):
+                store.set_answer(index, answers[i])
+        return store
@@ -1,38 +1,129 @@
 """File handling utilities."""
 import pandas as pd
 from pathlib import Path
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Iterable, Iterator
 from datetime import datetime
 import chardet
+import codecs
+import io
 import json
 
-def detect_encoding(file_content: bytes) -> str:
-    """Detect the encoding of file content."""
-    result = chardet.detect(file_content)
-    return result['encoding'] or 'utf-8'
+# Bytes examined from each end of a file when detecting its encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+MIN_ENCODING_CONFIDENCE = 0.5
+
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def _is_utf8(head: bytes, tail: bytes = b"", truncated: bool = False) -> bool:
+    """Strictly validate UTF-8, tolerating characters cut at the sample edges."""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=not (tail or truncated))
+        if tail:
+            # Skip continuation bytes of a character that began before the tail
+            start = next((i for i, b in enumerate(tail[:4]) if not 0x80 <= b <= 0xBF), 0)
+            tail[start:].decode('utf-8')
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def detect_encoding(file_content: bytes,
+                    sample_size: int = ENCODING_SAMPLE_BYTES,
+                    fallback: str = 'cp1252',
+                    complete: bool = True) -> str:
+    """Detect the encoding of file content.
+    
+    Checks for a byte order mark, then strict UTF-8, and only then runs
+    chardet. Only the first and last ``sample_size`` bytes are examined,
+    so detection time does not grow with the file. ``fallback`` is used
+    when chardet is not confident; by then UTF-8 has been ruled out, so it
+    defaults to the most common legacy encoding. Pass ``complete=False``
+    when the content is only the start of a stream.
+    """
+    for bom, encoding in _BOMS:
+        if file_content.startswith(bom):
+            return encoding
+    
+    head = file_content[:sample_size]
+    tail = file_content[-sample_size:] if complete and len(file_content) > 2 * sample_size else b""
+    if _is_utf8(head, tail, truncated=len(head) < len(file_content) or not complete):
+        return 'utf-8'
+    
+    result = chardet.detect(head + tail)
+    if result['encoding'] and (result['confidence'] or 0) >= MIN_ENCODING_CONFIDENCE:
+        return result['encoding']
+    return fallback
+
+def decode_text(file_content: bytes) -> str:
+    """Decode file content, replacing bytes the detected encoding rejects."""
+    encoding = detect_encoding(file_content)
+    try:
+        return file_content.decode(encoding)
+    except UnicodeDecodeError:
+        # Detection only saw a sample; keep going past stray bytes
+        return file_content.decode(encoding, errors='replace')
+
+def iter_decode(chunks: Iterable[bytes],
+                sample_size: int = ENCODING_SAMPLE_BYTES) -> Iterator[str]:
+    """Decode a stream of byte chunks incrementally.
+    
+    Buffers up to ``sample_size`` bytes to detect the encoding, then
+    decodes chunk by chunk; characters split across chunks are handled by
+    the incremental decoder.
+    """
+    decoder = None
+    buffered = b""
+    for chunk in chunks:
+        if decoder is None:
+            buffered += chunk
+            if len(buffered) < sample_size:
+                continue
+            encoding = detect_encoding(buffered, sample_size, complete=False)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            chunk, buffered = buffered, b""
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    
+    if decoder is None:
+        decoder = codecs.getincrementaldecoder(detect_encoding(buffered, sample_size))(errors='replace')
+    text = decoder.decode(buffered, final=True)
+    if text:
+        yield text
+
+def load_bytes(content: bytes, filename: str) -> Union[pd.DataFrame, str]:
+    """Parse uploaded file bytes by the file's extension."""
+    suffix = Path(filename).suffix.lower()
+    try:
+        if suffix in ['.txt', '.md', '.rst']:
+            return decode_text(content)
+        elif suffix == '.csv':
+            # Cells stay text so IDs like 00123 are not turned into numbers
+            return pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False,
+                               encoding=detect_encoding(content))
+        else:
+            raise ValueError(f"Unsupported file type: {suffix}")
+    except Exception as e:
+        raise ValueError(f"Error loading file: {str(e)}")
 
 def load_file(file: Union[str, Path]) -> Union[pd.DataFrame, str]:
     """Load a file into appropriate format."""
+    if not isinstance(file, (str, Path)):
+        return load_bytes(file.read(), file.name)
+    
     try:
-        if isinstance(file, str):
-            file_path = Path(file)
-        else:
-            file_path = Path(file.name)
-            file_content = file.read()
-            
-            if file_path.suffix.lower() in ['.txt', '.md', '.rst']:
-                encoding = detect_encoding(file_content)
-                return file_content.decode(encoding)
-            
-            # Reset file pointer for pandas
-            file.seek(0)
+        file_path = Path(file)
         
         # Handle different file types
         if file_path.suffix.lower() in ['.txt', '.md', '.rst']:
             with open(file_path, 'rb') as f:
-                content = f.read()
-                encoding = detect_encoding(content)
-                return content.decode(encoding)
+                return decode_text(f.read())
         elif file_path.suffix.lower() == '.csv':
             return pd.read_csv(file)
         else:
@@ -7,8 +7,7 @@ def initialize_session_state() -> None:
     defaults = {
         'uploaded_data': None,
         'generated_data': None,
-        'generation_step': 0,
-        'history': []
+        'generation_step': 0
     }
     
     for key, default_value in defaults.items():
@@ -0,0 +1,122 @@
+"""Content-addressed cache of parsed uploads, shared across sessions."""
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import sys
+import threading
+
+import pandas as pd
+
+# Rough per-chunk cost of a ChunkSpan (offsets only; text lives in the upload)
+_SPAN_BYTES = 72
+
+def content_key(data: bytes) -> str:
+    """Hash identifying an upload by its bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _size_of(content: Any) -> int:
+    if isinstance(content, pd.DataFrame):
+        return int(content.memory_usage(deep=True).sum())
+    if hasattr(content, "nbytes"):
+        return int(content.nbytes)
+    return sys.getsizeof(content)
+
+@dataclass
+class ParsedUpload:
+    """Decoded upload with its metadata and chunkings."""
+    key: str
+    content: Any  # str for text files, CsvUpload (or DataFrame) for CSV
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    chunks: Dict[Hashable, List[Any]] = field(default_factory=dict)  # chunking settings -> chunks
+
+    @property
+    def nbytes(self) -> int:
+        # Spans only hold offsets; table row chunks carry their own text
+        chunk_bytes = sum(
+            _SPAN_BYTES + (0 if hasattr(chunk, "buffer") else len(str(chunk)))
+            for chunks in self.chunks.values() for chunk in chunks
+        )
+        return _size_of(self.content) + chunk_bytes
+
+class UploadCache:
+    """
+    LRU cache of parsed uploads keyed by content hash, bounded by memory.
+
+    Identical bytes are decoded once per parser ``kind`` (e.g. the file
+    suffix) no matter which session they arrive from. The least recently used uploads are evicted when
+    the estimated total size exceeds ``max_bytes``; the most recent entry
+    is always kept. Safe to share between Streamlit sessions.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        """Initialize with the memory budget in bytes."""
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ParsedUpload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get(self, key: str) -> Optional[ParsedUpload]:
+        """Cached upload for ``key``, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def load(self,
+             data: bytes,
+             parse: Callable[[bytes], Any],
+             metadata: Optional[Dict[str, Any]] = None,
+             kind: str = "") -> ParsedUpload:
+        """
+        Parsed upload for ``data``, parsing it only on a cache miss.
+
+        Args:
+            data: Raw upload bytes
+            parse: Turns the bytes into text or a DataFrame
+            metadata: Stored with a newly parsed upload
+            kind: What ``parse`` depends on besides the bytes, such as the
+                file suffix; the same bytes under another kind parse anew
+        """
+        key = f"{kind}:{content_key(data)}" if kind else content_key(data)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = ParsedUpload(key=key, content=parse(data), metadata=dict(metadata or {}))
+        with self._lock:
+            # Another session may have parsed the same bytes meanwhile
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict()
+        return entry
+
+    def chunks(self,
+               entry: ParsedUpload,
+               settings: Hashable,
+               chunker: Callable[[Any], List[Any]]) -> List[Any]:
+        """Chunks of an upload for ``settings`` (e.g. max_chunk_size), chunking it only once."""
+        chunks = entry.chunks.get(settings)
+        if chunks is None:
+            chunks = chunker(entry.content)
+            with self._lock:
+                entry.chunks[settings] = chunks
+                self._evict()
+        return chunks
+
+    def _evict(self) -> None:
+        total = self.nbytes
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.nbytes
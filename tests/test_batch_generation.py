@@ -0,0 +1,91 @@
+"""Tests for batch and synthetic data generation in the LlamaStack provider."""
+import asyncio
+import json
+import pytest
+from src.pipeline.providers.base import BatchGenerationError
+from src.pipeline.providers.llama import LlamaStackProvider
+from src.pipeline.providers.interfaces import ProviderConfig
+
+def _response(content):
+    message = type("Message", (), {"content": content})
+    return type("Response", (), {"completion_message": message})
+
+class SingleCallClient:
+    """Client without batch endpoints; fails prompts containing 'bad'."""
+
+    def __init__(self):
+        self.inference = self
+        self.calls = 0
+
+    async def chat_completion(self, messages, model_id, **kwargs):
+        self.calls += 1
+        prompt = messages[0].content
+        if "bad" in prompt:
+            raise ValueError(f"cannot answer {prompt}")
+        if "JSON array" in prompt:
+            count = int(prompt.split("return exactly ")[1].split()[0])
+            pairs = [{"question": f"Q{self.calls}-{i}?", "answer": "A"} for i in range(count)]
+            return _response(json.dumps(pairs))
+        return _response(prompt.upper())
+
+class BatchClient(SingleCallClient):
+    """Client that also implements batch inference."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_inference = self
+        self.batches = []
+
+    async def chat_completion(self, messages_batch=None, model=None, messages=None, model_id=None, **kwargs):
+        if messages_batch is None:
+            return await super().chat_completion(messages, model_id, **kwargs)
+        prompts = [dialog[0].content for dialog in messages_batch]
+        self.batches.append(prompts)
+        messages = [type("Message", (), {"content": p.upper()}) for p in prompts]
+        return type("Batch", (), {"completion_message_batch": messages})
+
+def _provider(client, batch_size=4):
+    provider = LlamaStackProvider(config=ProviderConfig(model_id="m", batch_size=batch_size))
+    provider.client = client
+    return provider
+
+def test_batch_api_used_when_available():
+    """Test that prompts are grouped into batch requests and kept in order."""
+    client = BatchClient()
+    prompts = [f"p{i}" for i in range(10)]
+
+    results = asyncio.run(_provider(client).generate_batch(prompts=prompts))
+
+    assert results == [p.upper() for p in prompts]
+    assert [len(batch) for batch in client.batches] == [4, 4, 2]
+    assert client.calls == 0
+
+def test_fallback_to_single_calls_with_item_errors():
+    """Test fallback for clients without batch support and per-item errors."""
+    client = SingleCallClient()
+    provider = _provider(client)
+
+    results = asyncio.run(provider.generate_batch(
+        prompts=["a", "bad", "c"], return_exceptions=True
+    ))
+
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+    assert provider._batch_supported is False
+
+    with pytest.raises(BatchGenerationError) as info:
+        asyncio.run(provider.generate_batch(prompts=["a", "bad"]))
+    assert list(info.value.errors) == [1]
+    assert info.value.results[0] == "A"
+
+def test_synthetic_data_falls_back_to_batched_prompts():
+    """Test that synthetic generation is sharded into batched requests."""
+    client = SingleCallClient()
+
+    response = asyncio.run(_provider(client).generate_synthetic_data(
+        "Make pairs", {"num_samples": 7, "pairs_per_request": 3}
+    ))
+
+    assert len(response["qa_pairs"]) == 7
+    assert response["errors"] == []
+    assert client.calls == 3
@@ -0,0 +1,67 @@
+"""Tests for parallel multi-file ingestion."""
+import io
+import zipfile
+from src.pipeline.processors.batch import (
+    SourceFile, expand_archives, ingest_files, merge_sources, sources_metadata
+)
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+def test_archives_are_expanded_and_filtered():
+    """Test that zip members with allowed extensions become source files."""
+    archive = _zip({"docs/a.txt": "A", "docs/b.bin": "B", "__MACOSX/._a.txt": "x", "docs/c.md": "C"})
+
+    sources = expand_archives([("one.txt", b"1"), ("kb.zip", archive)], ["txt", "md"])
+
+    assert [s.name for s in sources] == ["one.txt", "kb.zip/docs/a.txt", "kb.zip/docs/c.md"]
+    assert sources[1].data == b"A"
+
+def test_bad_and_oversized_archives_fail_per_file():
+    """Test that corrupt archives and archive bombs are reported, not raised."""
+    bomb = _zip({"big.txt": "x" * 5000, "ok.txt": "fine"})
+
+    sources = expand_archives([("broken.zip", b"not a zip"), ("bomb.zip", bomb), ("a.txt", b"A")],
+                              ["txt"], max_member_bytes=1000)
+    results = ingest_files(sources, lambda source: source.data.decode(), lambda text: [text])
+
+    assert [(r.name, r.ok) for r in results] == [
+        ("broken.zip", False), ("bomb.zip/big.txt", False), ("bomb.zip/ok.txt", True), ("a.txt", True)
+    ]
+    assert "Could not read archive" in results[0].error
+    assert expand_archives([("bomb.zip", bomb)], ["txt"], max_archive_bytes=4000)[0].error
+    assert expand_archives([("bomb.zip", bomb)], ["txt"], max_members=1)[0].error
+
+def test_ingest_reports_progress_and_errors():
+    """Test per-file progress, input order and per-file failures."""
+    files = [SourceFile(f"{i}.txt", f"Para {i}.\n\nMore {i}.".encode()) for i in range(5)]
+    files.append(SourceFile("bad.txt", b"\xff"))
+    seen = []
+
+    def parse(source):
+        return source.data.decode("utf-8")
+
+    results = ingest_files(files, parse, lambda text: text.split("\n\n"), max_workers=3,
+                           progress_callback=lambda result, done, total: seen.append((done, total)))
+
+    assert [r.name for r in results] == [f.name for f in files]
+    assert sorted(seen) == [(i, 6) for i in range(1, 7)]
+    assert not results[-1].ok and results[0].chunks == ["Para 0.", "More 0."]
+
+def test_merge_keys_chunks_by_source():
+    """Test that merged chunks are renumbered and tagged with their file."""
+    results = ingest_files(
+        [SourceFile("a.txt", b"x\n\ny"), SourceFile("b.txt", b"z")],
+        lambda source: source.data.decode(), lambda text: text.split("\n\n")
+    )
+
+    chunks = merge_sources(results)
+
+    assert [(c.index, c.content, c["source"]) for c in chunks] == [
+        (0, "x", "a.txt"), (1, "y", "a.txt"), (2, "z", "b.txt")
+    ]
+    assert sources_metadata(chunks)["sources"] == {"a.txt": 2, "b.txt": 1}
@@ -0,0 +1,86 @@
+"""Tests for cooperative cancellation and pause/resume."""
+import asyncio
+import threading
+import time
+import pytest
+from src.pipeline.cancellation import CancellationToken, GenerationCancelled, ABORT, DRAIN
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+ANSWER = '<json>"answer": "A", "explanation": "E", "confidence": 0.9}</json>'
+
+class FakeClient:
+    """Minimal client whose chat completions take a fixed time."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.inference = self
+
+    def chat_completion(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        message = type("Message", (), {"content": ANSWER})
+        return type("Response", (), {"completion_message": message})
+
+def _questions(n):
+    return [{"question": f"Q{i}?", "context": "ctx"} for i in range(n)]
+
+def test_cancel_before_start_issues_no_calls():
+    """Test that a cancelled token stops work before any request."""
+    client = FakeClient()
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(GenerationCancelled) as info:
+        asyncio.run(AnswerGenerator(client).generate(_questions(3), cancel_token=token))
+
+    assert client.calls == 0
+    assert info.value.partial == []
+
+def test_abort_returns_partial_results():
+    """Test that aborting mid-run keeps completed answers and stops spending."""
+    client = FakeClient(delay=0.05)
+    token = CancellationToken(policy=ABORT, poll_interval=0.01)
+    threading.Timer(0.12, token.cancel).start()
+
+    with pytest.raises(GenerationCancelled) as info:
+        asyncio.run(AnswerGenerator(client).generate(_questions(20), cancel_token=token))
+
+    assert 1 <= len(info.value.partial) < 20
+    assert client.calls < 20
+
+def test_drain_finishes_in_flight_request():
+    """Test that draining keeps the in-flight answer."""
+    client = FakeClient(delay=0.1)
+    token = CancellationToken(policy=DRAIN, poll_interval=0.01)
+    threading.Timer(0.05, token.cancel).start()
+
+    with pytest.raises(GenerationCancelled) as info:
+        asyncio.run(AnswerGenerator(client).generate(_questions(5), cancel_token=token))
+
+    assert len(info.value.partial) == client.calls == 1
+
+def test_pause_and_resume():
+    """Test that paused work resumes where it stopped."""
+    client = FakeClient()
+    token = CancellationToken(poll_interval=0.01)
+    token.pause()
+    threading.Timer(0.1, token.resume).start()
+
+    started = time.time()
+    answers = asyncio.run(AnswerGenerator(client).generate(_questions(3), cancel_token=token))
+
+    assert time.time() - started >= 0.1
+    assert len(answers) == 3
+
+def test_abort_does_not_wait_for_blocking_request():
+    """Test that an aborted job's event loop exits while a blocking call is still running."""
+    client = FakeClient(delay=1.0)
+    token = CancellationToken(poll_interval=0.01)
+    threading.Timer(0.1, token.cancel, kwargs={"policy": ABORT}).start()
+
+    started = time.time()
+    with pytest.raises(GenerationCancelled):
+        asyncio.run(AnswerGenerator(client).generate(_questions(1), cancel_token=token))
+
+    assert time.time() - started < 0.5
@@ -0,0 +1,67 @@
+"""Tests for the SQLite run catalog."""
+import pytest
+from src.pipeline.catalog import RunCatalog, RunRecord
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RunCatalog(tmp_path / "catalog.sqlite3")
+    for i in range(30):
+        catalog.add(RunRecord(id=f"run{i}", name=f"doc_{i % 3}.txt", created_at=1000.0 + i,
+                              status="completed" if i % 2 else "failed"))
+    return catalog
+
+def test_pages_are_newest_first(catalog):
+    """Test pagination order and page boundaries."""
+    first = catalog.list_runs(limit=10)
+    second = catalog.list_runs(limit=10, offset=10)
+
+    assert [r.id for r in first[:2]] == ["run29", "run28"]
+    assert second[0].id == "run19"
+    assert catalog.count() == 30
+
+def test_filters_by_status_and_name(catalog):
+    """Test status and substring filters, with LIKE wildcards taken literally."""
+    assert catalog.count(status="completed") == 15
+    assert catalog.count(search="doc_1") == 10
+    assert catalog.count(status="failed", search="doc_1") == 5
+    assert catalog.count(search="doc%") == 0
+    assert {r.name for r in catalog.list_runs(search="_2.")} == {"doc_2.txt"}
+
+def test_finish_records_counts_and_usage(catalog):
+    """Test that a pipeline result fills in counts, tokens and metadata."""
+    result = {"chunks": [1, 2], "questions": [1, 2, 3], "answers": [1],
+              "metadata": {"token_usage": {"prompt_tokens": 120, "completion_tokens": 30}}}
+
+    catalog.finish("run3", "completed", result)
+
+    run = catalog.get("run3")
+    assert (run.status, run.chunk_count, run.question_count, run.answer_count) == ("completed", 2, 3, 1)
+    assert (run.prompt_tokens, run.completion_tokens) == (120, 30)
+    assert run.metadata["token_usage"]["prompt_tokens"] == 120
+    assert run.finished_at is not None
+
+def test_update_rejects_unknown_fields(catalog):
+    """Test that update refuses fields that are not catalog columns."""
+    with pytest.raises(ValueError):
+        catalog.update("run1", id="other")
+    with pytest.raises(ValueError):
+        catalog.update("run1", colour="red")
+
+def test_catalog_persists_across_instances(catalog):
+    """Test that a new catalog on the same file sees stored runs."""
+    catalog.delete("run0")
+
+    reopened = RunCatalog(catalog.path)
+
+    assert reopened.count() == 29
+    assert reopened.get("run0") is None
+
+def test_interrupted_runs_are_marked_failed(catalog):
+    """Test that runs left running by a previous process are closed out on start-up."""
+    catalog.add(RunRecord(id="stale", name="doc.txt"))
+
+    assert catalog.mark_interrupted() == 1
+
+    run = catalog.get("stale")
+    assert run.status == "failed" and run.error and run.finished_at is not None
+    assert catalog.count(status="running") == 0
@@ -0,0 +1,41 @@
+"""Tests for MinHash near-duplicate question elimination."""
+import random
+from src.pipeline.dedup import MinHashDeduplicator
+
+def test_keeps_best_scored_duplicate():
+    """Test that a duplicate cluster keeps its highest-scored question."""
+    questions = [
+        {"question": "What is the capital city of France?", "quality_score": 0.6},
+        {"question": "How do plants turn sunlight into energy?", "quality_score": 0.8},
+        {"question": "what is the capital city of France", "quality_score": 0.9},
+    ]
+
+    result = MinHashDeduplicator(threshold=0.8).deduplicate(questions)
+
+    assert [q["question"] for q in result.kept] == [
+        "How do plants turn sunlight into energy?",
+        "what is the capital city of France",
+    ]
+    assert result.merged == {2: [0]}
+    assert result.kept[1]["merged_duplicates"] == ["What is the capital city of France?"]
+    assert "merged_duplicates" not in questions[2]
+
+def test_distinct_questions_survive():
+    """Test that unrelated questions are never merged."""
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcdefghij", k=5)) for _ in range(500)]
+    questions = [{"question": " ".join(rng.choices(words, k=10))} for _ in range(2000)]
+
+    result = MinHashDeduplicator(threshold=0.8).deduplicate(questions)
+
+    assert result.removed == 0 and len(result.kept) == 2000
+
+def test_incremental_index():
+    """Test that add() reports the ID of an indexed near-duplicate."""
+    index = MinHashDeduplicator(threshold=0.8)
+
+    assert index.add("Why is the sky blue during the day?") is None
+    assert index.add("Which enzyme breaks down starch?") is None
+    assert index.add("Why is the sky blue during the day") == 0
+    assert index.find("which enzyme breaks down starch") == 1
+    assert len(index) == 2
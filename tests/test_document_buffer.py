@@ -0,0 +1,46 @@
+"""Tests for zero-copy chunk spans."""
+from src.pipeline.processors.document_buffer import DocumentBuffer, chunk_spans, search_spans
+from src.pipeline.processors.document_processor import DocumentProcessor
+
+DOCUMENT = (
+    "Title line\n\n"
+    "  First paragraph is short.  \n \n"
+    "Second paragraph is a bit longer than the first one.\n\n"
+) + "Long one. " * 12
+
+def test_paragraphs_are_packed_into_spans():
+    """Test that spans cover trimmed paragraphs up to the size limit."""
+    chunks = chunk_spans(DocumentBuffer(DOCUMENT), max_chunk_size=60)
+
+    assert chunks[0]["content"] == "Title line\n\n  First paragraph is short."
+    assert chunks[1]["content"] == "Second paragraph is a bit longer than the first one."
+    assert all(chunk.size == chunk.end - chunk.start for chunk in chunks)
+    # The oversized last paragraph is split on sentence boundaries
+    assert all(chunk["content"].startswith("Long one.") for chunk in chunks[2:])
+    assert all(chunk.size <= 60 for chunk in chunks[2:])
+
+def test_spans_share_one_buffer():
+    """Test that the processor's chunks reference the same buffer."""
+    chunks = DocumentProcessor(None)._chunk_article(DOCUMENT)
+
+    assert len({id(chunk.buffer) for chunk in chunks}) == 1
+    assert str(chunks[-1]) == chunks[-1].text
+
+def test_memory_mapped_file(tmp_path):
+    """Test that a memory-mapped buffer yields the same chunks as text."""
+    path = tmp_path / "doc.txt"
+    path.write_text(DOCUMENT, encoding="utf-8")
+
+    buffer = DocumentBuffer.from_file(path)
+    mapped = [chunk.text for chunk in chunk_spans(buffer, 60)]
+    buffer.close()
+
+    assert mapped == [chunk.text for chunk in chunk_spans(DocumentBuffer(DOCUMENT), 60)]
+
+def test_search_spans_single_pass():
+    """Test case-insensitive search over spans of one buffer."""
+    chunks = chunk_spans(DocumentBuffer(DOCUMENT), max_chunk_size=60)
+
+    assert search_spans(chunks, "SECOND") == [chunks[1]]
+    assert search_spans(chunks, "missing") == []
+    assert search_spans(chunks, "") == chunks
@@ -0,0 +1,31 @@
+"""Tests for sampled encoding detection and incremental decoding."""
+import codecs
+from src.utils.file_handlers import decode_text, detect_encoding, iter_decode
+
+def test_bom_and_utf8_fast_path():
+    """Test that BOMs and valid UTF-8 are recognised without chardet."""
+    assert detect_encoding(codecs.BOM_UTF8 + "héllo".encode()) == "utf-8-sig"
+    assert detect_encoding("héllo".encode("utf-16")) == "utf-16"
+    assert detect_encoding("naïve café".encode()) == "utf-8"
+
+def test_sample_edges_tolerate_split_characters():
+    """Test that multi-byte characters cut by the sample window stay UTF-8."""
+    data = ("é" * 100).encode()
+    assert detect_encoding(data, sample_size=33) == "utf-8"
+
+def test_invalid_utf8_falls_back_to_chardet():
+    """Test that non-UTF-8 text is detected from a sample and decoded."""
+    text = "Le café est très réputé à côté de l'église. " * 50
+    data = text.encode("latin-1")
+
+    assert detect_encoding(data) in ("cp1252", "iso8859-1", "iso8859-15")
+    assert decode_text(data) == text
+
+def test_iter_decode_across_chunk_boundaries():
+    """Test that streamed chunks decode the same as the whole file."""
+    text = "Grüße aus Köln – ünïcödé " * 40
+    data = text.encode()
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+
+    assert "".join(iter_decode(chunks, sample_size=64)) == text
+    assert "".join(iter_decode([data[:4]])) == "Grü"
@@ -0,0 +1,83 @@
+"""Tests for streaming and columnar Q&A export."""
+import gzip
+import json
+import pytest
+from src.pipeline.export import (
+    JsonlShardWriter, ColumnarWriter, export_records, open_dataset, preview_dataset
+)
+from src.pipeline.types import QAStore
+
+def _records(n):
+    return ({"question": f"Q{i}?", "answer": f"A{i}", "chunk_index": i % 3,
+             "confidence": 0.5, "source": "kb.txt", "evidence": [[0, 2]]} for i in range(n))
+
+def test_jsonl_shards_rotate_and_write_manifest(tmp_path):
+    """Test that shards rotate at the record limit and the manifest lists them."""
+    with JsonlShardWriter(tmp_path, max_records=4) as writer:
+        writer.write_many(_records(10))
+
+    manifest = json.loads((tmp_path / "qa-manifest.json").read_text())
+    assert manifest["records"] == 10
+    assert [s["records"] for s in manifest["shards"]] == [4, 4, 2]
+    lines = (tmp_path / "qa-00002.jsonl").read_text().splitlines()
+    assert json.loads(lines[-1])["question"] == "Q9?"
+
+def test_compressed_shards(tmp_path):
+    """Test gzip-compressed shards."""
+    manifest = export_records(_records(3), tmp_path, "jsonl", compress=True)
+
+    shard = json.loads(manifest.read_text())["shards"][0]["path"]
+    with gzip.open(tmp_path / shard, "rt") as f:
+        assert len(f.readlines()) == 3
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_columnar_round_trip(tmp_path, format):
+    """Test that batches are written and read back with typed columns and extras."""
+    path = export_records(_records(25), tmp_path / f"qa.{format}", format, batch_size=10)
+
+    table = open_dataset(path)
+    assert table.num_rows == 25
+    assert table.column("chunk_index").to_pylist()[:4] == [0, 1, 2, 0]
+    assert table.column("grounding_score").null_count == 25
+    assert json.loads(table.column("extra")[0].as_py()) == {"evidence": [[0, 2]]}
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_columnar_coerces_model_values(tmp_path, format):
+    """Test that mistyped model fields are coerced or kept in extra instead of failing."""
+    records = [{"question": "Q?", "difficulty": 3, "chunk_index": 2.0, "confidence": "0.5",
+                "type": ["factual"], "quality_score": "high"}]
+    path = export_records(records, tmp_path / f"qa.{format}", format)
+
+    row = open_dataset(path).to_pylist()[0]
+    assert row["difficulty"] == "3" and row["chunk_index"] == 2 and row["confidence"] == 0.5
+    assert row["type"] is None and row["quality_score"] is None
+    assert json.loads(row["extra"]) == {"type": ["factual"], "quality_score": "high"}
+
+def test_unknown_format_is_rejected(tmp_path):
+    """Test that unsupported formats raise ValueError."""
+    with pytest.raises(ValueError):
+        ColumnarWriter(tmp_path / "qa.csv", "csv")
+
+def test_store_records_stream_with_context(tmp_path):
+    """Test exporting a QAStore lazily with chunk contexts."""
+    store = QAStore.from_results(["First chunk.", "Second chunk."],
+                                 [{"question": "Q1?", "chunk_index": 0},
+                                  {"question": "Q2?", "chunk_index": 1}],
+                                 [{"answer": "A1"}, {"answer": "A2"}])
+
+    path = export_records(store.iter_records(), tmp_path / "qa.arrow", "arrow")
+
+    table = open_dataset(path)
+    assert table.column("context").to_pylist() == ["First chunk.", "Second chunk."]
+    assert table.column("answer").to_pylist() == ["A1", "A2"]
+
+@pytest.mark.parametrize("format", ["parquet", "arrow", "jsonl"])
+def test_preview_reads_only_leading_records(tmp_path, format):
+    """Test previews of every export format, across shard and batch boundaries."""
+    target = tmp_path / "shards" if format == "jsonl" else tmp_path / f"qa.{format}"
+    options = {"max_records": 4} if format == "jsonl" else {"batch_size": 4}
+    path = export_records(_records(20), target, format, **options)
+
+    preview = preview_dataset(path, limit=6)
+
+    assert preview["question"].tolist() == [f"Q{i}?" for i in range(6)]
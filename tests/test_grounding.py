@@ -0,0 +1,31 @@
+"""Tests for lexical answer grounding."""
+from src.pipeline.grounding import GroundingVerifier
+
+CONTEXT = ("The Eiffel Tower was completed in 1889. "
+           "It was designed by the engineering firm of Gustave Eiffel. "
+           "Paris hosted the World's Fair that year.")
+
+def test_copied_answer_is_grounded_with_evidence():
+    """Test that an answer lifted from the chunk points at its sentence."""
+    grounding = GroundingVerifier().verify("It was designed by Gustave Eiffel's engineering firm.", CONTEXT)
+
+    assert grounding.score >= 0.5
+    start, end = grounding.evidence[0]
+    assert CONTEXT[start:end] == "It was designed by the engineering firm of Gustave Eiffel."
+
+def test_unsupported_answer_scores_low():
+    """Test that an answer with no support in the chunk scores near zero."""
+    grounding = GroundingVerifier().verify("Quantum tunnelling explains superconductivity.", CONTEXT)
+
+    assert grounding.score == 0.0
+    assert grounding.evidence == []
+
+def test_apply_reuses_chunk_index():
+    """Test that answers for one chunk share a cached index."""
+    verifier = GroundingVerifier()
+    answer = verifier.apply({"answer": "The Eiffel Tower was completed in 1889."}, CONTEXT)
+    verifier.apply({"answer": "Paris"}, CONTEXT)
+
+    assert answer["grounding_score"] == 1.0
+    assert answer["evidence"] == [[0, 39]]
+    assert len(verifier._indexes) == 1
@@ -0,0 +1,72 @@
+"""Tests for the background job runner."""
+import asyncio
+import time
+from src.pipeline.jobs import JobRunner, JobStatus
+
+def _wait(job, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while job.is_active and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_job_completes_with_result():
+    """Test that a job runs in the background and stores its result."""
+    runner = JobRunner(max_workers=2)
+
+    async def work(job):
+        job.report(0.5, "halfway")
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    job = runner.submit("answer", work)
+    _wait(job)
+
+    assert job.status == JobStatus.COMPLETED
+    assert job.result == {"value": 42}
+    assert job.progress == 1.0
+    assert runner.get(job.id) is job
+    runner.shutdown()
+
+def test_job_failure_is_recorded():
+    """Test that exceptions mark the job as failed."""
+    runner = JobRunner()
+
+    async def work(job):
+        raise RuntimeError("boom")
+
+    job = runner.submit("broken", work)
+    _wait(job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "boom"
+    runner.shutdown()
+
+def test_jobs_run_concurrently():
+    """Test that blocking jobs do not serialize each other."""
+    runner = JobRunner(max_workers=3)
+
+    async def work(job):
+        time.sleep(0.2)  # blocking call, like the sync LLM client
+        return job.name
+
+    started = time.time()
+    jobs = [runner.submit(f"job{i}", work) for i in range(3)]
+    for job in jobs:
+        _wait(job)
+
+    assert all(job.status == JobStatus.COMPLETED for job in jobs)
+    assert time.time() - started < 0.5
+    assert [job.name for job in runner.list_jobs()] == ["job2", "job1", "job0"]
+    runner.shutdown()
+
+def test_registry_prunes_finished_jobs():
+    """Test that the registry keeps a bounded history."""
+    runner = JobRunner(max_workers=1, max_history=2)
+
+    async def work(job):
+        return None
+
+    for i in range(4):
+        _wait(runner.submit(f"job{i}", work))
+
+    assert [job.name for job in runner.list_jobs()] == ["job3", "job2"]
+    runner.shutdown()
@@ -0,0 +1,267 @@
+"""Tests for the pipelined orchestrator."""
+import asyncio
+import threading
+import time
+import pytest
+from src.pipeline.orchestrator import PipelineOrchestrator
+from src.pipeline.processors.document_processor import DocumentProcessor
+from src.pipeline.generators.question_generator import QuestionGenerator
+from src.pipeline.generators.answer_generator import AnswerGenerator
+from src.pipeline.cancellation import CancellationToken, GenerationCancelled
+from src.pipeline.types import GenerationConfig, QAStore
+from src.pipeline.qa_frame import QAFrame
+from src.pipeline.quality import QualityConfig, QuestionScorer
+from src.pipeline.artifacts import ArtifactStore
+from src.pipeline.routing import ModelRoute
+
+QUESTIONS = ('<json>{"questions": [{"question": "Q1?", "difficulty": "basic", "type": "factual"},'
+             '{"question": "Q2?", "difficulty": "basic", "type": "factual"}]}</json>')
+ANSWER = '<json>"answer": "A", "explanation": "E", "confidence": 0.9}</json>'
+
+class FakeClient:
+    """Client that records the order and overlap of calls."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.events = []
+        self.lock = threading.Lock()
+        self.inference = self
+
+    def chat_completion(self, model_id, messages):
+        prompt = messages[0].content
+        kind = "question" if "question generation AI" in prompt else "answer"
+        with self.lock:
+            self.events.append(("start", kind))
+        time.sleep(self.delay)
+        with self.lock:
+            self.events.append(("end", kind))
+        content = QUESTIONS if kind == "question" else ANSWER
+        message = type("Message", (), {"content": content})
+        return type("Response", (), {"completion_message": message})
+
+def _orchestrator(client):
+    processor = DocumentProcessor(client)
+    processor.config.max_chunk_size = 40
+    return PipelineOrchestrator(processor, QuestionGenerator(client), AnswerGenerator(client))
+
+DOCUMENT = "\n\n".join(f"Paragraph number {i} has some content." for i in range(4))
+# The fake questions repeat across chunks and would not pass the gates
+UNGATED = dict(quality_threshold=0.0, dedup_threshold=None)
+
+def test_pipeline_overlaps_stages():
+    """Test that answers start before all questions are generated."""
+    client = FakeClient()
+    result = asyncio.run(_orchestrator(client).process_document(
+        DOCUMENT, generation_config=GenerationConfig(**UNGATED)
+    ))
+
+    assert len(result["chunks"]) == 4
+    assert len(result["questions"]) == 8
+    assert len(result["answers"]) == 8
+    assert [q["chunk_index"] for q in result["questions"]] == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert result["metadata"]["token_usage"]["completion_tokens"] > 0
+
+    first_answer = client.events.index(("start", "answer"))
+    last_question = max(i for i, e in enumerate(client.events) if e == ("end", "question"))
+    assert first_answer < last_question
+
+def test_pipeline_cancel_keeps_aligned_partial_results():
+    """Test that cancellation returns answered questions first."""
+    client = FakeClient(delay=0.05)
+    token = CancellationToken(poll_interval=0.01)
+    threading.Timer(0.2, token.cancel).start()
+
+    with pytest.raises(GenerationCancelled) as info:
+        asyncio.run(_orchestrator(client).process_document(
+            DOCUMENT, generation_config=GenerationConfig(answer_queue_size=1, **UNGATED),
+            cancel_token=token
+        ))
+
+    partial = info.value.partial
+    assert len(partial["answers"]) < 8
+    assert len(partial["questions"]) >= len(partial["answers"])
+
+def test_pipeline_gates_questions_before_answering():
+    """Test that low-quality and duplicate questions are never answered."""
+    client = FakeClient(delay=0)
+    result = asyncio.run(_orchestrator(client).process_document(
+        DOCUMENT, generation_config=GenerationConfig(quality_threshold=0.2)
+    ))
+
+    # "Q1?"/"Q2?" score 0.25; repeats fold into the first chunk's questions
+    assert [q["question"] for q in result["questions"]] == ["Q1?", "Q2?"]
+    assert result["questions"][0]["merged_duplicates"] == ["Q1?"] * 3
+    assert client.events.count(("start", "answer")) == 2
+
+    result = asyncio.run(_orchestrator(client).process_document(DOCUMENT))
+    assert result["questions"] == []
+    assert result["metadata"]["rejected_questions"] == 8
+
+def test_memoized_stages_are_reused(tmp_path):
+    """Test that changing the answer model reuses chunks and questions from disk."""
+    config = GenerationConfig(**UNGATED)
+    client = FakeClient(delay=0)
+    orchestrator = _orchestrator(client)
+    orchestrator.artifacts = ArtifactStore(tmp_path)
+    first = asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    client.events.clear()
+    second = asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+    assert client.events == []
+    assert [r.to_dict() for r in second["store"]] == [r.to_dict() for r in first["store"]]
+
+    orchestrator.answer_generator.route = ModelRoute("another-model")
+    third = asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+    assert ("start", "question") not in client.events
+    assert client.events.count(("start", "answer")) == 8
+    assert third["answers"][0].answer_model == "another-model"
+
+def test_cached_answers_need_their_cached_questions(tmp_path):
+    """Test that answers on disk are not replayed onto regenerated questions."""
+    config = GenerationConfig(**UNGATED)
+    client = FakeClient(delay=0)
+    orchestrator = _orchestrator(client)
+    orchestrator.artifacts = ArtifactStore(tmp_path)
+    asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    for path in (tmp_path / "questions").iterdir():
+        path.write_text("not json")
+    client.events.clear()
+    asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    assert client.events.count(("start", "question")) == 4
+    assert client.events.count(("start", "answer")) == 8
+
+def test_scorer_settings_key_memoized_questions(tmp_path):
+    """Test that changing the quality scorer regenerates the scored questions."""
+    config = GenerationConfig(**UNGATED)
+    client = FakeClient(delay=0)
+    orchestrator = _orchestrator(client)
+    orchestrator.artifacts = ArtifactStore(tmp_path)
+    asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    orchestrator.question_generator.scorer = QuestionScorer(QualityConfig(min_words=1))
+    client.events.clear()
+    result = asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    assert client.events.count(("start", "question")) == 4
+    assert result["questions"][0]["quality_score"] > 0.25
+
+class LookupScorer:
+    """Scorer that assigns fixed quality scores by question text."""
+
+    def __init__(self, scores):
+        self.scores = scores
+
+    def apply(self, questions, context):
+        for question in questions:
+            question["quality_score"] = self.scores[question["question"]]
+        return questions
+
+class ParaphraseClient(FakeClient):
+    """Client whose chunks yield paraphrases of one question."""
+
+    PHRASINGS = ["Which city is the capital of France?",
+                 "Which city is the capital of France today?"]
+
+    def chat_completion(self, model_id, messages):
+        prompt = messages[0].content
+        if "question generation AI" not in prompt:
+            return super().chat_completion(model_id, messages)
+        self.events.append(("start", "question"))
+        phrasing = self.PHRASINGS[1] if "number 1" in prompt else self.PHRASINGS[0]
+        content = ('<json>{"questions": [{"question": "%s", "difficulty": "basic", '
+                   '"type": "factual"}]}</json>' % phrasing)
+        message = type("Message", (), {"content": content})
+        return type("Response", (), {"completion_message": message})
+
+def test_paraphrases_are_merged_into_best_scored_question():
+    """Test that near-duplicates across chunks are answered once, as the best-scored phrasing."""
+    client = ParaphraseClient(delay=0)
+    first, better = ParaphraseClient.PHRASINGS
+    orchestrator = _orchestrator(client)
+    orchestrator.question_generator.scorer = LookupScorer({first: 0.5, better: 0.9})
+
+    result = asyncio.run(orchestrator.process_document(
+        "\n\n".join(f"Paragraph number {i} has some content." for i in range(2)),
+        generation_config=GenerationConfig(quality_threshold=0.0, dedup_threshold=0.75)
+    ))
+
+    assert [q["question"] for q in result["questions"]] == [better]
+    assert result["questions"][0]["merged_duplicates"] == [first]
+    assert result["questions"][0]["answer"] == "A"
+    assert len(result["answers"]) == 1
+
+def test_lower_scored_paraphrase_is_not_answered():
+    """Test that a worse-scored later paraphrase is folded in without an answer call."""
+    client = ParaphraseClient(delay=0)
+    first, later = ParaphraseClient.PHRASINGS
+    orchestrator = _orchestrator(client)
+    orchestrator.question_generator.scorer = LookupScorer({first: 0.9, later: 0.5})
+
+    result = asyncio.run(orchestrator.process_document(
+        "\n\n".join(f"Paragraph number {i} has some content." for i in range(2)),
+        generation_config=GenerationConfig(quality_threshold=0.0, dedup_threshold=0.75)
+    ))
+
+    assert [q["question"] for q in result["questions"]] == [first]
+    assert result["questions"][0]["merged_duplicates"] == [later]
+    assert client.events.count(("start", "answer")) == 1
+
+def test_replaced_answers_are_not_streamed():
+    """Test that record_callback only gets final records when a later duplicate replaces one."""
+    class SlowSecondChunk(ParaphraseClient):
+        def chat_completion(self, model_id, messages):
+            if "number 1" in messages[0].content:
+                time.sleep(0.1)  # the first chunk's answer lands before this paraphrase
+            return super().chat_completion(model_id, messages)
+
+    first, better = ParaphraseClient.PHRASINGS
+    orchestrator = _orchestrator(SlowSecondChunk(delay=0))
+    orchestrator.question_generator.scorer = LookupScorer({first: 0.5, better: 0.9})
+    streamed = []
+
+    result = asyncio.run(orchestrator.process_document(
+        "\n\n".join(f"Paragraph number {i} has some content." for i in range(2)),
+        generation_config=GenerationConfig(quality_threshold=0.0, dedup_threshold=0.75),
+        record_callback=streamed.append
+    ))
+
+    assert [record["question"] for record in streamed] == [better]
+    assert streamed[0]["answer"] == "A" and streamed[0]["merged_duplicates"] == [first]
+    assert "context" in streamed[0]
+    assert len(result["answers"]) == 1
+
+def test_token_usage_is_counted_per_run():
+    """Test that concurrent runs sharing generators each report only their own tokens."""
+    config = GenerationConfig(**UNGATED)
+    orchestrator = _orchestrator(FakeClient(delay=0.01))
+    alone = asyncio.run(orchestrator.process_document(DOCUMENT, generation_config=config))
+
+    async def both():
+        return await asyncio.gather(
+            orchestrator.process_document(DOCUMENT, generation_config=config),
+            orchestrator.process_document(DOCUMENT, generation_config=config)
+        )
+
+    usages = [result["metadata"]["token_usage"] for result in asyncio.run(both())]
+    assert usages == [alone["metadata"]["token_usage"]] * 2
+
+def test_given_store_is_filled_while_running():
+    """Test that a view on the caller's store syncs answers as they arrive."""
+    store, frame = QAStore(), QAFrame()
+    answered_seen = []
+
+    def on_record(record):
+        frame.sync(store)
+        answered_seen.append(int(frame.frame["answered"].sum()))
+
+    result = asyncio.run(_orchestrator(FakeClient()).process_document(
+        DOCUMENT, generation_config=GenerationConfig(**UNGATED),
+        record_callback=on_record, store=store
+    ))
+
+    assert result["store"] is store
+    assert answered_seen == list(range(1, len(store) + 1))
+    with pytest.raises(ValueError):
+        asyncio.run(_orchestrator(FakeClient()).process_document(DOCUMENT, store=store))
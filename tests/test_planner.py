@@ -0,0 +1,44 @@
+"""Tests for the dry-run planner."""
+from src.pipeline.planner import plan_run, DEFAULT_LATENCY_SECONDS
+from src.pipeline.metrics import estimate_tokens
+from src.pipeline.types import GenerationConfig
+from src.pipeline.generators.question_generator import QuestionGenerator
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+def test_estimate_tokens():
+    """Test token estimation."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello, world!") == 4
+    assert estimate_tokens("internationalization") > 1
+
+def test_plan_run_defaults():
+    """Test plan projection without measured latencies."""
+    chunks = ["First chunk of text.", "Second chunk of text."]
+    plan = plan_run(chunks, QuestionGenerator(None), AnswerGenerator(None),
+                    GenerationConfig(questions_per_chunk=3))
+
+    questions, answers = plan.stages
+    assert plan.chunk_count == 2
+    assert questions.requests == 2
+    assert answers.requests == 6
+    assert plan.total_requests == 8
+    assert not questions.measured
+    assert plan.eta_seconds == (
+        2 * DEFAULT_LATENCY_SECONDS["questions"] + 6 * DEFAULT_LATENCY_SECONDS["answers"]
+    )
+
+def test_plan_run_uses_measured_stats():
+    """Test plan projection from recent run statistics."""
+    question_gen = QuestionGenerator(None)
+    answer_gen = AnswerGenerator(None)
+    question_gen.stats.record(2.0, 100, 50, items=2)
+    answer_gen.stats.record(1.0, 200, 40, items=1)
+
+    plan = plan_run(["a", "b", "c", "d"], question_gen, answer_gen,
+                    GenerationConfig(max_concurrent_requests=4))
+
+    questions, answers = plan.stages
+    assert questions.measured and answers.measured
+    assert answers.requests == 8
+    assert answers.completion_tokens == 320
+    assert plan.eta_seconds == 2.0 + 2 * 1.0
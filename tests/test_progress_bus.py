@@ -0,0 +1,69 @@
+"""Tests for the progress event bus."""
+import threading
+import streamlit as st
+from src.pipeline.events import ProgressBus
+from src.pipeline.cancellation import CancellationToken
+from src.components.flow.step_manager import StepManager, StepStatus
+
+def test_drain_coalesces_per_step():
+    """Test that only the latest update per step is returned."""
+    bus = ProgressBus()
+    bus.publish("plan", 0.5, "half")
+    bus.publish("generate", 0.1, "started")
+    bus.publish("plan", 1.0, "done", status="completed")
+    bus.publish("generate", 0.4, "more")
+
+    events = bus.drain()
+    assert [e.step_id for e in events] == ["plan", "generate"]
+    assert events[0].progress == 1.0 and events[0].status == "completed"
+    assert events[1].progress == 0.4 and events[1].message == "more"
+    assert bus.drain() == []
+
+def test_callback_maps_range():
+    """Test that callbacks map progress onto a slice of the step."""
+    bus = ProgressBus()
+    bus.callback("generate", 0.5, 1.0)(0.5, "answers")
+    assert bus.drain()[0].progress == 0.75
+
+def test_publish_from_threads():
+    """Test publishing from worker threads."""
+    bus = ProgressBus()
+    threads = [
+        threading.Thread(target=lambda i=i: bus.publish(f"step{i}", 1.0))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(bus.drain()) == 8
+
+def test_process_bus_roundtrip():
+    """Test the multiprocessing-backed bus."""
+    bus = ProgressBus.for_processes()
+    bus.publish("plan", 0.3, "chunking")
+    events = []
+    for _ in range(50):
+        events = bus.drain()
+        if events:
+            break
+        threading.Event().wait(0.01)
+    assert events and events[0].step_id == "plan"
+
+def test_progress_does_not_unpause_steps():
+    """Test that in-flight progress keeps a paused step paused until the token resumes."""
+    st.session_state.pop("steps", None)
+    manager = StepManager()
+    bus, token = ProgressBus(), CancellationToken()
+    manager.update_step_status("generate", StepStatus.PAUSED)
+    token.pause()
+
+    bus.publish("generate", 0.4, "answer landed")
+    manager.apply_progress_events(bus)
+    manager.apply_progress_events(bus, token)
+    step = next(step for step in st.session_state.steps if step.id == "generate")
+    assert step.status == StepStatus.PAUSED and step.progress == 0.4
+
+    token.resume()
+    manager.apply_progress_events(bus, token)
+    assert step.status == StepStatus.RUNNING
@@ -0,0 +1,93 @@
+"""Tests for LlamaStack provider load balancing and failover."""
+import asyncio
+import pytest
+from src.pipeline.providers.llama import LlamaStackProvider
+from src.pipeline.providers.interfaces import ProviderConfig
+
+class FakeAsyncClient:
+    """Async client stub that tracks peak concurrency."""
+
+    def __init__(self, name: str, delay: float = 0.02, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.inference = self
+        self.models = self
+
+    async def list(self):
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return [type("Model", (), {"identifier": "test-model", "model_type": "llm"})]
+
+    async def chat_completion(self, messages, model_id, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        message = type("Message", (), {"content": f"{self.name}:{messages[0].content}"})
+        return type("Response", (), {"completion_message": message})
+
+def _provider(*clients):
+    config = ProviderConfig(endpoints=[client.name for client in clients])
+    provider = LlamaStackProvider(config=config)
+    for endpoint, client in zip(provider.endpoints, clients):
+        endpoint.client = client
+    return provider
+
+def test_requests_spread_across_endpoints():
+    """Test that concurrent requests go to the least-loaded endpoint."""
+    a, b = FakeAsyncClient("a"), FakeAsyncClient("b")
+    provider = _provider(a, b)
+
+    async def run():
+        await provider.initialize()
+        return await provider.generate_batch([f"p{i}" for i in range(8)])
+
+    results = asyncio.run(run())
+
+    assert [r.split(":")[1] for r in results] == [f"p{i}" for i in range(8)]
+    assert a.calls == 4 and b.calls == 4
+    assert provider.model_id == "test-model"
+
+def test_failover_to_healthy_endpoint():
+    """Test that a failing endpoint is skipped and marked unhealthy."""
+    down, up = FakeAsyncClient("down", fail=True), FakeAsyncClient("up")
+    provider = _provider(down, up)
+
+    result = asyncio.run(provider.generate("hello"))
+
+    assert result == "up:hello"
+    stats = {s["endpoint"]: s for s in provider.endpoint_stats()}
+    assert stats["down"]["healthy"] is False
+    assert stats["up"]["outstanding"] == 0
+
+def test_all_endpoints_down_raises():
+    """Test that an error is raised when no endpoint can serve the request."""
+    provider = _provider(FakeAsyncClient("a", fail=True), FakeAsyncClient("b", fail=True))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(provider.generate("hello"))
+    assert asyncio.run(provider.validate_connection()) is False
+
+def test_cancelling_caller_cancels_request():
+    """Test that cancelling the awaiting task aborts the in-flight request."""
+    slow = FakeAsyncClient("slow", delay=5.0)
+    provider = _provider(slow)
+
+    async def run():
+        task = asyncio.ensure_future(provider.generate("hello"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert slow.active == 1  # the sleep was interrupted, never decremented
+    assert provider.endpoint_stats()[0]["outstanding"] == 0
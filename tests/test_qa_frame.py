@@ -0,0 +1,71 @@
+"""Tests for the incrementally synced Q&A frame."""
+import math
+from src.pipeline.qa_frame import QAFrame
+from src.pipeline.types import QAStore
+
+def _store(n=6):
+    store = QAStore()
+    store.add_chunk("Some context.")
+    levels = ["advanced", "basic", "intermediate"]
+    for i in range(n):
+        store.add_question({"question": f"What is item {i}?", "difficulty": levels[i % 3],
+                            "type": "factual" if i % 2 else "conceptual",
+                            "chunk_index": 0, "quality_score": i / 10})
+    return store
+
+def test_sync_applies_only_new_changes():
+    """Test that answers update rows in place and unchanged stores are skipped."""
+    store = _store()
+    frame = QAFrame(capacity=2)
+
+    assert frame.sync(store)
+    assert len(frame) == 6 and not frame.frame["answered"].any()
+    assert not frame.sync(store)
+
+    store.set_answer(4, {"answer": "Four", "confidence": 0.9})
+    store.add_question({"question": "What is new?", "difficulty": "basic", "chunk_index": 0})
+    assert frame.sync(store)
+
+    rows = frame.frame
+    assert rows.loc[4, "answer"] == "Four" and rows.loc[4, "confidence"] == 0.9
+    assert math.isnan(rows.loc[3, "confidence"])
+    assert rows.loc[6, "question"] == "What is new?"
+    assert frame.version == store.version == 8
+
+def test_query_filters_sort_and_memoizes():
+    """Test vectorized filters, difficulty ordering and per-version caching."""
+    store = _store()
+    store.set_answer(1, {"answer": "The SECRET one"})
+    frame = QAFrame()
+    frame.sync(store)
+
+    rows = frame.query(types=["factual"], min_quality=0.2, sort_by="difficulty")
+    assert list(rows.index) == [5, 3]  # intermediate before advanced
+    assert frame.query(types=["factual"], min_quality=0.2, sort_by="difficulty") is rows
+    assert list(frame.query(search="secret").index) == [1]
+
+    store.set_answer(2, {"answer": "Also secret"})
+    frame.sync(store)
+    assert list(frame.query(search="secret").index) == [1, 2]
+
+def test_summary_aggregates():
+    """Test counts and means over filtered rows."""
+    store = _store()
+    store.set_answer(0, {"answer": "A", "confidence": 0.5})
+    frame = QAFrame()
+    frame.sync(store)
+
+    summary = frame.summary()
+    assert summary["total"] == 6 and summary["answered"] == 1
+    assert summary["difficulty_counts"] == {"advanced": 2, "basic": 2, "intermediate": 2}
+    assert summary["mean_confidence"] == 0.5
+    assert frame.summary(difficulties=["basic"])["type_counts"] == {"factual": 1, "conceptual": 1}
+
+def test_new_store_replaces_frame():
+    """Test that syncing a different store rebuilds from scratch."""
+    frame = QAFrame()
+    frame.sync(_store(6))
+    frame.sync(_store(2))
+
+    assert len(frame) == 2
+    assert frame.summary()["total"] == 2
@@ -0,0 +1,44 @@
+"""Tests for the compact Q&A record store."""
+import pytest
+from src.pipeline.types import QARecord, QAStore
+
+QUESTION = {"question": "Q?", "difficulty": "basic", "type": "factual",
+            "chunk_index": 0, "quality_score": 0.8, "context": "ignored", "source": "doc.txt"}
+
+def test_records_have_no_instance_dict():
+    """Test that records are slotted and keep unknown keys in extra."""
+    store = QAStore()
+    store.add_chunk("Chunk text")
+    store.add_question(QUESTION)
+
+    record = store[0]
+    assert not hasattr(record, "__dict__")
+    assert record.get("source") == "doc.txt"
+    assert "context" not in record
+
+def test_identical_chunks_are_interned():
+    """Test that repeated chunk texts share one string."""
+    store = QAStore()
+    first = store.add_chunk("".join(["same ", "text"]))
+    second = store.add_chunk("".join(["same", " text"]))
+
+    assert store.context(first) is store.context(second)
+
+def test_answers_and_export():
+    """Test that answers attach to records and contexts appear only on export."""
+    store = QAStore.from_results(
+        ["Chunk text"],
+        [QUESTION, {**QUESTION, "question": "Q2?"}],
+        [{"answer": "A", "explanation": "E", "confidence": 0.9, "model": "m"}]
+    )
+
+    assert [record.answered for record in store] == [True, False]
+    assert store[0]["answer"] == "A" and store[0].answer_model == "m"
+    with pytest.raises(KeyError):
+        store[1]["answer"]
+
+    exported = store.to_records()
+    assert exported[0]["context"] == "Chunk text"
+    assert exported[0]["confidence"] == 0.9
+    assert "answer" not in exported[1]
+    assert store.prompt_input(1) == {**QUESTION, "question": "Q2?", "context": "Chunk text"}
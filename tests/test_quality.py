@@ -0,0 +1,50 @@
+"""Tests for the heuristic pre-answer quality gate."""
+from src.pipeline.quality import QuestionScorer, split_by_quality
+
+CONTEXT = "Photosynthesis converts sunlight, water and carbon dioxide into glucose inside chloroplasts."
+
+def test_grounded_question_scores_high():
+    """Test that a self-contained question using chunk terms gets full credit."""
+    scores = QuestionScorer().score(["Where inside plant cells does photosynthesis produce glucose?"], CONTEXT)
+
+    assert scores[0] >= 0.9
+
+def test_penalties():
+    """Test banned phrases, dangling references, length and overlap penalties."""
+    scores = QuestionScorer().score([
+        "What does the provided context say about chloroplasts?",
+        "Why is it stored in the chloroplasts above?",
+        "Glucose?",
+        "Who won the football world cup in 1998?",
+    ], CONTEXT)
+
+    assert scores[0] == 0.0
+    assert scores[1] < 1.0
+    assert scores[2] < 1.0
+    assert scores[3] <= 0.5
+
+def test_banned_phrases_match_whole_words_only():
+    """Test that words merely starting with a banned phrase are not penalized."""
+    context = ("Reset the authorization token from the documentation portal; "
+               "the textbox on the token page confirms each token reset.")
+    scores = QuestionScorer().score([
+        "How do you reset the authorization token?",
+        "Where is the documentation portal for token resets?",
+        "What confirms a reset in the textbox on the token page?",
+        "What does the document say about token resets?",
+    ], context)
+
+    assert (scores[:3] >= 0.7).all()
+    assert scores[3] == 0.0
+
+def test_split_by_quality():
+    """Test that questions below the threshold are rejected."""
+    questions = QuestionScorer().apply([
+        {"question": "Where inside plant cells does photosynthesis produce glucose?"},
+        {"question": "What is discussed in the passage?"},
+    ], CONTEXT)
+
+    passed, rejected = split_by_quality(questions, 0.7)
+
+    assert [q["question"] for q in passed] == [questions[0]["question"]]
+    assert rejected[0]["quality_score"] == 0.0
@@ -0,0 +1,52 @@
+"""Tests for selective answer regeneration."""
+import asyncio
+from src.pipeline.types import QAStore
+from src.pipeline.regeneration import RegenerationCriteria, Regenerator, select_for_regeneration
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+CHUNK = "Water boils at 100 degrees Celsius at sea level."
+
+class StrongProvider:
+    """Provider stub that records which model answered."""
+
+    def __init__(self):
+        self.models = []
+
+    async def chat_completion(self, messages, model_id=None, **kwargs):
+        self.models.append(model_id)
+        content = ('<json>{"answer": "Water boils at 100 degrees Celsius at sea level.", '
+                   '"explanation": "E", "confidence": 0.95}</json>')
+        message = type("Message", (), {"content": content})
+        return type("Response", (), {"completion_message": message})
+
+def _store():
+    questions = [{"question": f"Q{i}?", "chunk_index": 0} for i in range(4)]
+    answers = [
+        {"answer": "A", "confidence": 0.9, "grounding_score": 0.9},
+        {"answer": "A", "confidence": 0.3, "grounding_score": 0.9},
+        {"answer": "A", "confidence": 0.8, "grounding_score": 0.1},
+    ]
+    return QAStore.from_results([CHUNK], questions, answers)
+
+def test_selection_is_weakest_first():
+    """Test that unanswered and low-scoring records are selected, weakest first."""
+    store = _store()
+
+    assert select_for_regeneration(store, RegenerationCriteria()) == [3, 1]
+    criteria = RegenerationCriteria(min_grounding=0.5, worst_fraction=0.5)
+    assert select_for_regeneration(store, criteria) == [3, 2]
+
+def test_regenerate_merges_only_changes():
+    """Test that regenerated answers merge back and only changed records are reported."""
+    store = _store()
+    provider = StrongProvider()
+    regenerator = Regenerator(AnswerGenerator(provider, stream=False), model_id="big")
+
+    changed = asyncio.run(regenerator.regenerate(store, [1, 3]))
+
+    assert changed == [1, 3]
+    assert set(provider.models) == {"big"}
+    assert store[3].confidence == 0.95 and store[3].get("regenerated") == 1
+    assert store[3].get("evidence") == [[0, len(CHUNK)]]
+    assert store[0].get("regenerated") is None
+    assert [r["question"] for r in store.to_records(indices=changed)] == ["Q1?", "Q3?"]
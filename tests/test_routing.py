@@ -0,0 +1,64 @@
+"""Tests for per-stage model routing and cascades."""
+import asyncio
+from src.pipeline.config import PipelineConfig
+from src.pipeline.routing import ModelRoute
+from src.pipeline.generators.question_generator import QuestionGenerator
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+QUESTIONS = '<json>{"questions": [{"question": "Q?", "difficulty": "basic", "type": "factual"}]}</json>'
+
+class RoutedProvider:
+    """Provider stub returning canned content per model."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.models = []
+
+    async def chat_completion(self, messages, model_id=None, **kwargs):
+        self.models.append(model_id)
+        message = type("Message", (), {"content": self.responses[model_id]})
+        return type("Response", (), {"completion_message": message})
+
+def _answer(confidence):
+    return f'<json>"answer": "A", "explanation": "E", "confidence": {confidence}}}</json>'
+
+def test_pipeline_config_routes():
+    """Test that PipelineConfig builds per-stage routes."""
+    config = PipelineConfig(answer_model="big", cascade_model="small")
+    route = config.route("answers")
+
+    assert route.model_id == "big"
+    assert route.first_model == "small"
+    assert PipelineConfig().route("questions").cascade is False
+
+def test_confident_draft_is_kept():
+    """Test that a confident draft answer is not escalated."""
+    provider = RoutedProvider({"small": _answer(0.9), "big": _answer(0.95)})
+    generator = AnswerGenerator(provider, ModelRoute("big", "small", min_confidence=0.6))
+
+    answer = asyncio.run(generator.generate_answer({"question": "Q?", "context": "C"}))
+
+    assert provider.models == ["small"]
+    assert answer["model"] == "small"
+
+def test_low_confidence_answer_escalates():
+    """Test that low-confidence drafts are redone by the large model."""
+    provider = RoutedProvider({"small": _answer(0.2), "big": _answer(0.95)})
+    generator = AnswerGenerator(provider, ModelRoute("big", "small", min_confidence=0.6))
+
+    answer = asyncio.run(generator.generate_answer({"question": "Q?", "context": "C"}))
+
+    assert provider.models == ["small", "big"]
+    assert answer["confidence"] == 0.95
+    assert answer["model"] == "big"
+
+def test_unparseable_questions_escalate():
+    """Test that question drafts that fail to parse are regenerated."""
+    provider = RoutedProvider({"small": "no tags here", "big": QUESTIONS})
+    generator = QuestionGenerator(provider, ModelRoute("big", "small"))
+
+    questions = asyncio.run(generator.generate_for_chunk("Some text", 3))
+
+    assert provider.models == ["small", "big"]
+    assert questions[0]["model"] == "big"
+    assert questions[0]["chunk_index"] == 3
@@ -0,0 +1,76 @@
+"""Tests for streamed <json> block parsing and early stop."""
+import asyncio
+from src.pipeline.streaming import JsonBlockScanner, stream_json_block
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+ANSWER_TEXT = (
+    "Let me think step by step about the context first.\n"
+    '<json>\n"answer": "Paris",\n"explanation": "Stated in the text",\n"confidence": 0.9\n</json>'
+    "\nSome trailing commentary the model keeps writing."
+)
+
+def _deltas(text, size=5):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class StreamingProvider:
+    """Provider stub that streams canned text and records how much was read."""
+
+    def __init__(self, text):
+        self.text = text
+        self.sent = 0
+        self.closed = False
+
+    async def stream_text(self, messages, model_id=None, **kwargs):
+        try:
+            for delta in _deltas(self.text):
+                self.sent += 1
+                yield delta
+                await asyncio.sleep(0)
+        finally:
+            self.closed = True
+
+def test_scanner_handles_tags_split_across_deltas():
+    """Test that tags split over deltas are found and text is cut at the end tag."""
+    scanner = JsonBlockScanner()
+    done = [scanner.feed(delta) for delta in _deltas(ANSWER_TEXT, size=3)]
+
+    assert any(done)
+    assert scanner.text.endswith("</json>")
+    assert dict(scanner.fields()) == {
+        "answer": "Paris",
+        "explanation": "Stated in the text",
+        "confidence": 0.9,
+    }
+
+def test_scanner_only_reports_complete_fields():
+    """Test that a value still streaming in is not reported."""
+    scanner = JsonBlockScanner()
+    scanner.feed('<json>"answer": "Par')
+    assert scanner.fields() == []
+    scanner.feed('is",\n"confidence": 0.')
+    assert scanner.fields() == [("answer", "Paris")]
+
+def test_stream_stops_at_closing_tag():
+    """Test that the stream is closed once </json> arrives."""
+    provider = StreamingProvider(ANSWER_TEXT)
+
+    text = asyncio.run(stream_json_block(provider.stream_text([])))
+
+    assert text.endswith("</json>")
+    assert provider.closed
+    assert provider.sent < len(_deltas(ANSWER_TEXT))
+
+def test_answer_generator_streams_partials():
+    """Test that the answer generator surfaces fields as they complete."""
+    provider = StreamingProvider(ANSWER_TEXT)
+    partials = []
+
+    answer = asyncio.run(AnswerGenerator(provider).generate_answer(
+        {"question": "Capital of France?", "context": "Paris is the capital."},
+        on_partial=partials.append
+    ))
+
+    assert answer["answer"] == "Paris"
+    assert answer["confidence"] == 0.9
+    assert partials[0] == {"answer": "Paris"}
+    assert len(partials[-1]) == 3
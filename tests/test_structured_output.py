@@ -0,0 +1,49 @@
+"""Tests for schema-constrained question and answer generation."""
+import asyncio
+import json
+import pytest
+from src.pipeline.schemas import ANSWER_OUTPUT, QUESTIONS_OUTPUT
+from src.pipeline.generators.question_generator import QuestionGenerator
+from src.pipeline.generators.answer_generator import AnswerGenerator
+
+class SchemaProvider:
+    """Provider stub that records the response_format it was given."""
+
+    def __init__(self, content):
+        self.content = content
+        self.response_formats = []
+
+    async def chat_completion(self, messages, model_id=None, response_format=None, **kwargs):
+        self.response_formats.append(response_format)
+        message = type("Message", (), {"content": self.content})
+        return type("Response", (), {"completion_message": message})
+
+def test_schema_rejects_invalid_output():
+    """Test that output violating the schema raises ValueError."""
+    with pytest.raises(ValueError, match="confidence"):
+        ANSWER_OUTPUT.parse('{"answer": "A", "explanation": "E", "confidence": 3}')
+    with pytest.raises(ValueError):
+        QUESTIONS_OUTPUT.parse('{"questions": []}')
+
+def test_structured_answer_uses_response_format():
+    """Test that structured mode sends the schema and skips the reasoning prompt."""
+    provider = SchemaProvider(json.dumps({"answer": "A", "explanation": "E", "confidence": 0.7}))
+    generator = AnswerGenerator(provider, structured=True)
+    question = {"question": "Q?", "context": "C"}
+
+    answer = asyncio.run(generator.generate_answer(question))
+
+    assert answer["answer"] == "A" and answer["confidence"] == 0.7
+    assert provider.response_formats[0]["type"] == "json_schema"
+    assert "<json>" not in generator._build_prompt(question)
+
+def test_structured_questions_are_validated():
+    """Test that structured question output is parsed into question dicts."""
+    questions = {"questions": [{"question": "Q?", "difficulty": "basic", "type": "factual"}]}
+    provider = SchemaProvider(json.dumps(questions))
+
+    result = asyncio.run(QuestionGenerator(provider, structured=True).generate_for_chunk("C", 0))
+
+    assert result[0]["question"] == "Q?"
+    assert result[0]["context"] == "C"
+    assert provider.response_formats[0]["json_schema"]["required"] == ["questions"]
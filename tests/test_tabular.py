@@ -0,0 +1,58 @@
+"""Tests for row-aware CSV chunking."""
+import io
+import asyncio
+import pytest
+import pandas as pd
+from src.pipeline.processors.tabular import (
+    TabularConfig, chunk_frames, csv_upload_chunks, open_csv_upload, read_csv_chunks
+)
+from src.pipeline.types import QAStore
+
+CSV = "question,answer,notes\n" + "".join(f"Q{i}?,A{i},\n" for i in range(25))
+
+def test_rows_are_grouped_without_dropping_any():
+    """Test that every row lands in exactly one chunk, across read batches."""
+    config = TabularConfig(rows_per_chunk=10, read_chunksize=7)
+    chunks = list(read_csv_chunks(io.StringIO(CSV), config))
+
+    assert [chunk.metadata["rows"] for chunk in chunks] == [[0, 9], [10, 19], [20, 24]]
+    assert chunks[0]["content"].startswith("question: Q0?\nanswer: A0\n\nquestion: Q1?")
+    # Empty cells are left out of the default rendering
+    assert "notes" not in chunks[0].content
+    assert chunks[2]["size"] == len(chunks[2].content)
+
+def test_row_template_and_size_limit():
+    """Test column templates and the per-chunk character limit."""
+    frame = pd.read_csv(io.StringIO(CSV))
+    config = TabularConfig(row_template="Q: {question} A: {answer}", max_chunk_size=30)
+    chunks = list(chunk_frames([frame], config))
+
+    assert chunks[0].content == "Q: Q0? A: A0\n\nQ: Q1? A: A1"
+    assert all(len(chunk.metadata["rows"]) == 2 for chunk in chunks)
+    assert sum(c.metadata["rows"][1] - c.metadata["rows"][0] + 1 for c in chunks) == 25
+
+def test_unknown_template_column():
+    """Test that a template naming a missing column raises ValueError."""
+    with pytest.raises(ValueError, match="missing"):
+        list(chunk_frames([pd.read_csv(io.StringIO(CSV))], TabularConfig(row_template="{missing}")))
+
+def test_chunks_feed_the_store():
+    """Test that row chunks act as store contexts."""
+    chunks = list(read_csv_chunks(io.StringIO(CSV)))
+    store = QAStore()
+    store.add_chunk(chunks[0])
+
+    assert store.context(0) == chunks[0].content
+
+def test_csv_upload_streams_rows_as_text():
+    """Test that uploads keep only a preview parsed and preserve IDs and blanks."""
+    data = ("id,count,name\n" + "".join(f"00{i},{'' if i % 2 else i},Café {i}\n" for i in range(30))).encode("cp1252")
+    upload = open_csv_upload(data, "cp1252", preview_rows=5)
+
+    assert len(upload.preview) == 5
+    assert upload.preview["id"].tolist()[:2] == ["000", "001"]
+
+    chunks = csv_upload_chunks(upload, TabularConfig(rows_per_chunk=10, read_chunksize=8))
+    assert len(chunks) == 3
+    assert chunks[0].content.startswith("id: 000\ncount: 0\nname: Café 0\n\nid: 001\nname: Café 1")
+    assert chunks[-1].metadata["rows"] == [20, 29]
@@ -0,0 +1,58 @@
+"""Tests for the shared cache of parsed uploads."""
+from src.utils.upload_cache import UploadCache
+from src.utils.file_handlers import load_bytes
+
+def test_identical_bytes_parse_once():
+    """Test that the same bytes of the same kind are decoded once."""
+    cache = UploadCache()
+    calls = []
+
+    def parse(data):
+        calls.append(data)
+        return load_bytes(data, "doc.txt")
+
+    first = cache.load(b"Some text", parse, metadata={"name": "a.txt"})
+    second = cache.load(b"Some text", parse, metadata={"name": "b.txt"})
+
+    assert first is second and len(calls) == 1
+    assert first.content == "Some text" and first.metadata["name"] == "a.txt"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_same_bytes_of_another_kind_parse_again():
+    """Test that bytes uploaded under another suffix get their own parse."""
+    cache = UploadCache()
+    data = b"name,value\nx,1\n"
+
+    as_text = cache.load(data, lambda data: data.decode(), kind=".txt")
+    as_csv = cache.load(data, lambda data: data.decode().splitlines(), kind=".csv")
+
+    assert as_text is not as_csv
+    assert as_text.content == data.decode() and as_csv.content == ["name,value", "x,1"]
+    assert cache.load(data, lambda data: None, kind=".csv") is as_csv
+
+def test_chunks_are_cached_per_size():
+    """Test that chunking runs once per chunk size."""
+    cache = UploadCache()
+    upload = cache.load(b"a b c", lambda data: data.decode())
+    calls = []
+
+    def chunker(text):
+        calls.append(text)
+        return text.split()
+
+    assert cache.chunks(upload, 100, chunker) == ["a", "b", "c"]
+    cache.chunks(upload, 100, chunker)
+    cache.chunks(upload, 200, chunker)
+    assert len(calls) == 2
+
+def test_least_recently_used_is_evicted():
+    """Test that the memory bound evicts the least recently used upload."""
+    cache = UploadCache(max_bytes=350)  # room for two 100-character uploads
+    first = cache.load(b"1" * 100, lambda data: data.decode())
+    second = cache.load(b"2" * 100, lambda data: data.decode())
+    cache.get(first.key)
+    cache.load(b"3" * 100, lambda data: data.decode())
+
+    assert cache.get(first.key) is first
+    assert cache.get(second.key) is None
+    assert len(cache) == 2 and cache.nbytes <= 350
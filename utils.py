@@ -35,6 +35,9 @@ def save_dataset(data: pd.DataFrame, filename: str) -> Path:
     """
     Save a dataset to a file.
     
+    The format follows the file name: ``.parquet`` and ``.arrow`` are
+    written zstd-compressed (and need pyarrow), anything else as CSV.
+    
     Args:
         data: DataFrame to save
         filename: Name of the file to save to
@@ -46,5 +49,10 @@ def save_dataset(data: pd.DataFrame, filename: str) -> Path:
     output_dir.mkdir(exist_ok=True)
     
     file_path = output_dir / filename
-    data.to_csv(file_path, index=False)
+    if file_path.suffix == '.parquet':
+        data.to_parquet(file_path, index=False, compression='zstd')
+    elif file_path.suffix == '.arrow':
+        data.reset_index(drop=True).to_feather(file_path, compression='zstd')
+    else:
+        data.to_csv(file_path, index=False)
     return file_path 
\ No newline at end of file